@@ -0,0 +1,60 @@
+import argparse
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from benchmarks.common import synthetic_records, write_synthetic_artifacts
+from src.pipeline.bulk_scoring import bulk_score
+
+N_JOBS = (1, 2, 4)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Measure bulk scoring throughput per number of workers."
+    )
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--format", choices=["csv", "parquet"], default="csv")
+    parser.add_argument("--block-mb", type=int, default=8)
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        model_dir = write_synthetic_artifacts(Path(tmp_dir) / "model")
+        df = pd.DataFrame(synthetic_records(args.rows, seed=1))
+        df.insert(0, "customerid", range(len(df)))
+        input_path = Path(tmp_dir) / f"customers.{args.format}"
+        if args.format == "csv":
+            df.to_csv(input_path, index=False)
+        else:
+            df.to_parquet(input_path, row_group_size=100_000)
+        del df
+
+        for n_jobs in N_JOBS:
+            start = time.perf_counter()
+            rows = bulk_score(
+                input_path,
+                Path(tmp_dir) / "scores",
+                model_dir=model_dir,
+                n_jobs=n_jobs,
+                block_bytes=args.block_mb * 2**20,
+            )
+            elapsed = time.perf_counter() - start
+            results.append(
+                {
+                    "n_jobs": n_jobs,
+                    "cpus": os.cpu_count(),
+                    "seconds": elapsed,
+                    "rows_per_second": rows / elapsed,
+                    "speedup": results[0]["seconds"] / elapsed if results else 1.0,
+                }
+            )
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from benchmarks.common import synthetic_records, write_synthetic_artifacts
+from src.api.model_store import LocalModelSource, load_bundle
+from src.config import config
+
+BATCH_SIZES = (1, 10, 100, 1_000)
+
+
+def time_call(fn, repeats: int) -> float:
+    fn()
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Measure the latency that explanations add to batch scoring."
+    )
+    parser.add_argument("--repeats", type=int, default=30)
+    parser.add_argument("--top-k", type=int, default=config.api.explanations.top_k)
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        bundle = load_bundle(
+            LocalModelSource(write_synthetic_artifacts(Path(tmp_dir) / "model")).fetch()
+        )
+        for batch_size in BATCH_SIZES:
+            records = synthetic_records(batch_size, seed=1)
+
+            def score():
+                return bundle.predict_proba(bundle.encoder.encode_batch(records))
+
+            def score_and_explain():
+                features = bundle.encoder.encode_batch(records)
+                bundle.predict_proba(features)
+                return bundle.explainer.explain(features, args.top_k)
+
+            score_s = time_call(score, args.repeats)
+            explained_s = time_call(score_and_explain, args.repeats)
+            results.append(
+                {
+                    "batch_size": batch_size,
+                    "score_ms": score_s * 1e3,
+                    "score_and_explain_ms": explained_s * 1e3,
+                    "overhead_ms_per_record": (explained_s - score_s)
+                    * 1e3
+                    / batch_size,
+                    "slowdown": explained_s / score_s,
+                }
+            )
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+
+from benchmarks.common import synthetic_records
+from src.config import config
+from src.data_io import read_table, write_table
+from src.pipeline.feature_engineering import encode_features
+
+
+def measure(df: pd.DataFrame, path: Path) -> dict:
+    write_table(df, path)
+    start = time.perf_counter()
+    loaded = read_table(path)
+    load_seconds = time.perf_counter() - start
+
+    target = config.target_column
+    start = time.perf_counter()
+    xgb.DMatrix(loaded.drop(columns=[target]), label=loaded[target])
+    dmatrix_seconds = time.perf_counter() - start
+    return {
+        "memory_mb": loaded.memory_usage(deep=True).sum() / 2**20,
+        "file_mb": path.stat().st_size / 2**20,
+        "load_seconds": load_seconds,
+        "dmatrix_seconds": dmatrix_seconds,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare float64 CSV features with compact Parquet features."
+    )
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    df = pd.DataFrame(synthetic_records(args.rows))
+    df[config.target_column] = np.random.default_rng(0).integers(0, 2, args.rows)
+    compact, _, _ = encode_features(df, df.iloc[:1], config.target_column)
+    # The previous stage output: every feature as float64, stored as CSV.
+    wide = compact.astype("float64").astype({config.target_column: "int64"})
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        results = {
+            "float64_csv": measure(wide, Path(tmp_dir) / "wide.csv"),
+            "float64_parquet": measure(wide, Path(tmp_dir) / "wide.parquet"),
+            "compact_parquet": measure(compact, Path(tmp_dir) / "compact.parquet"),
+        }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from benchmarks.common import synthetic_records, write_synthetic_artifacts
+from src.api.model_store import LocalModelSource, load_bundle
+from src.api.prediction_cache import PredictionCache
+
+REPEAT_RATES = (0.0, 0.5, 0.9, 0.99)
+
+
+def request_stream(n_requests: int, repeat_rate: float, seed: int) -> list[dict]:
+    rng = np.random.default_rng(seed)
+    fresh = iter(synthetic_records(n_requests, seed))
+    seen = [next(fresh)]
+    stream = [seen[0]]
+    for _ in range(n_requests - 1):
+        if rng.random() < repeat_rate:
+            stream.append(seen[rng.integers(len(seen))])
+        else:
+            seen.append(next(fresh))
+            stream.append(seen[-1])
+    return stream
+
+
+def run(bundle, records: list[dict], cache: PredictionCache | None) -> np.ndarray:
+    latencies = np.empty(len(records))
+    for i, record in enumerate(records):
+        start = time.perf_counter()
+        probability = cache.get(bundle.version, record) if cache else None
+        if probability is None:
+            probability = float(bundle.predict_proba(bundle.encoder.encode(record))[0])
+            if cache:
+                cache.put(bundle.version, record, probability)
+        latencies[i] = time.perf_counter() - start
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Measure /predict latency with and without the prediction cache."
+    )
+    parser.add_argument("--requests", type=int, default=5_000)
+    parser.add_argument("--capacity", type=int, default=100_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        model_dir = write_synthetic_artifacts(Path(tmp_dir))
+        bundle = load_bundle(LocalModelSource(model_dir).fetch())
+
+    results = []
+    for repeat_rate in REPEAT_RATES:
+        records = request_stream(args.requests, repeat_rate, seed=1)
+        baseline = run(bundle, records, cache=None)
+        cached = run(
+            bundle, records, PredictionCache(capacity=args.capacity, ttl_s=3600)
+        )
+        results.append(
+            {
+                "repeat_rate": repeat_rate,
+                "uncached_p50_us": float(np.median(baseline) * 1e6),
+                "cached_p50_us": float(np.median(cached) * 1e6),
+                "uncached_mean_us": float(baseline.mean() * 1e6),
+                "cached_mean_us": float(cached.mean() * 1e6),
+            }
+        )
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
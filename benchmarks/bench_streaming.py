@@ -0,0 +1,63 @@
+import argparse
+import json
+import tempfile
+from pathlib import Path
+
+from benchmarks.common import synthetic_records, write_synthetic_artifacts
+from src.api.model_store import LocalModelSource, load_bundle
+from src.streaming.brokers import FileBroker, MemoryBroker
+from src.streaming.consumer import ScoringWorker
+
+BATCH_SIZES = (1, 50, 500)
+
+
+def fill(broker: MemoryBroker | FileBroker, topic: str, records: list[dict]):
+    for i, record in enumerate(records):
+        broker.produce(topic, str(i).encode(), json.dumps(record).encode())
+    broker.flush()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Measure sustained events/s of the streaming scoring worker."
+    )
+    parser.add_argument("--events", type=int, default=20_000)
+    args = parser.parse_args()
+
+    records = synthetic_records(args.events, seed=1)
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        bundle = load_bundle(
+            LocalModelSource(write_synthetic_artifacts(Path(tmp_dir) / "model")).fetch()
+        )
+        for broker_name in ("memory", "file"):
+            for batch_size in BATCH_SIZES:
+                if broker_name == "memory":
+                    broker = MemoryBroker("events", "bench")
+                    fill(broker, "events", records)
+                else:
+                    topic_dir = Path(tmp_dir) / f"topics-{batch_size}"
+                    producer = FileBroker(topic_dir, "unused", "bench")
+                    fill(producer, "events", records)
+                    producer.close()
+                    broker = FileBroker(topic_dir, "events", "bench")
+
+                worker = ScoringWorker(
+                    broker, bundle, max_batch_size=batch_size, max_delay_ms=5
+                )
+                stats = worker.run(max_events=args.events, report_interval_s=3600)
+                broker.close()
+                results.append(
+                    {
+                        "broker": broker_name,
+                        "max_batch_size": batch_size,
+                        "events_per_second": stats.events_per_second(),
+                        "batches": stats.batches,
+                        "final_lag": stats.lag,
+                    }
+                )
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from xgboost import XGBClassifier
+
+from src.config import config
+from src.inference.trees import TreeEnsemble
+
+BATCH_SIZES = (1, 64, 10_000)
+
+
+def synthetic_model(model_path: Path, n_features: int = 12) -> list[str]:
+    rng = np.random.default_rng(config.random_state)
+    columns = [f"f{i}" for i in range(n_features)]
+    X = pd.DataFrame(rng.normal(size=(20_000, n_features)), columns=columns)
+    y = (X["f0"] + X["f1"] * X["f2"] + rng.normal(size=len(X)) > 0).astype(int)
+
+    model = XGBClassifier(
+        **config.hyperparameters.model_dump(), random_state=config.random_state
+    )
+    model.fit(X, y)
+    model.save_model(model_path)
+    return columns
+
+
+def time_call(fn, X, repeats: int) -> float:
+    fn(X)
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn(X)
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare XGBoost and native tree-ensemble inference latency."
+    )
+    parser.add_argument("--model-path", type=Path, default=None)
+    parser.add_argument("--repeats", type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        model_path = args.model_path or Path(tmp_dir) / "model.json"
+        if args.model_path is None:
+            synthetic_model(model_path)
+
+        xgb_model = XGBClassifier()
+        xgb_model.load_model(model_path)
+        ensemble = TreeEnsemble.load(model_path)
+
+    rng = np.random.default_rng(0)
+    n_features = len(ensemble.feature_names) or xgb_model.n_features_in_
+    results = {"n_trees": ensemble.n_trees, "depth": ensemble.depth, "batches": []}
+    for batch_size in BATCH_SIZES:
+        X = rng.normal(size=(batch_size, n_features))
+        repeats = max(3, args.repeats // max(1, batch_size // 1000))
+        xgb_seconds = time_call(xgb_model.predict_proba, X, repeats)
+        native_seconds = time_call(ensemble.predict_proba, X, repeats)
+        max_abs_diff = float(
+            np.abs(xgb_model.predict_proba(X) - ensemble.predict_proba(X)).max()
+        )
+        results["batches"].append(
+            {
+                "batch_size": batch_size,
+                "xgboost_ms": xgb_seconds * 1000,
+                "native_ms": native_seconds * 1000,
+                "speedup": xgb_seconds / native_seconds,
+                "max_abs_diff": max_abs_diff,
+            }
+        )
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
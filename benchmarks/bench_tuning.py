@@ -0,0 +1,59 @@
+import argparse
+import json
+import os
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+
+from benchmarks.common import synthetic_features
+from src.config import config
+from src.pipeline.hyperparameter_tuning import tune_hyperparameters
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare sequential full-length trials with the parallel pruned study."
+    )
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--trials", type=int, default=24)
+    parser.add_argument("--n-jobs", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        features_dir = Path(tmp_dir)
+        X, y, _ = synthetic_features(args.rows, label_noise=0.1)
+        pd.concat([X, y], axis=1).to_parquet(features_dir / "train.parquet")
+
+        runs = {
+            "sequential": {"n_jobs": 1, "prune": False},
+            "sequential_pruned": {"n_jobs": 1, "prune": True},
+            "parallel_pruned": {"n_jobs": args.n_jobs, "prune": True},
+        }
+        for name, kwargs in runs.items():
+            hyperparameters, trials_per_hour = tune_hyperparameters(
+                input_path=features_dir,
+                target_column=config.target_column,
+                n_trials=args.trials,
+                storage_path=features_dir / f"{name}.log",
+                params_file=None,
+                **kwargs,
+            )
+            results.append(
+                {
+                    "run": name,
+                    **kwargs,
+                    "trials_per_hour": trials_per_hour,
+                    "best_n_estimators": hyperparameters.n_estimators,
+                }
+            )
+
+    baseline = results[0]["trials_per_hour"]
+    for result in results:
+        result["speedup"] = result["trials_per_hour"] / baseline
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import OneHotEncoder
+from xgboost import XGBClassifier
+
+from src.config import config
+
+CATEGORIES = {
+    "gender": ["Female", "Male"],
+    "subscription_type": ["Basic", "Premium", "Standard"],
+    "contract_length": ["Annual", "Monthly", "Quarterly"],
+}
+NUMERICAL_RANGES = {
+    "age": (18, 65),
+    "tenure": (1, 60),
+    "usage_frequency": (1, 30),
+    "support_calls": (0, 10),
+    "payment_delay": (0, 30),
+    "total_spend": (100.0, 1000.0),
+    "last_interaction": (1, 30),
+}
+
+
+def synthetic_records(n_records: int, seed: int = 0) -> list[dict]:
+    rng = np.random.default_rng(seed)
+    columns = {}
+    for col, (low, high) in NUMERICAL_RANGES.items():
+        if isinstance(low, float):
+            columns[col] = np.round(rng.uniform(low, high, n_records), 2).tolist()
+        else:
+            columns[col] = rng.integers(low, high + 1, n_records).tolist()
+    for col, categories in CATEGORIES.items():
+        columns[col] = rng.choice(categories, n_records).tolist()
+    return [dict(zip(columns, values)) for values in zip(*columns.values())]
+
+
+def synthetic_features(
+    n_rows: int, seed: int = 0, label_noise: float = 0.0
+) -> tuple[pd.DataFrame, pd.Series, dict]:
+    """Encoded churn-shaped features, labels and the matching preprocessor."""
+    df = pd.DataFrame(synthetic_records(n_rows, seed))
+    y = (
+        (df["support_calls"] > 5) | (df["payment_delay"] > 20) | (df["age"] > 50)
+    ).astype(int)
+    if label_noise:
+        flip = np.random.default_rng(seed + 1).random(n_rows) < label_noise
+        y = y.where(~flip, 1 - y)
+
+    categorical_cols = list(CATEGORIES)
+    numerical_cols = list(NUMERICAL_RANGES)
+    encoder = OneHotEncoder(handle_unknown="ignore", sparse_output=False, drop="first")
+    encoder.fit(df[categorical_cols])
+    feature_names_out = encoder.get_feature_names_out(categorical_cols).tolist()
+    X = df[numerical_cols].join(
+        pd.DataFrame(encoder.transform(df[categorical_cols]), columns=feature_names_out)
+    )
+    preprocessor = {
+        "encoder": encoder,
+        "categorical_cols": categorical_cols,
+        "numerical_cols": numerical_cols,
+        "feature_names_out": feature_names_out,
+    }
+    return X, y.rename(config.target_column), preprocessor
+
+
+def write_synthetic_artifacts(
+    model_dir: Path, n_rows: int = 20_000, seed: int = 0
+) -> Path:
+    """Train a churn-shaped model with the params.yaml hyperparameters.
+
+    Writes ``model.json`` and ``preprocessor.joblib`` in the same layout as the
+    pipeline, so benchmarks can serve it through ``api.model_source: local``.
+    """
+    X, y, preprocessor = synthetic_features(n_rows, seed)
+
+    model = XGBClassifier(
+        **config.hyperparameters.model_dump(), random_state=config.random_state
+    )
+    model.fit(X, y)
+
+    model_dir.mkdir(parents=True, exist_ok=True)
+    model.save_model(model_dir / "model.json")
+    joblib.dump(preprocessor, model_dir / "preprocessor.joblib")
+    return model_dir
@@ -0,0 +1,216 @@
+import argparse
+import asyncio
+import json
+import sys
+import tempfile
+import time
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+import httpx
+import numpy as np
+
+from benchmarks.common import synthetic_records, write_synthetic_artifacts
+from src.config import config
+
+DEFAULT_PATH = "/predict"
+
+
+def load_requests(log_path: Path | None, n_synthetic: int, seed: int) -> list[tuple]:
+    if log_path is None:
+        return [
+            (DEFAULT_PATH, record) for record in synthetic_records(n_synthetic, seed)
+        ]
+
+    requests = []
+    with open(log_path, "r") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            if "body" in entry:
+                requests.append((entry.get("path", DEFAULT_PATH), entry["body"]))
+            else:
+                requests.append((DEFAULT_PATH, entry))
+    return requests
+
+
+@asynccontextmanager
+async def in_process_client(model_dir: Path | None):
+    from src.api.main import app
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        config.api.model_source = "local"
+        config.api.local_model_dir = model_dir or write_synthetic_artifacts(
+            Path(tmp_dir)
+        )
+        async with app.router.lifespan_context(app):
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(
+                transport=transport, base_url="http://loadtest"
+            ) as client:
+                yield client
+
+
+async def send(client: httpx.AsyncClient, request: tuple, scheduled: float, results):
+    path, body = request
+    try:
+        response = await client.post(path, json=body)
+        ok = response.status_code < 400
+    except httpx.HTTPError:
+        ok = False
+    results.append((time.perf_counter() - scheduled, ok))
+
+
+async def closed_loop(client, requests: list[tuple], concurrency: int, results):
+    queue = iter(requests)
+
+    async def worker():
+        for request in queue:
+            await send(client, request, time.perf_counter(), results)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+
+async def open_loop(
+    client, requests: list[tuple], rate: float, concurrency: int, results
+):
+    # Latency is measured from the scheduled send time, so queueing caused by a
+    # slow server is included rather than hidden (no coordinated omission).
+    in_flight = asyncio.Semaphore(concurrency)
+    start = time.perf_counter()
+    tasks = []
+
+    async def limited(request, scheduled):
+        async with in_flight:
+            await send(client, request, scheduled, results)
+
+    for i, request in enumerate(requests):
+        scheduled = start + i / rate
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(limited(request, scheduled)))
+    await asyncio.gather(*tasks)
+
+
+def summarize(results: list[tuple], duration: float, args) -> dict:
+    latencies = np.array([latency for latency, _ in results]) * 1000
+    errors = sum(1 for _, ok in results if not ok)
+    return {
+        "target": args.target,
+        "mode": args.mode,
+        "concurrency": args.concurrency,
+        "rate": args.rate if args.mode == "open" else None,
+        "requests": len(results),
+        "errors": errors,
+        "error_rate": errors / len(results),
+        "duration_s": duration,
+        "throughput_rps": len(results) / duration,
+        "latency_ms": {
+            "mean": float(latencies.mean()),
+            "p50": float(np.percentile(latencies, 50)),
+            "p95": float(np.percentile(latencies, 95)),
+            "p99": float(np.percentile(latencies, 99)),
+            "max": float(latencies.max()),
+        },
+    }
+
+
+def compare(report: dict, baseline: dict, tolerance: float) -> list[str]:
+    regressions = []
+    for quantile in ("p50", "p95", "p99"):
+        current, previous = (
+            report["latency_ms"][quantile],
+            baseline["latency_ms"][quantile],
+        )
+        if current > previous * (1 + tolerance):
+            regressions.append(
+                f"{quantile} latency {current:.2f}ms > baseline {previous:.2f}ms"
+            )
+    if report["throughput_rps"] < baseline["throughput_rps"] * (1 - tolerance):
+        regressions.append(
+            f"throughput {report['throughput_rps']:.1f} rps < baseline "
+            f"{baseline['throughput_rps']:.1f} rps"
+        )
+    if report["error_rate"] > baseline["error_rate"]:
+        regressions.append(
+            f"error rate {report['error_rate']:.4f} > baseline {baseline['error_rate']:.4f}"
+        )
+    return regressions
+
+
+async def run(args) -> dict:
+    requests = load_requests(args.log, args.requests, args.seed)
+    results = []
+
+    if args.target == "inprocess":
+        client_context = in_process_client(args.model_dir)
+    else:
+        client_context = httpx.AsyncClient(base_url=args.target, timeout=30)
+
+    async with client_context as client:
+        for request in requests[: args.warmup]:
+            await client.post(request[0], json=request[1])
+
+        start = time.perf_counter()
+        if args.mode == "open":
+            await open_loop(client, requests, args.rate, args.concurrency, results)
+        else:
+            await closed_loop(client, requests, args.concurrency, results)
+        duration = time.perf_counter() - start
+
+    return summarize(results, duration, args)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Replay or synthesize prediction requests and report latency."
+    )
+    parser.add_argument(
+        "--target",
+        default="inprocess",
+        help="'inprocess' or the base URL of a running server, e.g. http://127.0.0.1:8000",
+    )
+    parser.add_argument("--log", type=Path, default=None, help="JSONL request log")
+    parser.add_argument("--requests", type=int, default=2_000)
+    parser.add_argument("--mode", choices=["closed", "open"], default="closed")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--rate", type=float, default=200.0, help="open-loop req/s")
+    parser.add_argument("--warmup", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--model-dir",
+        type=Path,
+        default=None,
+        help="model.json/preprocessor.joblib for in-process runs (synthetic if omitted)",
+    )
+    parser.add_argument("--output", type=Path, default=None)
+    parser.add_argument("--baseline", type=Path, default=None)
+    parser.add_argument("--tolerance", type=float, default=0.1)
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2))
+    print(json.dumps(report, indent=2))
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text())
+        load_shape = ("target", "mode", "concurrency", "rate")
+        if any(baseline[key] != report[key] for key in load_shape):
+            print(
+                f"Baseline was recorded with a different load shape: "
+                f"{ {key: baseline[key] for key in load_shape} }",
+                file=sys.stderr,
+            )
+            sys.exit(2)
+
+        regressions = compare(report, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION: {regression}", file=sys.stderr)
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+import asyncio
+from collections.abc import Callable, Sequence
+from contextlib import suppress
+from typing import Any
+
+from src.api.metrics import (
+    MICRO_BATCH_QUEUE_DEPTH,
+    MICRO_BATCH_SIZE,
+    MICRO_BATCH_WAIT_SECONDS,
+)
+from src.logs import get_logger
+
+logger = get_logger("micro_batching")
+
+
+class MicroBatcher:
+    """Coalesces concurrent single-record requests into one scoring call.
+
+    Requests are collected until ``max_batch_size`` records are queued or the
+    oldest one has waited ``max_delay_ms``; the batch is scored off the event
+    loop and every caller receives, through a future, the model that scored the
+    batch (as returned by ``score_batch``) and its own probability.
+    """
+
+    def __init__(
+        self,
+        score_batch: Callable[[list], tuple[Any, Sequence[float]]],
+        max_batch_size: int,
+        max_delay_ms: float,
+    ):
+        self.score_batch = score_batch
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay_ms / 1000
+        self._queue: asyncio.Queue | None = None
+        self._task: asyncio.Task | None = None
+        self._batch: list = []
+
+    async def start(self):
+        self._queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._run())
+        logger.info(
+            f"Micro-batching enabled (max_batch_size={self.max_batch_size}, "
+            f"max_delay={self.max_delay * 1000:.1f}ms)"
+        )
+
+    async def stop(self):
+        self._task.cancel()
+        with suppress(asyncio.CancelledError):
+            await self._task
+
+        # Requests still queued, or collected but not scored, would otherwise
+        # wait for a result that never comes.
+        pending = self._batch
+        while not self._queue.empty():
+            pending.append(self._queue.get_nowait())
+        MICRO_BATCH_QUEUE_DEPTH.set(0)
+        self._fail(pending, RuntimeError("Micro-batcher stopped before scoring."))
+
+    async def submit(self, item: Any) -> tuple[Any, float]:
+        if self._task is None or self._task.done():
+            raise RuntimeError("Micro-batcher is not running.")
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._queue.put_nowait((item, future, loop.time()))
+        MICRO_BATCH_QUEUE_DEPTH.set(self._queue.qsize())
+        return await future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            self._batch = batch = [await self._queue.get()]
+            deadline = batch[0][2] + self.max_delay
+            while len(batch) < self.max_batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                    continue
+                except asyncio.QueueEmpty:
+                    pass
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except TimeoutError:
+                    break
+
+            MICRO_BATCH_QUEUE_DEPTH.set(self._queue.qsize())
+            MICRO_BATCH_SIZE.observe(len(batch))
+            MICRO_BATCH_WAIT_SECONDS.observe(loop.time() - batch[0][2])
+            await self._score(batch)
+
+    async def _score(self, batch: list):
+        items = [item for item, _, _ in batch]
+        try:
+            model, probabilities = await asyncio.to_thread(self.score_batch, items)
+        except Exception as e:
+            logger.error(f"Micro-batch of {len(batch)} requests failed. Error: {e}")
+            self._fail(batch, e)
+            return
+
+        for (_, future, _), probability in zip(batch, probabilities):
+            if not future.done():
+                future.set_result((model, float(probability)))
+
+    @staticmethod
+    def _fail(batch: list, error: Exception):
+        for _, future, _ in batch:
+            if not future.done():
+                future.set_exception(error)
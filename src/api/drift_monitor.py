@@ -0,0 +1,144 @@
+import asyncio
+import json
+import os
+import threading
+import time
+from collections.abc import Sequence
+from contextlib import suppress
+from pathlib import Path
+
+from src.api.metrics import DRIFT_PSI
+from src.api.model_store import ModelBundle
+from src.inference.drift import PROBABILITY, DriftProfile
+from src.logs import get_logger
+
+logger = get_logger("drift_monitor")
+
+
+class DriftMonitor:
+    """Sketches served inputs and scores against the bundle's reference profile.
+
+    Each observed record costs a fixed number of bin lookups, and memory is
+    bounded by the reference bins. Every worker periodically writes its
+    sketches to ``sketch_dir``, one file per process and model version, with
+    the time of the write; ``report`` merges the files of all workers that
+    serve the same model version. Files not rewritten for ``stale_after_s``
+    belong to stopped workers and are deleted. Sketches restart when the model
+    changes.
+    """
+
+    def __init__(
+        self,
+        sketch_dir: Path,
+        flush_interval_s: float,
+        psi_threshold: float,
+        stale_after_s: float,
+    ):
+        if stale_after_s <= flush_interval_s:
+            raise ValueError("stale_after_s must be longer than flush_interval_s.")
+        self.sketch_dir = Path(sketch_dir)
+        self.worker_id = str(os.getpid())
+        self.flush_interval = flush_interval_s
+        self.psi_threshold = psi_threshold
+        self.stale_after = stale_after_s
+        self.version: str | None = None
+        self.reference: DriftProfile | None = None
+        self.current: DriftProfile | None = None
+        self._replaced_path: Path | None = None
+        self._lock = threading.Lock()
+        self._task: asyncio.Task | None = None
+
+    def path(self, version: str) -> Path:
+        return self.sketch_dir / f"worker-{self.worker_id}-{version}.json"
+
+    def observe(
+        self,
+        bundle: ModelBundle,
+        records: Sequence[dict],
+        probabilities: Sequence[float] | None = None,
+    ):
+        if bundle.reference_profile is None:
+            return
+        with self._lock:
+            if bundle.version != self.version:
+                if self.version is not None:
+                    self._replaced_path = self.path(self.version)
+                self.version = bundle.version
+                self.reference = bundle.reference_profile
+                self.current = self.reference.empty()
+            for record in records:
+                self.current.update(record)
+            if probabilities is not None and PROBABILITY in self.current.sketches:
+                scores = self.current.sketches[PROBABILITY]
+                for probability in probabilities:
+                    scores.update(probability)
+
+    def flush(self):
+        with self._lock:
+            if self.current is None:
+                return
+            state = {
+                "version": self.version,
+                "updated_at": time.time(),
+                "sketches": self.current.to_dict(),
+            }
+            replaced_path, self._replaced_path = self._replaced_path, None
+        self.sketch_dir.mkdir(parents=True, exist_ok=True)
+        path = self.path(state["version"])
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(state))
+        tmp_path.replace(path)
+        if replaced_path is not None:
+            replaced_path.unlink(missing_ok=True)
+
+    def merged(self) -> DriftProfile | None:
+        """Sketches of every worker serving this worker's model version."""
+        self.flush()
+        if self.current is None:
+            return None
+        merged = self.reference.empty()
+        now = time.time()
+        for path in self.sketch_dir.glob("worker-*.json"):
+            try:
+                state = json.loads(path.read_text())
+            except (OSError, ValueError):
+                continue
+            if now - state.get("updated_at", 0) > self.stale_after:
+                path.unlink(missing_ok=True)
+            elif state["version"] == self.version:
+                merged.merge(DriftProfile.from_dict(state["sketches"]))
+        return merged
+
+    def report(self) -> dict | None:
+        merged = self.merged()
+        if merged is None:
+            return None
+        fields = merged.compare(self.reference)
+        for name, stats in fields.items():
+            stats["drifted"] = stats["psi"] > self.psi_threshold
+            DRIFT_PSI.labels(field=name).set(stats["psi"])
+        return {
+            "version": self.version,
+            "count": merged.count(),
+            "psi_threshold": self.psi_threshold,
+            "fields": fields,
+            "drifted": [name for name, stats in fields.items() if stats["drifted"]],
+        }
+
+    async def start(self):
+        self._task = asyncio.create_task(self._run())
+        logger.info(f"Drift monitoring enabled, sketches in {self.sketch_dir}")
+
+    async def stop(self):
+        self._task.cancel()
+        with suppress(asyncio.CancelledError):
+            await self._task
+        self.flush()
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await asyncio.to_thread(self.flush)
+            except Exception as e:
+                logger.error(f"Writing drift sketches failed. Error: {e!r}")
@@ -0,0 +1,56 @@
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Sequence
+
+from src.api.metrics import FEATURE_CACHE_EVENTS, ONLINE_STORE_FETCH_SECONDS
+from src.inference.online_store import OnlineStore, customer_key
+
+
+class FeatureLookup:
+    """Fetches customer feature rows through a bounded LRU + TTL cache.
+
+    Cache misses for a request are fetched from the online store in one batch.
+    The TTL bounds how long a row can lag behind a materialization.
+    """
+
+    def __init__(self, store: OnlineStore, capacity: int, ttl_s: float):
+        self.store = store
+        self.capacity = capacity
+        self.ttl = ttl_s
+        self._entries: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_many(self, customer_ids: Sequence) -> dict[str, dict]:
+        keys = [customer_key(customer_id) for customer_id in customer_ids]
+        found, missing = {}, []
+        now = time.monotonic()
+        with self._lock:
+            for key in dict.fromkeys(keys):
+                entry = self._entries.get(key)
+                if entry is not None and entry[0] >= now:
+                    self._entries.move_to_end(key)
+                    found[key] = entry[1]
+                else:
+                    missing.append(key)
+        FEATURE_CACHE_EVENTS.labels(event="hit").inc(len(found))
+        if not missing:
+            return found
+        FEATURE_CACHE_EVENTS.labels(event="miss").inc(len(missing))
+
+        start = time.perf_counter()
+        fetched = self.store.get_many(missing)
+        ONLINE_STORE_FETCH_SECONDS.observe(time.perf_counter() - start)
+
+        expires_at = time.monotonic() + self.ttl
+        with self._lock:
+            for key, row in fetched.items():
+                self._entries[key] = (expires_at, row)
+                self._entries.move_to_end(key)
+            evicted = 0
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+                evicted += 1
+        if evicted:
+            FEATURE_CACHE_EVENTS.labels(event="eviction").inc(evicted)
+        return found | fetched
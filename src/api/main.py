@@ -1,78 +1,330 @@
-import os
+import json
 from contextlib import asynccontextmanager
 
-import joblib
-import pandas as pd
-from fastapi import FastAPI
-from pydantic import BaseModel
-from xgboost import XGBClassifier
+import numpy as np
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from prometheus_fastapi_instrumentator import Instrumentator
+from starlette.concurrency import run_in_threadpool
 
-import wandb
-from src.config import MODEL_DIR, WANDB_MODEL_NAME
+from src.api.batching import MicroBatcher
+from src.api.drift_monitor import DriftMonitor
+from src.api.feature_lookup import FeatureLookup
+from src.api.metrics import (
+    MODEL_DOWNLOAD_SECONDS,
+    MODEL_RESOLVE_SECONDS,
+    PREDICT_BATCH_SIZE,
+    RequestTimestampMiddleware,
+    StageTimer,
+)
+from src.api.model_store import ModelBundle, ModelStore, load_bundle, model_source
+from src.api.prediction_cache import PredictionCache
+from src.api.reloader import ModelReloader
+from src.api.schemas import (
+    BatchPredictionInput,
+    BatchPredictionOutput,
+    CustomerIdsInput,
+    CustomerPredictionOutput,
+    ModelVersionOutput,
+    PredictionInput,
+    PredictionOutput,
+)
+from src.config import DECISION_THRESHOLD, PROJECT_ROOT, config
+from src.inference.explanations import Explainer, LazyExplainer
+from src.inference.online_store import customer_key
+from src.logs import get_logger
+from src.pipeline.feature_materialization import open_store
 
-preprocessor: dict | None = None
-model: XGBClassifier | None = None
+logger = get_logger("api")
+
+store = ModelStore()
+batcher: MicroBatcher | None = None
+reloader: ModelReloader | None = None
+prediction_cache: PredictionCache | None = None
+feature_lookup: FeatureLookup | None = None
+drift_monitor: DriftMonitor | None = None
+
+
+def score_records(
+    records: list[dict], timer: StageTimer | None = None
+) -> tuple[ModelBundle, np.ndarray]:
+    """Scores records with the current model and returns it with the scores, so
+    callers attribute them to the model that produced them after a swap."""
+    bundle = store.current
+    features = bundle.encoder.encode_batch(records)
+    if timer is not None:
+        timer.lap("encode")
+    probabilities = bundle.predict_proba(features)
+    if timer is not None:
+        timer.lap("infer")
+    return bundle, probabilities
 
 
 @asynccontextmanager
 async def lifespan(_: FastAPI):
-    global model, preprocessor
+    global batcher, reloader, prediction_cache, feature_lookup, drift_monitor
 
-    run = wandb.init(
-        project=os.getenv("WANDB_PROJECT"), entity=os.getenv("WANDB_ENTITY")
-    )
-    artifact = run.use_artifact(
-        f"{WANDB_MODEL_NAME}", type="model", aliases=["production"]
+    source = model_source()
+    artifact = source.fetch()
+    MODEL_RESOLVE_SECONDS.set(artifact.resolve_seconds)
+    MODEL_DOWNLOAD_SECONDS.set(artifact.download_seconds)
+    logger.info(
+        f"Model artifact {artifact.digest} loaded from {artifact.path} "
+        f"(cache hit: {artifact.from_cache}, resolve: {artifact.resolve_seconds:.2f}s, "
+        f"download: {artifact.download_seconds:.2f}s)"
     )
-    artifact_dir = artifact.download(root=MODEL_DIR)
+    store.swap(load_bundle(artifact))
+
+    if config.api.prediction_cache.enabled:
+        prediction_cache = PredictionCache(
+            capacity=config.api.prediction_cache.capacity,
+            ttl_s=config.api.prediction_cache.ttl_s,
+        )
+
+    if config.online_store.enabled:
+        feature_lookup = FeatureLookup(
+            open_store(readonly=True),
+            capacity=config.online_store.cache_capacity,
+            ttl_s=config.online_store.cache_ttl_s,
+        )
+
+    if config.drift.enabled:
+        drift_monitor = DriftMonitor(
+            PROJECT_ROOT / config.drift.sketch_dir,
+            flush_interval_s=config.drift.flush_interval_s,
+            psi_threshold=config.drift.psi_threshold,
+            stale_after_s=config.drift.stale_after_s,
+        )
+        await drift_monitor.start()
+
+    if config.api.micro_batching.enabled:
+        batcher = MicroBatcher(
+            score_records,
+            max_batch_size=config.api.micro_batching.max_batch_size,
+            max_delay_ms=config.api.micro_batching.max_delay_ms,
+        )
+        await batcher.start()
+
+    if config.api.hot_reload.enabled:
+        reloader = ModelReloader(
+            store, source, poll_interval_s=config.api.hot_reload.poll_interval_s
+        )
+        await reloader.start()
 
-    model = XGBClassifier()
-    model.load_model(os.path.join(artifact_dir, "model.json"))
-    preprocessor = joblib.load(os.path.join(artifact_dir, "preprocessor.joblib"))
-    run.finish()
     yield
 
+    for task in (reloader, batcher, drift_monitor):
+        if task is not None:
+            await task.stop()
+    if feature_lookup is not None:
+        feature_lookup.store.close()
+    batcher = reloader = prediction_cache = feature_lookup = drift_monitor = None
+
 
 app = FastAPI(title="Churn Prediction API", lifespan=lifespan)
+app.add_middleware(RequestTimestampMiddleware)
+Instrumentator(
+    excluded_handlers=["/metrics"],
+    should_instrument_requests_inprogress=True,
+    inprogress_labels=True,
+).instrument(app).expose(app)
 
 
-class PredictionInput(BaseModel):
-    age: int = 30
-    gender: str = "Male"
-    tenure: int = 12
-    usage_frequency: int = 15
-    support_calls: int = 3
-    payment_delay: int = 10
-    subscription_type: str = "Premium"
-    contract_length: str = "Monthly"
-    total_spend: float = 500.0
-    last_interaction: int = 15
+def stream_predictions(
+    predictions: np.ndarray,
+    probabilities: np.ndarray,
+    explanations: list[list[dict]] | None = None,
+):
+    chunk_size = config.api.batch.stream_chunk_size
+    for start in range(0, len(predictions), chunk_size):
+        stop = start + chunk_size
+        lines = [
+            {"prediction": int(pred), "probability": float(proba)}
+            for pred, proba in zip(predictions[start:stop], probabilities[start:stop])
+        ]
+        if explanations is not None:
+            for line, explanation in zip(lines, explanations[start:stop]):
+                line["explanation"] = explanation
+        yield "".join(json.dumps(line) + "\n" for line in lines)
 
 
-class PredictionOutput(BaseModel):
-    prediction: int
+def explainer_of(bundle: ModelBundle) -> Explainer | LazyExplainer:
+    if bundle.explainer is None:
+        raise HTTPException(
+            status_code=501,
+            detail="Explanations need the model's XGBoost model.json.",
+        )
+    return bundle.explainer
 
 
-@app.post("/predict", response_model=PredictionOutput)
-def predict(input_data: PredictionInput):
-    input_df = pd.DataFrame([input_data.model_dump()])
+def version_info(bundle: ModelBundle) -> dict:
+    return {
+        "version": bundle.version,
+        "loaded_at": bundle.loaded_at,
+        "previous_version": store.previous.version if store.previous else None,
+    }
 
-    cat_cols = preprocessor["categorical_cols"]
-    num_cols = preprocessor["numerical_cols"]
-    encoded_cols = preprocessor["encoder"].transform(input_df[cat_cols])
-    encoded_df = pd.DataFrame(
-        encoded_cols,
-        columns=preprocessor["feature_names_out"],
-        index=input_df.index,
-    )
 
-    processed_df = pd.concat([input_df[num_cols], encoded_df], axis=1)
+@app.post("/predict", response_model=PredictionOutput, response_model_exclude_none=True)
+async def predict(
+    input_data: PredictionInput,
+    request: Request,
+    explain: bool = False,
+    top_k: int = Query(config.api.explanations.top_k, ge=1),
+):
+    timer = StageTimer("predict", request.state.received_at)
+    timer.lap("validate")
+    record = input_data.model_dump()
+    bundle = store.current
+    timer.lap("assemble")
+
+    if explain:
+        explainer = explainer_of(bundle)
+        features = bundle.encoder.encode(record)
+        timer.lap("encode")
+        probability = float(
+            (await run_in_threadpool(bundle.predict_proba, features))[0]
+        )
+        timer.lap("infer")
+        explanation = (await run_in_threadpool(explainer.explain, features, top_k))[0]
+        timer.lap("explain")
+        if drift_monitor is not None:
+            drift_monitor.observe(bundle, [record], [probability])
+        return {
+            "prediction": int(probability > DECISION_THRESHOLD),
+            "explanation": explanation,
+        }
+
+    if prediction_cache is not None:
+        probability = prediction_cache.get(bundle.version, record)
+        if probability is not None:
+            if drift_monitor is not None:
+                drift_monitor.observe(bundle, [record], [probability])
+            return {"prediction": int(probability > DECISION_THRESHOLD)}
+
+    if batcher is not None:
+        bundle, probability = await batcher.submit(record)
+    else:
+        features = bundle.encoder.encode(record)
+        timer.lap("encode")
+        probability = float(
+            (await run_in_threadpool(bundle.predict_proba, features))[0]
+        )
+    timer.lap("infer")
+    if drift_monitor is not None:
+        drift_monitor.observe(bundle, [record], [probability])
+
+    if prediction_cache is not None:
+        prediction_cache.put(bundle.version, record, probability)
+    return {"prediction": int(probability > DECISION_THRESHOLD)}
+
+
+@app.post(
+    "/predict/batch",
+    response_model=BatchPredictionOutput,
+    response_model_exclude_none=True,
+)
+def predict_batch(
+    input_data: BatchPredictionInput,
+    request: Request,
+    stream: bool | None = None,
+    explain: bool = False,
+    top_k: int = Query(config.api.explanations.top_k, ge=1),
+):
+    timer = StageTimer("predict_batch", request.state.received_at)
+    timer.lap("validate")
+    PREDICT_BATCH_SIZE.observe(len(input_data.records))
+    records = [record.model_dump() for record in input_data.records]
+    bundle = store.current
+    explainer = explainer_of(bundle) if explain else None
+    timer.lap("assemble")
+
+    features = bundle.encoder.encode_batch(records)
+    timer.lap("encode")
+    probabilities = bundle.predict_proba(features)
+    timer.lap("infer")
+    predictions = (probabilities > DECISION_THRESHOLD).astype(int)
+    if drift_monitor is not None:
+        drift_monitor.observe(bundle, records, probabilities)
+
+    explanations = None
+    if explainer is not None:
+        explanations = explainer.explain(features, top_k)
+        timer.lap("explain")
+
+    if stream is None:
+        stream = config.api.batch.stream_response
+    if stream:
+        return StreamingResponse(
+            stream_predictions(predictions, probabilities, explanations),
+            media_type="application/x-ndjson",
+        )
+    return {
+        "predictions": predictions.tolist(),
+        "probabilities": probabilities.tolist(),
+        "explanations": explanations,
+    }
+
+
+@app.post("/predict/by-id", response_model=CustomerPredictionOutput)
+def predict_by_id(input_data: CustomerIdsInput, request: Request):
+    if feature_lookup is None:
+        raise HTTPException(status_code=503, detail="Online feature store disabled.")
+    timer = StageTimer("predict_by_id", request.state.received_at)
+    timer.lap("validate")
+    customer_ids = list(dict.fromkeys(map(customer_key, input_data.customer_ids)))
+    rows = feature_lookup.get_many(customer_ids)
+    found = [customer_id for customer_id in customer_ids if customer_id in rows]
+    if not found:
+        raise HTTPException(status_code=404, detail="No features for these customers.")
+    timer.lap("assemble")
+
+    records = [rows[customer_id] for customer_id in found]
+    bundle, probabilities = score_records(records, timer)
+    if drift_monitor is not None:
+        drift_monitor.observe(bundle, records, probabilities)
+    return {
+        "predictions": [
+            {
+                "customer_id": customer_id,
+                "prediction": int(probability > DECISION_THRESHOLD),
+                "probability": float(probability),
+            }
+            for customer_id, probability in zip(found, probabilities)
+        ],
+        "not_found": [
+            customer_id for customer_id in customer_ids if customer_id not in rows
+        ],
+    }
+
+
+@app.get("/monitoring/drift")
+def drift_report():
+    if drift_monitor is None:
+        raise HTTPException(status_code=503, detail="Drift monitoring disabled.")
+    report = drift_monitor.report()
+    if report is None:
+        raise HTTPException(
+            status_code=404,
+            detail="No traffic observed for a model with a reference profile.",
+        )
+    return report
+
+
+@app.get("/model/version", response_model=ModelVersionOutput)
+def model_version():
+    return version_info(store.current)
+
 
-    ordered_cols = model.get_booster().feature_names
-    processed_df = processed_df[ordered_cols]
+@app.post("/model/rollback", response_model=ModelVersionOutput)
+def model_rollback():
+    try:
+        bundle = store.rollback()
+    except LookupError as e:
+        raise HTTPException(status_code=409, detail=str(e))
 
-    prediction = model.predict(processed_df)[0]
-    return {"prediction": int(prediction)}
+    logger.warning(f"Rolled back serving model to version {bundle.version}")
+    return version_info(bundle)
 
 
 @app.get("/")
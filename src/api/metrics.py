@@ -0,0 +1,127 @@
+import time
+
+from prometheus_client import Counter, Gauge, Histogram
+
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024)
+STAGE_BUCKETS = (
+    0.00001,
+    0.000025,
+    0.00005,
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    1.0,
+)
+PREDICT_STAGES = ("validate", "assemble", "encode", "infer", "explain")
+
+PREDICT_STAGE_SECONDS = Histogram(
+    "churn_predict_stage_seconds",
+    "Time spent in each stage of the prediction path.",
+    ["endpoint", "stage"],
+    buckets=STAGE_BUCKETS,
+)
+PREDICT_BATCH_SIZE = Histogram(
+    "churn_predict_batch_records",
+    "Number of records per /predict/batch request.",
+    buckets=BATCH_SIZE_BUCKETS + (2048, 4096, 8192, 16384),
+)
+
+MICRO_BATCH_QUEUE_DEPTH = Gauge(
+    "churn_micro_batch_queue_depth",
+    "Requests waiting to be scored by the micro-batcher.",
+)
+MICRO_BATCH_SIZE = Histogram(
+    "churn_micro_batch_size",
+    "Number of requests scored together in one micro-batch.",
+    buckets=BATCH_SIZE_BUCKETS,
+)
+MICRO_BATCH_WAIT_SECONDS = Histogram(
+    "churn_micro_batch_wait_seconds",
+    "Time the oldest request in a micro-batch waited before scoring.",
+    buckets=(0.0005, 0.001, 0.002, 0.005, 0.01, 0.025, 0.05, 0.1),
+)
+
+MODEL_RESOLVE_SECONDS = Gauge(
+    "churn_model_resolve_seconds",
+    "Time spent resolving the model artifact alias at startup.",
+)
+MODEL_DOWNLOAD_SECONDS = Gauge(
+    "churn_model_download_seconds",
+    "Time spent downloading the model artifact at startup (0 on a cache hit).",
+)
+
+MODEL_RELOADS = Counter(
+    "churn_model_reloads",
+    "Hot-reload attempts of a new model version, by outcome.",
+    ["outcome"],
+)
+
+PREDICTION_CACHE_EVENTS = Counter(
+    "churn_prediction_cache_events",
+    "Prediction cache lookups and evictions, by event (hit, miss, expired, eviction).",
+    ["event"],
+)
+PREDICTION_CACHE_SIZE = Gauge(
+    "churn_prediction_cache_size",
+    "Number of entries currently held in the prediction cache.",
+)
+
+DRIFT_PSI = Gauge(
+    "churn_drift_psi",
+    "Population stability index of served traffic against the reference profile.",
+    ["field"],
+)
+
+FEATURE_CACHE_EVENTS = Counter(
+    "churn_feature_cache_events",
+    "Customer feature cache lookups and evictions, by event (hit, miss, eviction).",
+    ["event"],
+)
+ONLINE_STORE_FETCH_SECONDS = Histogram(
+    "churn_online_store_fetch_seconds",
+    "Time to fetch a batch of customer feature rows from the online store.",
+    buckets=STAGE_BUCKETS,
+)
+
+
+# Label children are resolved once so timing a request costs a few observe() calls.
+_STAGE_HISTOGRAMS = {
+    endpoint: {
+        stage: PREDICT_STAGE_SECONDS.labels(endpoint=endpoint, stage=stage)
+        for stage in PREDICT_STAGES
+    }
+    for endpoint in ("predict", "predict_batch", "predict_by_id")
+}
+
+
+class StageTimer:
+    __slots__ = ("histograms", "last")
+
+    def __init__(self, endpoint: str, started_at: float):
+        self.histograms = _STAGE_HISTOGRAMS[endpoint]
+        self.last = started_at
+
+    def lap(self, stage: str):
+        now = time.perf_counter()
+        self.histograms[stage].observe(now - self.last)
+        self.last = now
+
+
+class RequestTimestampMiddleware:
+    """Stamps the arrival time so handlers can time body parsing and validation."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            scope.setdefault("state", {})["received_at"] = time.perf_counter()
+        await self.app(scope, receive, send)
@@ -0,0 +1,216 @@
+import hashlib
+import os
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+
+import joblib
+import numpy as np
+from xgboost import XGBClassifier
+
+from src.api.schemas import PredictionInput
+from src.config import ARTIFACT_CACHE_DIR, PROJECT_ROOT, WANDB_MODEL_NAME, config
+from src.inference.artifacts import ArtifactCache, ArtifactLoad, load_model_artifact
+from src.inference.drift import REFERENCE_PROFILE_FILE, DriftProfile
+from src.inference.explanations import Explainer, LazyExplainer
+from src.inference.preprocessing import FeatureEncoder
+from src.inference.trees import TREES_META_FILE, TreeEnsemble
+
+MODEL_FILE = "model.json"
+PREPROCESSOR_FILE = "preprocessor.joblib"
+VERSION_FILE = "VERSION"
+SHARED_MODEL_DIR_ENV = "CHURN_SHARED_MODEL_DIR"
+
+
+@dataclass(frozen=True)
+class ModelBundle:
+    model: XGBClassifier | TreeEnsemble
+    preprocessor: dict
+    encoder: FeatureEncoder
+    version: str
+    reference_profile: DriftProfile | None = None
+    explainer: Explainer | LazyExplainer | None = None
+    loaded_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+
+    def predict_proba(self, features: np.ndarray) -> np.ndarray:
+        return self.model.predict_proba(features)[:, 1]
+
+
+class ModelStore:
+    """Holds the serving bundle; readers take ``current`` once per request.
+
+    Swapping replaces the whole bundle in a single reference assignment, so a
+    request never sees a model paired with another version's preprocessor.
+    The rejected versions are shared with the reloader thread and only touched
+    under the lock.
+    """
+
+    def __init__(self):
+        self.current: ModelBundle | None = None
+        self.previous: ModelBundle | None = None
+        self._rejected: set[str] = set()
+        self._lock = threading.Lock()
+
+    def swap(self, bundle: ModelBundle):
+        with self._lock:
+            self._rejected.discard(bundle.version)
+            self.previous, self.current = self.current, bundle
+
+    def rollback(self) -> ModelBundle:
+        with self._lock:
+            if self.previous is None:
+                raise LookupError("No previous model version to roll back to.")
+            self._rejected.add(self.current.version)
+            self._rejected.discard(self.previous.version)
+            self.current, self.previous = self.previous, self.current
+            return self.current
+
+    def reject(self, version: str):
+        with self._lock:
+            self._rejected.add(version)
+
+    def is_rejected(self, version: str) -> bool:
+        with self._lock:
+            return version in self._rejected
+
+
+class WandbModelSource:
+    def __init__(self):
+        cache_config = config.api.artifact_cache
+        self.cache = ArtifactCache(
+            ARTIFACT_CACHE_DIR, max_bytes=cache_config.max_size_mb * 2**20
+        )
+        self.offline = cache_config.offline
+        self.resolve_timeout = cache_config.resolve_timeout_s
+
+    def fetch(self) -> ArtifactLoad:
+        return load_model_artifact(
+            self.cache,
+            WANDB_MODEL_NAME,
+            alias="production",
+            offline=self.offline,
+            resolve_timeout=self.resolve_timeout,
+        )
+
+
+class LocalModelSource:
+    def __init__(self, model_dir: Path):
+        self.model_dir = PROJECT_ROOT / model_dir
+        self._fingerprint: tuple | None = None
+        self._digest: str | None = None
+
+    def fetch(self) -> ArtifactLoad:
+        files = [self.model_dir / MODEL_FILE, self.model_dir / PREPROCESSOR_FILE]
+        fingerprint = tuple((f.stat().st_mtime_ns, f.stat().st_size) for f in files)
+        if fingerprint != self._fingerprint:
+            digest = hashlib.sha256()
+            for f in files:
+                digest.update(f.read_bytes())
+            self._fingerprint, self._digest = fingerprint, digest.hexdigest()[:32]
+
+        return ArtifactLoad(
+            path=self.model_dir,
+            digest=self._digest,
+            from_cache=True,
+            resolve_seconds=0.0,
+            download_seconds=0.0,
+        )
+
+
+class SharedModelSource:
+    """Model exported once by ``src.api.serve`` for all uvicorn workers."""
+
+    def __init__(self, shared_dir: Path):
+        self.shared_dir = shared_dir
+
+    def fetch(self) -> ArtifactLoad:
+        return ArtifactLoad(
+            path=self.shared_dir,
+            digest=(self.shared_dir / VERSION_FILE).read_text().strip(),
+            from_cache=True,
+            resolve_seconds=0.0,
+            download_seconds=0.0,
+        )
+
+
+def model_source() -> WandbModelSource | LocalModelSource | SharedModelSource:
+    if shared_dir := os.getenv(SHARED_MODEL_DIR_ENV):
+        return SharedModelSource(Path(shared_dir))
+    if config.api.model_source == "local":
+        return LocalModelSource(config.api.local_model_dir)
+    return WandbModelSource()
+
+
+def load_model(model_path: Path) -> XGBClassifier | TreeEnsemble:
+    if config.inference.engine == "native":
+        return TreeEnsemble.load(model_path)
+
+    model = XGBClassifier()
+    model.load_model(model_path)
+    return model
+
+
+def feature_names_of(model: XGBClassifier | TreeEnsemble) -> list[str]:
+    if isinstance(model, TreeEnsemble):
+        return model.feature_names
+    return model.get_booster().feature_names
+
+
+def load_explainer(
+    model: XGBClassifier | TreeEnsemble,
+    artifact_dir: Path,
+    preprocessor: dict,
+    feature_names: list[str],
+) -> Explainer | LazyExplainer | None:
+    if not isinstance(model, TreeEnsemble):
+        return Explainer(model.get_booster(), preprocessor, feature_names)
+    # The native engine keeps no node covers, which TreeSHAP needs, so the
+    # booster is read from model.json the first time an explanation is asked for.
+    if (artifact_dir / MODEL_FILE).exists():
+        return LazyExplainer(artifact_dir / MODEL_FILE, preprocessor, feature_names)
+    return None
+
+
+def load_bundle(artifact: ArtifactLoad) -> ModelBundle:
+    artifact_dir = Path(artifact.path)
+    if (artifact_dir / TREES_META_FILE).exists():
+        model = TreeEnsemble.attach(artifact_dir)
+    else:
+        model = load_model(artifact_dir / MODEL_FILE)
+    preprocessor = joblib.load(artifact_dir / PREPROCESSOR_FILE)
+    feature_names = feature_names_of(model)
+    profile_path = artifact_dir / REFERENCE_PROFILE_FILE
+    return ModelBundle(
+        model=model,
+        preprocessor=preprocessor,
+        encoder=FeatureEncoder(preprocessor, feature_names),
+        version=artifact.digest,
+        reference_profile=(
+            DriftProfile.load(profile_path) if profile_path.exists() else None
+        ),
+        explainer=load_explainer(model, artifact_dir, preprocessor, feature_names),
+    )
+
+
+def sample_records(preprocessor: dict) -> list[dict]:
+    base = PredictionInput().model_dump()
+    records = [base]
+    for col, categories in zip(
+        preprocessor["categorical_cols"], preprocessor["encoder"].categories_
+    ):
+        records.extend({**base, col: category} for category in categories)
+    return records
+
+
+def validate_bundle(bundle: ModelBundle):
+    records = sample_records(bundle.preprocessor)
+    probabilities = bundle.predict_proba(bundle.encoder.encode_batch(records))
+
+    if probabilities.shape != (len(records),):
+        raise ValueError(
+            f"Model {bundle.version} returned shape {probabilities.shape} "
+            f"for a sample batch of {len(records)} records."
+        )
+    if not np.all((probabilities >= 0) & (probabilities <= 1)):
+        raise ValueError(f"Model {bundle.version} returned invalid probabilities.")
@@ -0,0 +1,57 @@
+import threading
+import time
+from collections import OrderedDict
+
+from src.api.metrics import PREDICTION_CACHE_EVENTS, PREDICTION_CACHE_SIZE
+
+
+class PredictionCache:
+    """Bounded LRU + TTL cache of probabilities for repeated input records.
+
+    Keys combine the model version with the record's field values in schema
+    order, so a hot-reload or rollback never serves another model's predictions.
+    Requests still scoring with the old model during a swap keep their own
+    entries, and those entries age out through the LRU order and the TTL.
+    """
+
+    def __init__(self, capacity: int, ttl_s: float):
+        self.capacity = capacity
+        self.ttl = ttl_s
+        self._entries: OrderedDict[tuple, tuple[float, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(version: str, record: dict) -> tuple:
+        return version, *record.values()
+
+    def get(self, version: str, record: dict) -> float | None:
+        key = self.key(version, record)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                PREDICTION_CACHE_EVENTS.labels(event="miss").inc()
+                return None
+            expires_at, probability = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                PREDICTION_CACHE_EVENTS.labels(event="expired").inc()
+                return None
+            self._entries.move_to_end(key)
+
+        PREDICTION_CACHE_EVENTS.labels(event="hit").inc()
+        return probability
+
+    def put(self, version: str, record: dict, probability: float):
+        key = self.key(version, record)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, probability)
+            self._entries.move_to_end(key)
+            evicted = 0
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+                evicted += 1
+            size = len(self._entries)
+
+        if evicted:
+            PREDICTION_CACHE_EVENTS.labels(event="eviction").inc(evicted)
+        PREDICTION_CACHE_SIZE.set(size)
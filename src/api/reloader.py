@@ -0,0 +1,73 @@
+import asyncio
+from contextlib import suppress
+
+from src.api.metrics import MODEL_RELOADS
+from src.api.model_store import (
+    LocalModelSource,
+    ModelStore,
+    SharedModelSource,
+    WandbModelSource,
+    load_bundle,
+    validate_bundle,
+)
+from src.inference.artifacts import ArtifactLoad
+from src.logs import get_logger
+
+logger = get_logger("model_reloader")
+
+
+def load_validated_bundle(artifact: ArtifactLoad):
+    bundle = load_bundle(artifact)
+    validate_bundle(bundle)
+    return bundle
+
+
+class ModelReloader:
+    def __init__(
+        self,
+        store: ModelStore,
+        source: WandbModelSource | LocalModelSource | SharedModelSource,
+        poll_interval_s: float,
+    ):
+        self.store = store
+        self.source = source
+        self.poll_interval = poll_interval_s
+        self._task: asyncio.Task | None = None
+
+    async def start(self):
+        self._task = asyncio.create_task(self._run())
+        logger.info(f"Model hot-reload enabled (every {self.poll_interval}s)")
+
+    async def stop(self):
+        self._task.cancel()
+        with suppress(asyncio.CancelledError):
+            await self._task
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                await self.reload()
+            except Exception as e:
+                logger.error(f"Model reload check failed. Error: {e!r}")
+
+    async def reload(self) -> bool:
+        artifact = await asyncio.to_thread(self.source.fetch)
+        if artifact.digest == self.store.current.version or self.store.is_rejected(
+            artifact.digest
+        ):
+            return False
+
+        logger.info(f"New model version {artifact.digest} found, loading...")
+        try:
+            bundle = await asyncio.to_thread(load_validated_bundle, artifact)
+        except Exception as e:
+            self.store.reject(artifact.digest)
+            MODEL_RELOADS.labels(outcome="rejected").inc()
+            logger.error(f"Rejected model version {artifact.digest}. Error: {e!r}")
+            return False
+
+        self.store.swap(bundle)
+        MODEL_RELOADS.labels(outcome="swapped").inc()
+        logger.info(f"Swapped serving model to version {bundle.version}")
+        return True
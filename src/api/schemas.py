@@ -0,0 +1,63 @@
+from datetime import datetime
+
+from pydantic import BaseModel, Field
+
+from src.config import config
+
+
+class PredictionInput(BaseModel):
+    age: int = 30
+    gender: str = "Male"
+    tenure: int = 12
+    usage_frequency: int = 15
+    support_calls: int = 3
+    payment_delay: int = 10
+    subscription_type: str = "Premium"
+    contract_length: str = "Monthly"
+    total_spend: float = 500.0
+    last_interaction: int = 15
+
+
+class FeatureContribution(BaseModel):
+    feature: str
+    contribution: float
+
+
+class PredictionOutput(BaseModel):
+    prediction: int
+    explanation: list[FeatureContribution] | None = None
+
+
+class BatchPredictionInput(BaseModel):
+    records: list[PredictionInput] = Field(
+        min_length=1, max_length=config.api.batch.max_records
+    )
+
+
+class BatchPredictionOutput(BaseModel):
+    predictions: list[int]
+    probabilities: list[float]
+    explanations: list[list[FeatureContribution]] | None = None
+
+
+class CustomerIdsInput(BaseModel):
+    customer_ids: list[int | str] = Field(
+        min_length=1, max_length=config.api.batch.max_records
+    )
+
+
+class CustomerPrediction(BaseModel):
+    customer_id: str
+    prediction: int
+    probability: float
+
+
+class CustomerPredictionOutput(BaseModel):
+    predictions: list[CustomerPrediction]
+    not_found: list[str]
+
+
+class ModelVersionOutput(BaseModel):
+    version: str
+    loaded_at: datetime
+    previous_version: str | None
@@ -0,0 +1,67 @@
+import argparse
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+import uvicorn
+
+from src.api.model_store import (
+    MODEL_FILE,
+    PREPROCESSOR_FILE,
+    SHARED_MODEL_DIR_ENV,
+    VERSION_FILE,
+    model_source,
+)
+from src.inference.drift import REFERENCE_PROFILE_FILE
+from src.inference.trees import TreeEnsemble
+from src.logs import get_logger
+
+logger = get_logger("serve")
+
+SHM_DIR = Path("/dev/shm")
+
+
+def export_shared_model(shared_dir: Path) -> str:
+    artifact = model_source().fetch()
+    artifact_dir = Path(artifact.path)
+
+    TreeEnsemble.load(artifact_dir / MODEL_FILE).save(shared_dir)
+    # Kept for explanations: a worker loads the booster on its first one.
+    shutil.copy(artifact_dir / MODEL_FILE, shared_dir / MODEL_FILE)
+    shutil.copy(artifact_dir / PREPROCESSOR_FILE, shared_dir / PREPROCESSOR_FILE)
+    if (artifact_dir / REFERENCE_PROFILE_FILE).exists():
+        shutil.copy(
+            artifact_dir / REFERENCE_PROFILE_FILE, shared_dir / REFERENCE_PROFILE_FILE
+        )
+    (shared_dir / VERSION_FILE).write_text(artifact.digest)
+    return artifact.digest
+
+
+def serve(host: str, port: int, workers: int):
+    shared_dir = Path(
+        tempfile.mkdtemp(
+            prefix="churn-model-", dir=SHM_DIR if SHM_DIR.is_dir() else None
+        )
+    )
+    try:
+        version = export_shared_model(shared_dir)
+        logger.info(
+            f"Exported model {version} to {shared_dir}; starting {workers} workers"
+        )
+        os.environ[SHARED_MODEL_DIR_ENV] = str(shared_dir)
+        uvicorn.run("src.api.main:app", host=host, port=port, workers=workers)
+    finally:
+        shutil.rmtree(shared_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Serve the API from several workers sharing one model copy."
+    )
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    serve(args.host, args.port, args.workers)
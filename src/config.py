@@ -1,4 +1,5 @@
 from pathlib import Path
+from typing import Literal
 
 import yaml
 from dotenv import load_dotenv
@@ -15,6 +16,10 @@ PROCESSED_DATA_DIR = DATA_DIR / "processed"
 FEATURES_DIR = DATA_DIR / "features"
 SPLIT_DATA_DIR = DATA_DIR / "split"
 MODEL_DIR = ARTIFACTS_DIR / "models"
+ARTIFACT_CACHE_DIR = MODEL_DIR / "cache"
+STAGE_CACHE_DIR = ARTIFACTS_DIR / "stage_cache"
+TUNING_DIR = ARTIFACTS_DIR / "tuning"
+EVALUATION_DIR = ARTIFACTS_DIR / "evaluation"
 LOG_DIR = PROJECT_ROOT / "logs"
 
 for dir in [
@@ -32,7 +37,7 @@ PARAMS_FILE = PROJECT_ROOT / "params.yaml"
 
 # Data
 RAW_DATA_FILE = "customer_churn_dataset-testing-master.csv"
-CLEANED_DATA_FILE = "cleaned_data.csv"
+CLEANED_DATA_NAME = "cleaned_data"
 KAGGLE_DATASET_NAME = "muhammadshahidazeem/customer-churn-dataset"
 
 # W&B
@@ -43,6 +48,9 @@ TARGET_COLUMN = "churn"
 CUSTOMER_ID_COLUMN_RAW = "customerid"
 CUSTOMER_ID_COLUMN_PROCESSED = "CustomerID"
 
+# Model
+DECISION_THRESHOLD = 0.5
+
 
 class Hyperparameters(BaseModel):
     colsample_bytree: float
@@ -60,11 +68,147 @@ class DataSplit(BaseModel):
     test_size: float
 
 
+class Training(BaseModel):
+    validation_size: float | None = None
+    early_stopping_rounds: int = 20
+    tree_method: Literal["hist", "approx", "exact"] = "hist"
+    max_bin: int = 256
+    nthread: int | None = None
+    external_memory: bool = False
+    batch_rows: int = 100_000
+
+
+class Tuning(BaseModel):
+    n_trials: int = 50
+    n_jobs: int = 4
+    validation_size: float = 0.2
+    max_estimators: int = 300
+    early_stopping_rounds: int = 20
+    pruning_warmup_rounds: int = 10
+
+
+class Evaluation(BaseModel):
+    n_bootstrap: int = 2_000
+    confidence_level: float = 0.95
+    score_bins: int = 4_096
+
+
+class DataCleaning(BaseModel):
+    chunk_size: int | None = None
+
+
+class StageCaching(BaseModel):
+    enabled: bool = True
+    max_size_mb: int = 4_096
+
+
+class DataIO(BaseModel):
+    format: Literal["parquet", "csv"] = "parquet"
+    compression: str = "zstd"
+
+
+class BatchPrediction(BaseModel):
+    max_records: int = 10_000
+    stream_response: bool = False
+    stream_chunk_size: int = 1_000
+
+
+class MicroBatching(BaseModel):
+    enabled: bool = False
+    max_delay_ms: float = 2.0
+    max_batch_size: int = 64
+
+
+class PredictionCaching(BaseModel):
+    enabled: bool = False
+    capacity: int = 100_000
+    ttl_s: float = 300.0
+
+
+class ModelArtifactCache(BaseModel):
+    max_size_mb: int = 2_048
+    offline: bool = False
+    resolve_timeout_s: float = 5.0
+
+
+class HotReload(BaseModel):
+    enabled: bool = False
+    poll_interval_s: float = 60.0
+
+
+class Explanations(BaseModel):
+    top_k: int = 3
+
+
+class Api(BaseModel):
+    model_source: Literal["wandb", "local"] = "wandb"
+    local_model_dir: Path = MODEL_DIR
+    hot_reload: HotReload = HotReload()
+    batch: BatchPrediction = BatchPrediction()
+    micro_batching: MicroBatching = MicroBatching()
+    prediction_cache: PredictionCaching = PredictionCaching()
+    artifact_cache: ModelArtifactCache = ModelArtifactCache()
+    explanations: Explanations = Explanations()
+
+
+class DriftMonitoring(BaseModel):
+    enabled: bool = False
+    reference_bins: int = 20
+    sketch_dir: Path = ARTIFACTS_DIR / "drift"
+    flush_interval_s: float = 30.0
+    stale_after_s: float = 300.0
+    psi_threshold: float = 0.2
+
+
+class OnlineFeatureStore(BaseModel):
+    enabled: bool = False
+    path: Path = ARTIFACTS_DIR / "online_store" / "features.db"
+    chunk_size: int = 100_000
+    cache_capacity: int = 100_000
+    cache_ttl_s: float = 60.0
+
+
+class Streaming(BaseModel):
+    broker: Literal["kafka", "file"] = "kafka"
+    bootstrap_servers: str = "localhost:9092"
+    file_broker_dir: Path = ARTIFACTS_DIR / "streams"
+    input_topic: str = "customer-activity"
+    output_topic: str = "churn-predictions"
+    dead_letter_topic: str = "churn-predictions-dead-letter"
+    group_id: str = "churn-scoring"
+    max_batch_size: int = 500
+    max_delay_ms: float = 100.0
+    report_interval_s: float = 10.0
+
+
+class BulkScoring(BaseModel):
+    output_dir: Path = ARTIFACTS_DIR / "scores"
+    n_jobs: int = 4
+    chunk_size: int = 100_000
+    csv_block_mb: int = 64
+
+
+class Inference(BaseModel):
+    engine: Literal["xgboost", "native"] = "xgboost"
+
+
 class Config(BaseModel):
     random_state: int
     hyperparameters: Hyperparameters
     data_split: DataSplit
     target_column: str
+    training: Training = Training()
+    tuning: Tuning = Tuning()
+    evaluation: Evaluation = Evaluation()
+    data_io: DataIO = DataIO()
+    data_cleaning: DataCleaning = DataCleaning()
+    stage_cache: StageCaching = StageCaching()
+    inference: Inference = Inference()
+    api: Api = Api()
+    online_store: OnlineFeatureStore = OnlineFeatureStore()
+    drift: DriftMonitoring = DriftMonitoring()
+    streaming: Streaming = Streaming()
+    bulk_scoring: BulkScoring = BulkScoring()
 
 
 def load_config() -> Config:
@@ -0,0 +1,144 @@
+import hashlib
+from collections.abc import Iterator
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from src.config import config
+
+SUFFIXES = {"parquet": ".parquet", "csv": ".csv"}
+
+
+def format_of(path: Path) -> str:
+    for data_format, suffix in SUFFIXES.items():
+        if Path(path).suffix == suffix:
+            return data_format
+    raise ValueError(f"Unsupported data file format: {path}")
+
+
+def data_file(
+    directory: Path, stem: str, data_format: str = config.data_io.format
+) -> Path:
+    return Path(directory) / f"{stem}{SUFFIXES[data_format]}"
+
+
+def find_data_file(directory: Path, stem: str | None = None) -> Path:
+    """Returns the ``stem`` table in ``directory``, preferring the configured format.
+
+    A ``<stem>/`` directory of partition files takes precedence over a single file.
+    """
+    if stem and (Path(directory) / stem).is_dir():
+        return Path(directory) / stem
+    formats = sorted(SUFFIXES, key=lambda f: f != config.data_io.format)
+    for data_format in formats:
+        pattern = f"{stem or '*'}{SUFFIXES[data_format]}"
+        if match := next(iter(sorted(Path(directory).glob(pattern))), None):
+            return match
+    raise FileNotFoundError(f"No '{stem or '*'}' data file found in {directory}")
+
+
+def partition_files(path: Path) -> list[Path]:
+    """The partition files of a partitioned table directory, or ``[path]``."""
+    path = Path(path)
+    if not path.is_dir():
+        return [path]
+    return sorted(p for p in path.iterdir() if p.suffix in SUFFIXES.values())
+
+
+def file_digest(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(2**20):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def read_columns(path: Path) -> list[str]:
+    path = partition_files(path)[0]
+    if format_of(path) == "parquet":
+        return pq.read_schema(path).names
+    return pd.read_csv(path, nrows=0).columns.tolist()
+
+
+def read_table(path: Path, columns: list[str] | None = None) -> pd.DataFrame:
+    if Path(path).is_dir():
+        return pd.concat(
+            [read_table(p, columns) for p in partition_files(path)], ignore_index=True
+        )
+    if format_of(path) == "parquet":
+        return pd.read_parquet(path, columns=columns)
+    return pd.read_csv(path, usecols=columns)
+
+
+def iter_table(
+    path: Path, chunk_size: int, columns: list[str] | None = None
+) -> Iterator[pd.DataFrame]:
+    if Path(path).is_dir():
+        for partition in partition_files(path):
+            yield from iter_table(partition, chunk_size, columns)
+        return
+    if format_of(path) == "parquet":
+        parquet_file = pq.ParquetFile(path)
+        for batch in parquet_file.iter_batches(batch_size=chunk_size, columns=columns):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, usecols=columns, chunksize=chunk_size)
+
+
+def write_table(df: pd.DataFrame, path: Path):
+    if format_of(path) == "parquet":
+        df.to_parquet(path, index=False, compression=config.data_io.compression)
+    else:
+        df.to_csv(path, index=False)
+
+
+class TableWriter:
+    """Appends DataFrame chunks to a single file without holding them in memory.
+
+    Parquet chunks become row groups and must fit the schema of the first chunk.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.format = format_of(path)
+        self._parquet_writer: pq.ParquetWriter | None = None
+        self._rows = 0
+
+    def write(self, df: pd.DataFrame):
+        if self.format == "csv":
+            df.to_csv(
+                self.path,
+                mode="a" if self._rows else "w",
+                header=not self._rows,
+                index=False,
+            )
+        else:
+            if self._parquet_writer is None:
+                table = pa.Table.from_pandas(df, preserve_index=False)
+                self._parquet_writer = pq.ParquetWriter(
+                    self.path, table.schema, compression=config.data_io.compression
+                )
+            else:
+                try:
+                    table = pa.Table.from_pandas(
+                        df, schema=self._parquet_writer.schema, preserve_index=False
+                    )
+                except (pa.ArrowInvalid, pa.ArrowTypeError) as e:
+                    raise ValueError(
+                        f"Chunk starting at row {self._rows} does not match the schema "
+                        f"of the first chunk written to {self.path}. Error: {e}"
+                    ) from e
+            self._parquet_writer.write_table(table)
+        self._rows += len(df)
+
+    def close(self):
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
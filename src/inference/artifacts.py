@@ -0,0 +1,202 @@
+import json
+import os
+import shutil
+import tempfile
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+import wandb
+from src.logs import get_logger
+
+logger = get_logger("artifacts")
+
+COMPLETE_MARKER = ".complete"
+ALIASES_FILE = "aliases.json"
+
+
+@dataclass
+class ArtifactLoad:
+    path: Path
+    digest: str
+    from_cache: bool
+    resolve_seconds: float
+    download_seconds: float
+
+
+class ArtifactCache:
+    """Content-addressed local store of downloaded model artifacts.
+
+    Each artifact version lives in ``<root>/<digest>``. Entries are only
+    visible once fully downloaded, are touched on every hit and evicted
+    least-recently-used first once the cache grows beyond ``max_bytes``.
+    """
+
+    def __init__(self, root: Path, max_bytes: int):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def get(self, digest: str) -> Path | None:
+        marker = self.root / digest / COMPLETE_MARKER
+        if not marker.exists():
+            return None
+        marker.touch()
+        return marker.parent
+
+    def put(self, digest: str, download: Callable[[Path], None]) -> Path:
+        """Downloads ``digest`` into a private staging directory and publishes it.
+
+        Entries are content-addressed, so when another process published the
+        same digest first, its entry is kept (it may be in use) and the staged
+        copy is discarded.
+        """
+        target = self.root / digest
+        staging = Path(
+            tempfile.mkdtemp(prefix=f".{digest}.", suffix=".tmp", dir=self.root)
+        )
+        try:
+            download(staging)
+            (staging / COMPLETE_MARKER).touch()
+            if not (target / COMPLETE_MARKER).exists():
+                if target.exists():
+                    # Left behind by an interrupted download or eviction.
+                    self.remove(target)
+                try:
+                    staging.rename(target)
+                except OSError:
+                    if not (target / COMPLETE_MARKER).exists():
+                        raise
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+
+        self.evict(keep={digest})
+        return target
+
+    def entries(self) -> list[Path]:
+        entries = [
+            path
+            for path in self.root.iterdir()
+            if path.is_dir()
+            and not path.name.startswith(".")
+            and (path / COMPLETE_MARKER).exists()
+        ]
+        return sorted(
+            entries, key=lambda path: (path / COMPLETE_MARKER).stat().st_mtime
+        )
+
+    def evict(self, keep: set[str] = frozenset()):
+        entries = self.entries()
+        sizes = {path: dir_size(path) for path in entries}
+        total = sum(sizes.values())
+        for path in entries:
+            if total <= self.max_bytes:
+                break
+            if path.name in keep:
+                continue
+            logger.info(f"Evicting cached artifact {path.name} ({sizes[path]} bytes)")
+            self.remove(path)
+            total -= sizes[path]
+
+    def remove(self, path: Path):
+        """Renames an entry out of the way before deleting it, so it is never
+        seen half-deleted under its digest."""
+        trash = Path(tempfile.mkdtemp(prefix=f".{path.name}.", dir=self.root))
+        try:
+            path.rename(trash / path.name)
+        except FileNotFoundError:
+            pass
+        shutil.rmtree(trash, ignore_errors=True)
+
+    def clear(self):
+        for path in self.entries():
+            self.remove(path)
+
+    def alias(self, alias: str) -> str | None:
+        aliases_path = self.root / ALIASES_FILE
+        if not aliases_path.exists():
+            return None
+        return json.loads(aliases_path.read_text()).get(alias)
+
+    def set_alias(self, alias: str, digest: str):
+        aliases_path = self.root / ALIASES_FILE
+        aliases = json.loads(aliases_path.read_text()) if aliases_path.exists() else {}
+        aliases[alias] = digest
+        staging = aliases_path.with_suffix(f".{os.getpid()}.tmp")
+        staging.write_text(json.dumps(aliases, indent=2))
+        staging.replace(aliases_path)
+
+
+def resolve_artifact(name: str, alias: str, timeout: float):
+    path = f"{os.getenv('WANDB_ENTITY')}/{os.getenv('WANDB_PROJECT')}/{name}:{alias}"
+
+    def resolve():
+        return wandb.Api(timeout=timeout).artifact(path, type="model")
+
+    executor = ThreadPoolExecutor(max_workers=1)
+    try:
+        return executor.submit(resolve).result(timeout)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def load_model_artifact(
+    cache: ArtifactCache,
+    name: str,
+    alias: str = "production",
+    offline: bool = False,
+    resolve_timeout: float = 5.0,
+) -> ArtifactLoad:
+    if offline:
+        return _load_cached_alias(cache, alias)
+
+    start = time.perf_counter()
+    try:
+        artifact = resolve_artifact(name, alias, resolve_timeout)
+    except Exception as e:
+        logger.warning(
+            f"Failed to resolve '{name}:{alias}', falling back to the local cache. "
+            f"Error: {e!r}"
+        )
+        return _load_cached_alias(cache, alias)
+    resolve_seconds = time.perf_counter() - start
+
+    digest = artifact.digest
+    path = cache.get(digest)
+    from_cache = path is not None
+    download_seconds = 0.0
+    if not from_cache:
+        start = time.perf_counter()
+        path = cache.put(digest, lambda root: artifact.download(root=str(root)))
+        download_seconds = time.perf_counter() - start
+    cache.set_alias(alias, digest)
+
+    return ArtifactLoad(
+        path=path,
+        digest=digest,
+        from_cache=from_cache,
+        resolve_seconds=resolve_seconds,
+        download_seconds=download_seconds,
+    )
+
+
+def _load_cached_alias(cache: ArtifactCache, alias: str) -> ArtifactLoad:
+    digest = cache.alias(alias)
+    path = cache.get(digest) if digest else None
+    if path is None:
+        raise FileNotFoundError(
+            f"No cached artifact for alias '{alias}' in {cache.root}"
+        )
+    return ArtifactLoad(
+        path=path,
+        digest=digest,
+        from_cache=True,
+        resolve_seconds=0.0,
+        download_seconds=0.0,
+    )
+
+
+def dir_size(path: Path) -> int:
+    return sum(f.stat().st_size for f in path.rglob("*") if f.is_file())
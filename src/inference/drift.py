@@ -0,0 +1,175 @@
+import json
+from bisect import bisect_right
+from collections.abc import Mapping, Sequence
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+REFERENCE_PROFILE_FILE = "reference_profile.json"
+PROBABILITY = "probability"
+# Added to every bin share so empty bins do not make PSI infinite.
+PSI_EPSILON = 1e-4
+
+
+class NumericSketch:
+    """Counts of values between fixed bin edges.
+
+    The edges are reference quantiles, so each reference bin holds a similar
+    share of the data. Sketches with the same edges merge by adding counts.
+    """
+
+    kind = "numeric"
+
+    def __init__(self, edges: Sequence[float], counts: Sequence[int] | None = None):
+        self.edges = [float(edge) for edge in edges]
+        self.counts = [0] * (len(self.edges) + 1) if counts is None else list(counts)
+
+    @classmethod
+    def fit(cls, values: pd.Series, n_bins: int) -> "NumericSketch":
+        values = values.dropna().to_numpy(dtype=float)
+        edges = np.unique(np.quantile(values, np.linspace(0, 1, n_bins + 1)[1:-1]))
+        sketch = cls(edges)
+        sketch.update_many(values)
+        return sketch
+
+    def update(self, value: float):
+        self.counts[bisect_right(self.edges, value)] += 1
+
+    def update_many(self, values: np.ndarray):
+        bins = np.searchsorted(self.edges, values, side="right")
+        counts = np.bincount(bins, minlength=len(self.counts))
+        self.counts = [a + int(b) for a, b in zip(self.counts, counts)]
+
+    def empty(self) -> "NumericSketch":
+        return NumericSketch(self.edges)
+
+    def merge(self, other: "NumericSketch"):
+        if other.edges != self.edges:
+            raise ValueError("Cannot merge numeric sketches with different bin edges.")
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+
+    def to_dict(self) -> dict:
+        return {"kind": self.kind, "edges": self.edges, "counts": self.counts}
+
+
+class CategoricalSketch:
+    """Counts per reference category, plus one bucket for everything else."""
+
+    kind = "categorical"
+
+    def __init__(self, categories: Sequence[str], counts: Sequence[int] | None = None):
+        self.categories = [str(category) for category in categories]
+        self._index = {category: i for i, category in enumerate(self.categories)}
+        self.counts = (
+            [0] * (len(self.categories) + 1) if counts is None else list(counts)
+        )
+
+    @classmethod
+    def fit(cls, values: pd.Series) -> "CategoricalSketch":
+        counts = values.dropna().astype(str).value_counts().sort_index()
+        return cls(counts.index, [*counts.tolist(), 0])
+
+    def update(self, value: str):
+        self.counts[self._index.get(value, len(self.categories))] += 1
+
+    def update_many(self, values: np.ndarray):
+        for value, count in pd.Series(values).astype(str).value_counts().items():
+            self.counts[self._index.get(value, len(self.categories))] += int(count)
+
+    def empty(self) -> "CategoricalSketch":
+        return CategoricalSketch(self.categories)
+
+    def merge(self, other: "CategoricalSketch"):
+        if other.categories != self.categories:
+            raise ValueError("Cannot merge categorical sketches with other categories.")
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+
+    def to_dict(self) -> dict:
+        return {"kind": self.kind, "categories": self.categories, "counts": self.counts}
+
+
+SKETCH_TYPES = {sketch.kind: sketch for sketch in (NumericSketch, CategoricalSketch)}
+
+
+def sketch_from_dict(state: dict) -> NumericSketch | CategoricalSketch:
+    state = dict(state)
+    return SKETCH_TYPES[state.pop("kind")](**state)
+
+
+def psi(reference: Sequence[int], current: Sequence[int]) -> float:
+    """Population stability index between two count vectors over the same bins."""
+    expected = np.asarray(reference, dtype=float) / max(sum(reference), 1)
+    actual = np.asarray(current, dtype=float) / max(sum(current), 1)
+    expected, actual = expected + PSI_EPSILON, actual + PSI_EPSILON
+    return float(np.sum((actual - expected) * np.log(actual / expected)))
+
+
+def ks(reference: Sequence[int], current: Sequence[int]) -> float:
+    """Kolmogorov-Smirnov statistic between two binned distributions."""
+    expected = np.cumsum(reference) / max(sum(reference), 1)
+    actual = np.cumsum(current) / max(sum(current), 1)
+    return float(np.max(np.abs(actual - expected)))
+
+
+class DriftProfile:
+    """One sketch per field; the same class holds reference and served data."""
+
+    def __init__(self, sketches: Mapping[str, NumericSketch | CategoricalSketch]):
+        self.sketches = dict(sketches)
+
+    @classmethod
+    def fit(cls, df: pd.DataFrame, n_bins: int) -> "DriftProfile":
+        sketches = {}
+        for col in df.columns:
+            if pd.api.types.is_numeric_dtype(df[col]):
+                sketches[col] = NumericSketch.fit(df[col], n_bins)
+            else:
+                sketches[col] = CategoricalSketch.fit(df[col])
+        return cls(sketches)
+
+    def empty(self) -> "DriftProfile":
+        return DriftProfile({name: s.empty() for name, s in self.sketches.items()})
+
+    def update(self, record: Mapping):
+        for name, sketch in self.sketches.items():
+            if name in record:
+                sketch.update(record[name])
+
+    def update_frame(self, df: pd.DataFrame):
+        for name, sketch in self.sketches.items():
+            if name in df.columns:
+                sketch.update_many(df[name].dropna().to_numpy())
+
+    def merge(self, other: "DriftProfile"):
+        for name, sketch in other.sketches.items():
+            self.sketches[name].merge(sketch)
+
+    def count(self) -> int:
+        return max((sum(s.counts) for s in self.sketches.values()), default=0)
+
+    def compare(self, reference: "DriftProfile") -> dict[str, dict]:
+        report = {}
+        for name, sketch in self.sketches.items():
+            expected = reference.sketches[name].counts
+            report[name] = {
+                "psi": psi(expected, sketch.counts),
+                "count": sum(sketch.counts),
+            }
+            if sketch.kind == "numeric":
+                report[name]["ks"] = ks(expected, sketch.counts)
+        return report
+
+    def to_dict(self) -> dict:
+        return {name: sketch.to_dict() for name, sketch in self.sketches.items()}
+
+    @classmethod
+    def from_dict(cls, state: Mapping) -> "DriftProfile":
+        return cls({name: sketch_from_dict(s) for name, s in state.items()})
+
+    def save(self, path: Path):
+        Path(path).write_text(json.dumps(self.to_dict()))
+
+    @classmethod
+    def load(cls, path: Path) -> "DriftProfile":
+        return cls.from_dict(json.loads(Path(path).read_text()))
@@ -0,0 +1,107 @@
+import sqlite3
+import threading
+import time
+from collections.abc import Iterable, Sequence
+from pathlib import Path
+
+import pandas as pd
+
+ID_COLUMN = "customer_id"
+# SQLite's default limit on host parameters per statement is 999.
+MAX_QUERY_IDS = 900
+
+
+def customer_key(customer_id) -> str:
+    """Stores and looks up IDs as text, so ``42``, ``42.0`` and ``"42"`` match."""
+    if isinstance(customer_id, float) and customer_id.is_integer():
+        customer_id = int(customer_id)
+    return str(customer_id).strip()
+
+
+class OnlineStore:
+    """Latest feature row per customer in a SQLite table, keyed by customer ID.
+
+    ``upsert`` replaces the rows of the given customers, ``get_many`` fetches a
+    batch of customers in one query per ``MAX_QUERY_IDS`` IDs. Materialized
+    sources are tracked by digest so materialization can skip unchanged ones.
+    """
+
+    def __init__(self, path: Path, feature_columns: Sequence[str], readonly=False):
+        self.path = Path(path)
+        self.feature_columns = list(feature_columns)
+        if readonly:
+            self.connection = sqlite3.connect(
+                f"file:{self.path}?mode=ro", uri=True, check_same_thread=False
+            )
+        else:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.connection = sqlite3.connect(self.path, check_same_thread=False)
+            self._create_tables()
+        self._lock = threading.Lock()
+
+    def _create_tables(self):
+        columns = ", ".join(f'"{col}"' for col in self.feature_columns)
+        with self.connection:
+            # WAL lets the API keep reading while a materialization writes.
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute(
+                f"CREATE TABLE IF NOT EXISTS features "
+                f"({ID_COLUMN} TEXT PRIMARY KEY, {columns}, updated_at REAL)"
+            )
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS sources (name TEXT PRIMARY KEY, digest TEXT)"
+            )
+
+    def upsert(self, df: pd.DataFrame) -> int:
+        """Writes ``df`` (``ID_COLUMN`` plus the feature columns) as the latest rows."""
+        columns = [ID_COLUMN, *self.feature_columns, "updated_at"]
+        rows = df.assign(
+            **{ID_COLUMN: df[ID_COLUMN].map(customer_key), "updated_at": time.time()}
+        )[columns].itertuples(index=False, name=None)
+        placeholders = ", ".join("?" for _ in columns)
+        quoted = ", ".join(f'"{col}"' for col in columns)
+        with self._lock, self.connection:
+            cursor = self.connection.executemany(
+                f"INSERT OR REPLACE INTO features ({quoted}) VALUES ({placeholders})",
+                rows,
+            )
+        return cursor.rowcount
+
+    def get_many(self, customer_ids: Iterable) -> dict[str, dict]:
+        keys = list(dict.fromkeys(customer_key(i) for i in customer_ids))
+        quoted = ", ".join(f'"{col}"' for col in self.feature_columns)
+        found = {}
+        with self._lock:
+            for start in range(0, len(keys), MAX_QUERY_IDS):
+                chunk = keys[start : start + MAX_QUERY_IDS]
+                placeholders = ", ".join("?" for _ in chunk)
+                for key, *values in self.connection.execute(
+                    f"SELECT {ID_COLUMN}, {quoted} FROM features "
+                    f"WHERE {ID_COLUMN} IN ({placeholders})",
+                    chunk,
+                ):
+                    found[key] = dict(zip(self.feature_columns, values))
+        return found
+
+    def sources(self) -> dict[str, str]:
+        with self._lock:
+            return dict(self.connection.execute("SELECT name, digest FROM sources"))
+
+    def mark_source(self, name: str, digest: str):
+        with self._lock, self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO sources VALUES (?, ?)", (name, digest)
+            )
+
+    def clear(self):
+        with self._lock, self.connection:
+            self.connection.execute("DELETE FROM features")
+            self.connection.execute("DELETE FROM sources")
+
+    def __len__(self) -> int:
+        with self._lock:
+            (count,) = self.connection.execute("SELECT COUNT(*) FROM features")
+        return count[0]
+
+    def close(self):
+        self.connection.close()
@@ -0,0 +1,74 @@
+from collections.abc import Mapping, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+class FeatureEncoder:
+    """Precompiled replacement for the pandas preprocessing path.
+
+    Built once from the ``preprocessor`` dict written by ``feature_engineering``
+    and the booster's feature order. Encoding fills a NumPy row in that order,
+    producing the same values the pandas/OneHotEncoder path would.
+    """
+
+    def __init__(self, preprocessor: dict, feature_names: Sequence[str]):
+        self.feature_names = list(feature_names)
+        column_index = {name: i for i, name in enumerate(self.feature_names)}
+
+        self.numerical = [
+            (col, column_index[col]) for col in preprocessor["numerical_cols"]
+        ]
+
+        encoder = preprocessor["encoder"]
+        drop_idx = getattr(encoder, "drop_idx_", None)
+        output_names = iter(preprocessor["feature_names_out"])
+        self.categorical = []
+        for i, (col, categories) in enumerate(
+            zip(preprocessor["categorical_cols"], encoder.categories_)
+        ):
+            dropped = None if drop_idx is None else drop_idx[i]
+            lookup = {
+                category: column_index[next(output_names)]
+                for j, category in enumerate(categories)
+                if j != dropped
+            }
+            self.categorical.append((col, lookup))
+
+        self._row = np.zeros((1, len(self.feature_names)), dtype=np.float64)
+
+    def encode(self, record: Mapping) -> np.ndarray:
+        row = self._row.copy()
+        for col, idx in self.numerical:
+            row[0, idx] = record[col]
+        for col, lookup in self.categorical:
+            idx = lookup.get(record[col])
+            if idx is not None:
+                row[0, idx] = 1.0
+        return row
+
+    def encode_batch(self, records: Sequence[Mapping]) -> np.ndarray:
+        n_rows = len(records)
+        matrix = np.zeros((n_rows, len(self.feature_names)), dtype=np.float64)
+        for col, idx in self.numerical:
+            matrix[:, idx] = [record[col] for record in records]
+        for col, lookup in self.categorical:
+            indices = np.fromiter(
+                (lookup.get(record[col], -1) for record in records),
+                dtype=np.intp,
+                count=n_rows,
+            )
+            rows = np.flatnonzero(indices >= 0)
+            matrix[rows, indices[rows]] = 1.0
+        return matrix
+
+    def encode_frame(self, df: pd.DataFrame) -> np.ndarray:
+        """Column-wise ``encode_batch`` for a DataFrame with the input columns."""
+        matrix = np.zeros((len(df), len(self.feature_names)), dtype=np.float64)
+        for col, idx in self.numerical:
+            matrix[:, idx] = df[col].to_numpy(dtype=np.float64, na_value=np.nan)
+        for col, lookup in self.categorical:
+            indices = df[col].map(lookup).fillna(-1).to_numpy(dtype=np.intp)
+            rows = np.flatnonzero(indices >= 0)
+            matrix[rows, indices[rows]] = 1.0
+        return matrix
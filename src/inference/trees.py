@@ -0,0 +1,195 @@
+import json
+from os import PathLike
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.config import DECISION_THRESHOLD
+
+SUPPORTED_OBJECTIVES = {"binary:logistic"}
+NODE_ARRAYS = ("feature", "threshold", "left", "default_left", "leaf_value", "roots")
+TREES_META_FILE = "trees.json"
+
+
+class TreeEnsemble:
+    """Pure NumPy evaluator for a binary XGBoost model saved as ``model.json``.
+
+    All trees are flattened into contiguous node arrays, laid out so that a
+    node's right child always directly follows its left child and leaves point
+    to themselves. Every row/tree pair then advances one level per step with a
+    handful of vectorized gathers until the deepest tree is exhausted.
+    """
+
+    block_size = 2048
+
+    def __init__(
+        self,
+        feature_names: list[str],
+        feature: np.ndarray,
+        threshold: np.ndarray,
+        left: np.ndarray,
+        default_left: np.ndarray,
+        leaf_value: np.ndarray,
+        roots: np.ndarray,
+        base_margin: float,
+        depth: int,
+    ):
+        self.feature_names = feature_names
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.default_left = default_left
+        self.leaf_value = leaf_value
+        self.roots = roots
+        self.base_margin = base_margin
+        self.depth = depth
+
+    @classmethod
+    def load(cls, model_path: str | PathLike) -> "TreeEnsemble":
+        with open(model_path, "r") as f:
+            learner = json.load(f)["learner"]
+
+        objective = learner["objective"]["name"]
+        if objective not in SUPPORTED_OBJECTIVES:
+            raise ValueError(f"Unsupported objective for native inference: {objective}")
+
+        booster = learner["gradient_booster"]
+        if booster["name"] != "gbtree":
+            raise ValueError(f"Unsupported booster for native inference: {booster}")
+        trees = booster["model"]["trees"]
+
+        best_iteration = learner["attributes"].get("best_iteration")
+        if best_iteration is not None:
+            indptr = booster["model"]["iteration_indptr"]
+            trees = trees[: indptr[int(best_iteration) + 1]]
+
+        features, thresholds, lefts, defaults, values, roots = ([] for _ in range(6))
+        depth = 0
+        offset = 0
+        for tree in trees:
+            if any(tree["split_type"]):
+                raise ValueError("Categorical splits are not supported.")
+
+            order, tree_depth = _breadth_first_layout(
+                tree["left_children"], tree["right_children"]
+            )
+            new_id = np.empty(len(tree["left_children"]), dtype=np.intp)
+            new_id[order] = np.arange(len(order))
+
+            left = np.asarray(tree["left_children"])[order]
+            condition = np.asarray(tree["split_conditions"], dtype=np.float32)[order]
+            is_leaf = left == -1
+
+            features.append(
+                np.where(is_leaf, 0, np.asarray(tree["split_indices"])[order])
+            )
+            thresholds.append(np.where(is_leaf, np.float32(np.inf), condition))
+            lefts.append(
+                np.where(is_leaf, np.arange(len(order)), new_id[left]) + offset
+            )
+            defaults.append(
+                is_leaf | np.asarray(tree["default_left"], dtype=bool)[order]
+            )
+            values.append(np.where(is_leaf, condition, np.float32(0)))
+            roots.append(offset)
+            depth = max(depth, tree_depth)
+            offset += len(order)
+
+        base_score = float(
+            str(learner["learner_model_param"]["base_score"]).strip("[]")
+        )
+        return cls(
+            feature_names=learner.get("feature_names") or [],
+            feature=np.concatenate(features).astype(np.intp),
+            threshold=np.concatenate(thresholds),
+            left=np.concatenate(lefts).astype(np.intp),
+            default_left=np.concatenate(defaults),
+            leaf_value=np.concatenate(values),
+            roots=np.asarray(roots, dtype=np.intp),
+            base_margin=float(np.log(base_score / (1 - base_score))),
+            depth=depth,
+        )
+
+    def save(self, directory: Path):
+        directory.mkdir(parents=True, exist_ok=True)
+        for name in NODE_ARRAYS:
+            np.save(directory / f"{name}.npy", getattr(self, name))
+        meta = {
+            "feature_names": self.feature_names,
+            "base_margin": self.base_margin,
+            "depth": self.depth,
+        }
+        (directory / TREES_META_FILE).write_text(json.dumps(meta))
+
+    @classmethod
+    def attach(cls, directory: Path, mmap_mode: str | None = "r") -> "TreeEnsemble":
+        """Load arrays written by ``save``, memory-mapped (and shared) by default."""
+        meta = json.loads((directory / TREES_META_FILE).read_text())
+        arrays = {
+            name: np.asarray(np.load(directory / f"{name}.npy", mmap_mode=mmap_mode))
+            for name in NODE_ARRAYS
+        }
+        return cls(**meta, **arrays)
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.roots)
+
+    def _as_matrix(self, X) -> np.ndarray:
+        if isinstance(X, pd.DataFrame):
+            if self.feature_names:
+                X = X[self.feature_names]
+            X = X.to_numpy(dtype=np.float32)
+        # Leaves compare against +inf, so keep +inf inputs strictly below it.
+        return np.minimum(np.asarray(X, dtype=np.float32), np.finfo(np.float32).max)
+
+    def _leaf_nodes(self, X: np.ndarray) -> np.ndarray:
+        n_rows, n_features = X.shape
+        flat = X.ravel()
+        row_offsets = (np.arange(n_rows) * n_features)[:, None]
+        has_missing = bool(np.isnan(X).any())
+        nodes = np.broadcast_to(self.roots, (n_rows, self.n_trees)).copy()
+
+        for _ in range(self.depth):
+            values = flat[row_offsets + self.feature[nodes]]
+            go_right = values >= self.threshold[nodes]
+            if has_missing:
+                missing = np.isnan(values)
+                go_right[missing] = ~self.default_left[nodes[missing]]
+            nodes = self.left[nodes] + go_right
+        return nodes
+
+    def predict_margin(self, X) -> np.ndarray:
+        X = self._as_matrix(X)
+        margin = np.empty(X.shape[0], dtype=np.float64)
+        for start in range(0, X.shape[0], self.block_size):
+            stop = start + self.block_size
+            nodes = self._leaf_nodes(X[start:stop])
+            margin[start:stop] = self.leaf_value[nodes].sum(axis=1, dtype=np.float64)
+        return margin + self.base_margin
+
+    def predict_proba(self, X) -> np.ndarray:
+        positive = 1 / (1 + np.exp(-self.predict_margin(X)))
+        return np.column_stack([1 - positive, positive])
+
+    def predict(self, X) -> np.ndarray:
+        return (self.predict_proba(X)[:, 1] > DECISION_THRESHOLD).astype(int)
+
+
+def _breadth_first_layout(left: list[int], right: list[int]) -> tuple[list[int], int]:
+    order = [0]
+    level = [0]
+    depth = 0
+    while True:
+        children = [
+            child
+            for node in level
+            if left[node] != -1
+            for child in (left[node], right[node])
+        ]
+        if not children:
+            return order, depth
+        order.extend(children)
+        level = children
+        depth += 1
@@ -0,0 +1,314 @@
+import argparse
+import io
+import json
+import os
+import shutil
+import time
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from pathlib import Path
+
+import joblib
+import pandas as pd
+import pyarrow.parquet as pq
+from xgboost import XGBClassifier
+
+from src.api.model_store import (
+    PREPROCESSOR_FILE,
+    LocalModelSource,
+    ModelBundle,
+    load_bundle,
+    model_source,
+)
+from src.config import (
+    CUSTOMER_ID_COLUMN_RAW,
+    DECISION_THRESHOLD,
+    PROJECT_ROOT,
+    RAW_DATA_DIR,
+    RAW_DATA_FILE,
+    config,
+)
+from src.data_io import (
+    SUFFIXES,
+    TableWriter,
+    data_file,
+    format_of,
+    partition_files,
+    read_columns,
+)
+from src.inference.artifacts import ArtifactLoad
+from src.inference.online_store import ID_COLUMN
+from src.logs import get_logger
+from src.pipeline.data_cleaning import normalize_column
+
+logger = get_logger("bulk_scoring")
+
+MANIFEST_FILE = "manifest.json"
+PART_PREFIX = "part-"
+
+# Set once per worker process by ``init_worker``.
+_bundle: ModelBundle | None = None
+
+
+@dataclass(frozen=True)
+class InputBlock:
+    """Slice of one input file, numbered in input order.
+
+    ``start`` and ``stop`` are byte offsets into a CSV file, or a range of row
+    groups of a Parquet file. A CSV line belongs to the block its first byte
+    falls in.
+    """
+
+    index: int
+    path: Path
+    start: int
+    stop: int
+
+
+def csv_spans(path: Path, block_bytes: int) -> list[tuple[int, int]]:
+    with open(path, "rb") as f:
+        header_end = len(f.readline())
+    size = path.stat().st_size
+    return [
+        (start, min(start + block_bytes, size))
+        for start in range(header_end, size, block_bytes)
+    ]
+
+
+def parquet_spans(path: Path, chunk_size: int) -> list[tuple[int, int]]:
+    """Groups consecutive row groups until each span holds ``chunk_size`` rows."""
+    metadata = pq.ParquetFile(path).metadata
+    spans, start, rows = [], 0, 0
+    for i in range(metadata.num_row_groups):
+        rows += metadata.row_group(i).num_rows
+        if rows >= chunk_size:
+            spans.append((start, i + 1))
+            start, rows = i + 1, 0
+    if start < metadata.num_row_groups:
+        spans.append((start, metadata.num_row_groups))
+    return spans
+
+
+def plan_blocks(
+    input_path: Path, chunk_size: int, block_bytes: int
+) -> list[InputBlock]:
+    blocks = []
+    for path in partition_files(input_path):
+        if format_of(path) == "csv":
+            spans = csv_spans(path, block_bytes)
+        else:
+            spans = parquet_spans(path, chunk_size)
+        for start, stop in spans:
+            blocks.append(InputBlock(len(blocks), path, start, stop))
+    return blocks
+
+
+def read_block(
+    block: InputBlock,
+    columns: list[str],
+    chunk_size: int,
+    text_columns: list[str] = (),
+) -> Iterator[pd.DataFrame]:
+    """Reads a block in chunks of ``chunk_size`` rows; ``text_columns`` of CSV
+    blocks are read as strings so every chunk has the same schema."""
+    if format_of(block.path) == "parquet":
+        parquet_file = pq.ParquetFile(block.path)
+        for batch in parquet_file.iter_batches(
+            batch_size=chunk_size,
+            row_groups=range(block.start, block.stop),
+            columns=columns,
+        ):
+            yield batch.to_pandas()
+        return
+
+    with open(block.path, "rb") as f:
+        header = f.readline()
+        if block.start > len(header):
+            # Skip the line that started in the previous block.
+            f.seek(block.start - 1)
+            f.readline()
+        data = f.read(max(block.stop - f.tell(), 0))
+        if data and not data.endswith(b"\n"):
+            data += f.readline()
+    if data:
+        yield from pd.read_csv(
+            io.BytesIO(header + data),
+            usecols=columns,
+            dtype=dict.fromkeys(text_columns, str),
+            chunksize=chunk_size,
+        )
+
+
+def required_columns(preprocessor: dict) -> set[str]:
+    return {*preprocessor["numerical_cols"], *preprocessor["categorical_cols"]}
+
+
+def init_worker(artifact: ArtifactLoad, nthread: int):
+    global _bundle
+    _bundle = load_bundle(artifact)
+    if isinstance(_bundle.model, XGBClassifier):
+        _bundle.model.set_params(n_jobs=nthread)
+
+
+def score_block(
+    block: InputBlock, output_dir: Path, output_format: str, chunk_size: int
+) -> int:
+    """Scores one block into its own part file; returns the number of rows."""
+    wanted = {CUSTOMER_ID_COLUMN_RAW, *required_columns(_bundle.preprocessor)}
+    columns = [
+        col for col in read_columns(block.path) if normalize_column(col) in wanted
+    ]
+    id_columns = [
+        col for col in columns if normalize_column(col) == CUSTOMER_ID_COLUMN_RAW
+    ]
+    part = data_file(output_dir, f"{PART_PREFIX}{block.index:05d}", output_format)
+    tmp_path = output_dir / ".tmp" / part.name
+
+    rows = 0
+    with TableWriter(tmp_path) as writer:
+        for chunk in read_block(block, columns, chunk_size, id_columns):
+            chunk.columns = [normalize_column(col) for col in chunk.columns]
+            probabilities = _bundle.predict_proba(_bundle.encoder.encode_frame(chunk))
+            scores = pd.DataFrame(
+                {
+                    "probability": probabilities,
+                    "prediction": (probabilities > DECISION_THRESHOLD).astype("int8"),
+                }
+            )
+            if CUSTOMER_ID_COLUMN_RAW in chunk.columns:
+                scores.insert(0, ID_COLUMN, chunk[CUSTOMER_ID_COLUMN_RAW].to_numpy())
+            writer.write(scores)
+            rows += len(scores)
+    if rows:
+        tmp_path.replace(part)
+    return rows
+
+
+def bulk_score(
+    input_path: Path = RAW_DATA_DIR / RAW_DATA_FILE,
+    output_dir: Path = PROJECT_ROOT / config.bulk_scoring.output_dir,
+    model_dir: Path | None = None,
+    n_jobs: int = config.bulk_scoring.n_jobs,
+    chunk_size: int = config.bulk_scoring.chunk_size,
+    block_bytes: int = config.bulk_scoring.csv_block_mb * 2**20,
+    output_format: str = config.data_io.format,
+) -> int:
+    """Scores a CSV/Parquet table or partition directory with the serving model.
+
+    The input is split into blocks that workers read themselves, so the parent
+    only hands out offsets. Each worker loads the model once and holds at most
+    one block of CSV bytes plus ``chunk_size`` rows at a time. Block ``i`` is
+    written to ``part-<i>``, so reading the parts in name order returns the
+    input order. ``model_dir`` defaults to the API's model source. Returns the
+    number of rows scored.
+    """
+    source = LocalModelSource(model_dir) if model_dir else model_source()
+    artifact = source.fetch()
+    preprocessor = joblib.load(Path(artifact.path) / PREPROCESSOR_FILE)
+    available = {normalize_column(col) for col in read_columns(input_path)}
+    if missing := required_columns(preprocessor) - available:
+        raise ValueError(f"{input_path} lacks the model inputs {sorted(missing)}")
+
+    blocks = plan_blocks(input_path, chunk_size, block_bytes)
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    for stale in output_dir.glob(f"{PART_PREFIX}*"):
+        stale.unlink()
+    (output_dir / ".tmp").mkdir(exist_ok=True)
+
+    n_jobs = max(1, min(n_jobs, len(blocks)))
+    nthread = max(1, (os.cpu_count() or 1) // n_jobs)
+    logger.info(
+        f"Scoring {len(blocks)} blocks of {input_path} with model {artifact.digest} "
+        f"on {n_jobs} workers ({nthread} threads each)"
+    )
+    start = time.perf_counter()
+    score = partial(
+        score_block,
+        output_dir=output_dir,
+        output_format=output_format,
+        chunk_size=chunk_size,
+    )
+    if n_jobs == 1:
+        init_worker(artifact, nthread)
+        block_rows = [score(block) for block in blocks]
+    else:
+        with ProcessPoolExecutor(
+            max_workers=n_jobs,
+            initializer=init_worker,
+            initargs=(artifact, nthread),
+        ) as executor:
+            block_rows = list(executor.map(score, blocks))
+    elapsed = time.perf_counter() - start
+    shutil.rmtree(output_dir / ".tmp")
+
+    parts = [
+        {
+            "file": data_file(
+                output_dir, f"{PART_PREFIX}{block.index:05d}", output_format
+            ).name,
+            "rows": rows,
+        }
+        for block, rows in zip(blocks, block_rows)
+        if rows
+    ]
+    total_rows = sum(block_rows)
+    (output_dir / MANIFEST_FILE).write_text(
+        json.dumps(
+            {
+                "model_version": artifact.digest,
+                "input": str(input_path),
+                "rows": total_rows,
+                "parts": parts,
+            },
+            indent=2,
+        )
+    )
+    logger.info(
+        f"Scored {total_rows} rows in {elapsed:.1f}s "
+        f"({total_rows / max(elapsed, 1e-9):.0f} rows/s) into {len(parts)} parts "
+        f"in {output_dir}"
+    )
+    return total_rows
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Score a CSV/Parquet table with the serving model."
+    )
+    parser.add_argument("--input", type=Path, default=RAW_DATA_DIR / RAW_DATA_FILE)
+    parser.add_argument(
+        "--output-dir",
+        type=Path,
+        default=PROJECT_ROOT / config.bulk_scoring.output_dir,
+    )
+    parser.add_argument(
+        "--model-dir",
+        type=Path,
+        default=None,
+        help="directory with model.json and preprocessor.joblib "
+        "(default: the API model source)",
+    )
+    parser.add_argument("--n-jobs", type=int, default=config.bulk_scoring.n_jobs)
+    parser.add_argument(
+        "--chunk-size", type=int, default=config.bulk_scoring.chunk_size
+    )
+    parser.add_argument(
+        "--format", choices=list(SUFFIXES), default=config.data_io.format
+    )
+    args = parser.parse_args()
+
+    bulk_score(
+        input_path=args.input,
+        output_dir=args.output_dir,
+        model_dir=args.model_dir,
+        n_jobs=args.n_jobs,
+        chunk_size=args.chunk_size,
+        output_format=args.format,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -3,35 +3,105 @@ from pathlib import Path
 import pandas as pd
 
 from src.config import (
-    CLEANED_DATA_FILE,
+    CLEANED_DATA_NAME,
     CUSTOMER_ID_COLUMN_RAW,
     PROCESSED_DATA_DIR,
     RAW_DATA_DIR,
     RAW_DATA_FILE,
+    config,
+)
+from src.data_io import (
+    TableWriter,
+    data_file,
+    iter_table,
+    read_columns,
+    read_table,
+    write_table,
 )
 from src.logs import get_logger
 
 logger = get_logger("data_cleaning")
 
 
-def clean_data(
+def normalize_column(column: str) -> str:
+    return column.replace(" ", "_").lower()
+
+
+def clean_chunk(df: pd.DataFrame, column_to_drop: str) -> pd.DataFrame:
+    df.columns = [normalize_column(col) for col in df.columns]
+    return df.drop(columns=[column_to_drop], errors="ignore")
+
+
+def match_dtypes(chunk: pd.DataFrame, dtypes: pd.Series) -> pd.DataFrame:
+    """Casts a chunk to the dtypes of the first chunk, so every chunk is written
+    with the same schema. Missing values in integer and boolean columns use
+    pandas' nullable dtypes."""
+    for col, dtype in dtypes.items():
+        if chunk[col].dtype == dtype:
+            continue
+        if pd.api.types.is_integer_dtype(dtype):
+            dtype = "Int64"
+        elif pd.api.types.is_bool_dtype(dtype):
+            dtype = "boolean"
+        try:
+            chunk[col] = chunk[col].astype(dtype)
+        except (TypeError, ValueError) as e:
+            raise ValueError(
+                f"Column '{col}' is {chunk[col].dtype} in a later chunk but "
+                f"{dtypes[col]} in the first one. Increase "
+                "data_cleaning.chunk_size or clean the data in memory."
+            ) from e
+    return chunk
+
+
+def kept_columns(raw_data_path: Path, column_to_drop: str) -> list[str]:
+    raw_columns = read_columns(raw_data_path)
+    columns = [col for col in raw_columns if normalize_column(col) != column_to_drop]
+    if len(columns) < len(raw_columns):
+        logger.info(f"Dropping '{column_to_drop}' column.")
+    return columns
+
+
+def load_clean_data(
     raw_data_path: Path = RAW_DATA_DIR / RAW_DATA_FILE,
-    processed_data_path: Path = PROCESSED_DATA_DIR / CLEANED_DATA_FILE,
     column_to_drop: str = CUSTOMER_ID_COLUMN_RAW,
-):
+) -> pd.DataFrame:
+    columns = kept_columns(raw_data_path, column_to_drop)
+
     logger.info(f"Reading raw data from {raw_data_path}")
-    df = pd.read_csv(raw_data_path)
+    df = read_table(raw_data_path, columns=columns)
 
     logger.info("Cleaning data...")
+    return clean_chunk(df, column_to_drop)
 
-    df.columns = [col.replace(" ", "_").lower() for col in df.columns]
 
-    if column_to_drop in df.columns:
-        df = df.drop(columns=[column_to_drop])
-        logger.info(f"Dropped '{column_to_drop}' column.")
+def clean_data(
+    raw_data_path: Path = RAW_DATA_DIR / RAW_DATA_FILE,
+    processed_data_path: Path = data_file(PROCESSED_DATA_DIR, CLEANED_DATA_NAME),
+    column_to_drop: str = CUSTOMER_ID_COLUMN_RAW,
+    chunk_size: int | None = config.data_cleaning.chunk_size,
+):
+    if chunk_size is None:
+        df = load_clean_data(raw_data_path, column_to_drop)
 
-    logger.info(f"Saving cleaned data to {processed_data_path}")
-    df.to_csv(processed_data_path, index=False)
+        logger.info(f"Saving cleaned data to {processed_data_path}")
+        write_table(df, processed_data_path)
+    else:
+        columns = kept_columns(raw_data_path, column_to_drop)
+        logger.info(
+            f"Streaming {raw_data_path} to {processed_data_path} "
+            f"in chunks of {chunk_size} rows"
+        )
+        rows = 0
+        dtypes = None
+        with TableWriter(processed_data_path) as writer:
+            for chunk in iter_table(raw_data_path, chunk_size, columns=columns):
+                chunk = clean_chunk(chunk, column_to_drop)
+                if dtypes is None:
+                    dtypes = chunk.dtypes
+                writer.write(match_dtypes(chunk, dtypes))
+                rows += len(chunk)
+        logger.info(f"Cleaned {rows} rows.")
 
     logger.info("Data cleaning complete.")
 
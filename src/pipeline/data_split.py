@@ -4,23 +4,18 @@ import pandas as pd
 from sklearn.model_selection import train_test_split
 
 from src.config import PROCESSED_DATA_DIR, SPLIT_DATA_DIR, config
+from src.data_io import data_file, find_data_file, read_table, write_table
 from src.logs import get_logger
 
 logger = get_logger("data_split")
 
 
-def split_data(
-    input_path: Path = PROCESSED_DATA_DIR,
-    output_path: Path = SPLIT_DATA_DIR,
+def split_frame(
+    df: pd.DataFrame,
     target_column: str = config.target_column,
     test_size: float = config.data_split.test_size,
     random_state: int = config.random_state,
-):
-    logger.info("Starting data splitting...")
-
-    csv_file = next(input_path.glob("*.csv"))
-    df = pd.read_csv(csv_file)
-
+) -> tuple[pd.DataFrame, pd.DataFrame]:
     X = df.drop(columns=[target_column])
     y = df[target_column]
 
@@ -30,12 +25,27 @@ def split_data(
 
     train_df = pd.concat([X_train, y_train], axis=1)
     test_df = pd.concat([X_test, y_test], axis=1)
+    return train_df, test_df
+
+
+def split_data(
+    input_path: Path = PROCESSED_DATA_DIR,
+    output_path: Path = SPLIT_DATA_DIR,
+    target_column: str = config.target_column,
+    test_size: float = config.data_split.test_size,
+    random_state: int = config.random_state,
+    data_format: str = config.data_io.format,
+):
+    logger.info("Starting data splitting...")
+
+    df = read_table(find_data_file(input_path))
+    train_df, test_df = split_frame(df, target_column, test_size, random_state)
 
-    train_output_file = output_path / "train.csv"
-    test_output_file = output_path / "test.csv"
+    train_output_file = data_file(output_path, "train", data_format)
+    test_output_file = data_file(output_path, "test", data_format)
 
-    train_df.to_csv(train_output_file, index=False)
-    test_df.to_csv(test_output_file, index=False)
+    write_table(train_df, train_output_file)
+    write_table(test_df, test_output_file)
 
     logger.info(f"Data splitting complete. Train set saved to {train_output_file}")
     logger.info(f"Data splitting complete. Test set saved to {test_output_file}")
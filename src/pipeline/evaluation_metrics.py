@@ -0,0 +1,152 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.config import DECISION_THRESHOLD, EVALUATION_DIR, config
+from src.data_io import write_table
+from src.logs import get_logger
+
+logger = get_logger("evaluation_metrics")
+
+METRICS = ["roc_auc", "precision", "recall", "f1_score"]
+
+# Resamples evaluated per vectorized batch, bounding the (batch, bins) count arrays.
+BOOTSTRAP_BATCH = 256
+
+
+def binned_auc(pos: np.ndarray, neg: np.ndarray) -> np.ndarray:
+    """Rank-based ROC AUC from per-bin class counts along the last axis.
+
+    Bins are in ascending score order; pairs within one bin count as ties.
+    """
+    neg_below = np.cumsum(neg, axis=-1) - neg
+    pairs = (pos * (neg_below + 0.5 * neg)).sum(axis=-1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return pairs / (pos.sum(axis=-1) * neg.sum(axis=-1))
+
+
+def rank_auc(y_true: np.ndarray, y_score: np.ndarray) -> float:
+    """Exact ROC AUC, with every distinct score as its own bin."""
+    _, bins = np.unique(y_score, return_inverse=True)
+    pos = np.bincount(bins, weights=y_true)
+    neg = np.bincount(bins) - pos
+    return float(binned_auc(pos, neg))
+
+
+def rates(tp, fp, fn) -> tuple:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return tp / (tp + fp), tp / (tp + fn), 2 * tp / (2 * tp + fp + fn)
+
+
+def threshold_sweep(y_true: np.ndarray, y_score: np.ndarray) -> pd.DataFrame:
+    """Confusion counts, precision, recall and F1 at every distinct score.
+
+    Computed from a single sort: row ``i`` predicts churn for scores at or above
+    its ``threshold``. Thresholds are in descending order.
+    """
+    y_true = np.asarray(y_true, dtype=bool)
+    y_score = np.asarray(y_score)
+    order = np.argsort(y_score, kind="stable")[::-1]
+    scores = y_score[order]
+    tp = np.cumsum(y_true[order])
+    fp = np.arange(1, len(scores) + 1) - tp
+    # Keep the last row of each run of tied scores.
+    last = np.r_[np.flatnonzero(np.diff(scores)), len(scores) - 1]
+    tp, fp = tp[last], fp[last]
+    fn = tp[-1] - tp
+    precision, recall, f1 = rates(tp, fp, fn)
+    return pd.DataFrame(
+        {
+            "threshold": scores[last],
+            "tp": tp,
+            "fp": fp,
+            "fn": fn,
+            "tn": fp[-1] - fp,
+            "precision": precision,
+            "recall": recall,
+            "f1_score": f1,
+        }
+    )
+
+
+def bootstrap_intervals(
+    y_true: np.ndarray,
+    y_score: np.ndarray,
+    threshold: float = DECISION_THRESHOLD,
+    n_bootstrap: int = config.evaluation.n_bootstrap,
+    confidence_level: float = config.evaluation.confidence_level,
+    score_bins: int = config.evaluation.score_bins,
+    random_state: int = config.random_state,
+) -> pd.DataFrame:
+    """Point estimates and percentile bootstrap intervals for ``METRICS``.
+
+    Rows are grouped into (score bin, label) cells, with ``threshold`` as a bin
+    edge, and each resample is drawn as multinomial cell counts instead of row
+    indices. Precision, recall and F1 are exact per resample; the AUC treats
+    pairs within a score quantile bin as ties, which is exact when there are
+    fewer than ``score_bins`` distinct scores.
+    """
+    y_true = np.asarray(y_true, dtype=np.int64)
+    y_score = np.asarray(y_score, dtype=np.float64)
+    quantiles = np.quantile(y_score, np.linspace(0, 1, score_bins + 1)[1:-1])
+    edges = np.unique(np.r_[quantiles, threshold])
+    bins = np.searchsorted(edges, y_score)
+    n_bins = len(edges) + 1
+    predicted = np.arange(n_bins) > np.searchsorted(edges, threshold)
+
+    cells = np.bincount(2 * bins + y_true, minlength=2 * n_bins)
+    rng = np.random.default_rng(random_state)
+    samples = []
+    for size in np.diff(np.r_[0:n_bootstrap:BOOTSTRAP_BATCH, n_bootstrap]):
+        counts = rng.multinomial(len(y_true), cells / len(y_true), size=size)
+        counts = counts.reshape(size, n_bins, 2)
+        neg, pos = counts[..., 0], counts[..., 1]
+        tp = pos[:, predicted].sum(axis=1)
+        fp = neg[:, predicted].sum(axis=1)
+        fn = pos.sum(axis=1) - tp
+        samples.append(np.stack([binned_auc(pos, neg), *rates(tp, fp, fn)], axis=1))
+    samples = np.concatenate(samples)
+
+    alpha = (1 - confidence_level) / 2
+    y_pred = y_score > threshold
+    tp = np.sum(y_pred & (y_true == 1))
+    fp = np.sum(y_pred) - tp
+    fn = np.sum(y_true) - tp
+    return pd.DataFrame(
+        {
+            "estimate": [rank_auc(y_true, y_score), *rates(tp, fp, fn)],
+            "lower": np.nanquantile(samples, alpha, axis=0),
+            "upper": np.nanquantile(samples, 1 - alpha, axis=0),
+        },
+        index=pd.Index(METRICS, name="metric"),
+    )
+
+
+def evaluation_report(
+    y_true: np.ndarray,
+    y_score: np.ndarray,
+    output_dir: Path = EVALUATION_DIR,
+) -> tuple[dict, list[Path]]:
+    """Writes the bootstrap intervals and the threshold sweep to ``output_dir``.
+
+    Returns flat metrics for logging and the written files.
+    """
+    intervals = bootstrap_intervals(y_true, y_score)
+    sweep = threshold_sweep(y_true, y_score)
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    intervals_path = output_dir / "bootstrap_intervals.csv"
+    sweep_path = output_dir / "threshold_sweep.parquet"
+    intervals.to_csv(intervals_path)
+    write_table(sweep, sweep_path)
+
+    metrics = {
+        f"{metric}_{column}": value
+        for metric, row in intervals.iterrows()
+        for column, value in row.items()
+    }
+    best = sweep.loc[sweep["f1_score"].idxmax()]
+    metrics.update(best_f1_threshold=best["threshold"], best_f1_score=best["f1_score"])
+    logger.info(f"Bootstrap intervals:\n{intervals}")
+    return metrics, [intervals_path, sweep_path]
@@ -1,72 +1,380 @@
+import hashlib
+import json
+import shutil
 from pathlib import Path
 
 import joblib
+import numpy as np
 import pandas as pd
 from sklearn.preprocessing import OneHotEncoder
 
-from src.config import FEATURES_DIR, MODEL_DIR, SPLIT_DATA_DIR, TARGET_COLUMN
+from src.config import FEATURES_DIR, MODEL_DIR, SPLIT_DATA_DIR, TARGET_COLUMN, config
+from src.data_io import (
+    SUFFIXES,
+    data_file,
+    file_digest,
+    find_data_file,
+    partition_files,
+    read_columns,
+    read_table,
+    write_table,
+)
+from src.inference.drift import REFERENCE_PROFILE_FILE, DriftProfile
 from src.logs import get_logger
 
 logger = get_logger("feature_engineering")
 
+MANIFEST_FILE = "manifest.json"
 
-def feature_engineering(
+
+def compact_dtype_map(*frames: pd.DataFrame) -> dict[str, np.dtype]:
+    """The smallest dtype of each numeric column that holds its values in every frame.
+
+    Integers get the narrowest integer type covering the joint min/max and floats
+    become float32, the precision XGBoost converts all inputs to anyway.
+    """
+    dtypes = {}
+    for col in frames[0].columns:
+        kind = frames[0][col].dtype.kind
+        if kind in "iu" and all(len(df) for df in frames):
+            low = min(df[col].min() for df in frames)
+            high = max(df[col].max() for df in frames)
+            dtypes[col] = np.result_type(
+                np.min_scalar_type(low), np.min_scalar_type(high)
+            )
+        elif kind == "f":
+            dtypes[col] = np.dtype(np.float32)
+    return dtypes
+
+
+def compact_dtypes(*frames: pd.DataFrame) -> list[pd.DataFrame]:
+    """Casts columns to the smallest dtype that holds their values in every frame."""
+    dtypes = compact_dtype_map(*frames)
+    return [df.astype(dtypes) for df in frames]
+
+
+def widen_dtypes(
+    dtypes: dict[str, np.dtype], other: dict[str, np.dtype]
+) -> dict[str, np.dtype]:
+    """The dtypes that hold the values of both mappings, column by column."""
+    widened = dict(dtypes)
+    for col, dtype in other.items():
+        widened[col] = np.result_type(widened[col], dtype) if col in widened else dtype
+    return widened
+
+
+def make_encoder(categories: str | list = "auto") -> OneHotEncoder:
+    return OneHotEncoder(
+        categories=categories,
+        handle_unknown="ignore",
+        sparse_output=False,
+        drop="first",
+        dtype=np.uint8,
+    )
+
+
+def make_preprocessor(
+    encoder: OneHotEncoder, categorical_cols: list[str], numerical_cols: list[str]
+) -> dict:
+    return {
+        "encoder": encoder,
+        "categorical_cols": list(categorical_cols),
+        "numerical_cols": list(numerical_cols),
+        "feature_names_out": encoder.get_feature_names_out(categorical_cols).tolist(),
+    }
+
+
+def fit_preprocessor(X_train: pd.DataFrame) -> dict:
+    categorical_cols = X_train.select_dtypes(include=["object", "category"]).columns
+    numerical_cols = X_train.select_dtypes(include=["number"]).columns
+
+    encoder = make_encoder()
+    encoder.fit(X_train[categorical_cols])
+    return make_preprocessor(encoder, categorical_cols, numerical_cols)
+
+
+def encode_frame(
+    df: pd.DataFrame, preprocessor: dict, target_column: str = TARGET_COLUMN
+) -> pd.DataFrame:
+    categorical_cols = preprocessor["categorical_cols"]
+    X = df.drop(columns=[target_column])
+
+    X_encoded = pd.DataFrame(
+        preprocessor["encoder"].transform(X[categorical_cols]),
+        columns=preprocessor["feature_names_out"],
+        index=X.index,
+    )
+    X_final = X.drop(columns=categorical_cols).join(X_encoded)
+    return pd.concat([X_final, df[target_column]], axis=1)
+
+
+def encode_features(
+    train_df: pd.DataFrame,
+    test_df: pd.DataFrame,
+    target_column: str = TARGET_COLUMN,
+) -> tuple[pd.DataFrame, pd.DataFrame, dict]:
+    preprocessor = fit_preprocessor(train_df.drop(columns=[target_column]))
+    train_featured, test_featured = compact_dtypes(
+        encode_frame(train_df, preprocessor, target_column),
+        encode_frame(test_df, preprocessor, target_column),
+    )
+    return train_featured, test_featured, preprocessor
+
+
+def save_preprocessor(preprocessor: dict, model_dir: Path = MODEL_DIR):
+    preprocessor_path = model_dir / "preprocessor.joblib"
+    joblib.dump(preprocessor, preprocessor_path)
+    logger.info(f"Preprocessor saved to {preprocessor_path}")
+
+
+def reference_profile(X_train: pd.DataFrame) -> DriftProfile:
+    """Sketches the training inputs as the reference for serving drift checks."""
+    return DriftProfile.fit(X_train, config.drift.reference_bins)
+
+
+def save_reference_profile(profile: DriftProfile, model_dir: Path = MODEL_DIR):
+    profile_path = model_dir / REFERENCE_PROFILE_FILE
+    profile.save(profile_path)
+    logger.info(f"Reference profile saved to {profile_path}")
+
+
+def preprocessor_version(preprocessor: dict) -> str:
+    categories = [cats.tolist() for cats in preprocessor["encoder"].categories_]
+    state = [
+        preprocessor["categorical_cols"],
+        preprocessor["numerical_cols"],
+        categories,
+    ]
+    return hashlib.sha256(json.dumps(state, default=str).encode()).hexdigest()[:16]
+
+
+def merge_categories(preprocessor: dict, partitions: list[Path]) -> dict:
+    """Returns ``preprocessor``, refit with extra categories if ``partitions`` add any.
+
+    Only the categorical columns of the partitions are read. Known categories keep
+    their position and new ones are appended, so existing one-hot columns keep
+    their names.
+    """
+    categorical_cols = preprocessor["categorical_cols"]
+    seen = {col: set() for col in categorical_cols}
+    for partition in partitions:
+        df = read_table(partition, columns=categorical_cols)
+        for col in categorical_cols:
+            seen[col].update(df[col].dropna().unique())
+
+    known = dict(zip(categorical_cols, preprocessor["encoder"].categories_))
+    new = {col: sorted(seen[col] - set(known[col])) for col in categorical_cols}
+    if not any(new.values()):
+        return preprocessor
+
+    logger.info(f"New categories found, refitting the encoder: {new}")
+    categories = [list(known[col]) + new[col] for col in categorical_cols]
+    rows = max(len(cats) for cats in categories)
+    # With explicit categories the fit data only has to be valid, not representative.
+    fit_frame = pd.DataFrame(
+        {
+            col: [cats[i % len(cats)] for i in range(rows)]
+            for col, cats in zip(categorical_cols, categories)
+        }
+    )
+    encoder = make_encoder(categories).fit(fit_frame)
+    return make_preprocessor(encoder, categorical_cols, preprocessor["numerical_cols"])
+
+
+def remove_stale_features(output_path: Path, partitioned: bool):
+    """Deletes feature tables in the other layout, left behind by an earlier run.
+
+    ``find_data_file`` prefers partition directories, so stale ones would shadow
+    fresh single files, and stale single files would be read if the partitions
+    went missing.
+    """
+    for split in ("train", "test"):
+        if partitioned:
+            stale = [data_file(output_path, split, fmt) for fmt in SUFFIXES]
+            for path in stale:
+                if path.is_file():
+                    path.unlink()
+                    logger.info(f"Removed stale feature table {path}")
+        elif (output_path / split).is_dir():
+            shutil.rmtree(output_path / split)
+            logger.info(f"Removed stale feature partitions {output_path / split}")
+    if not partitioned:
+        (output_path / MANIFEST_FILE).unlink(missing_ok=True)
+
+
+def incremental_feature_engineering(
     input_path: Path = SPLIT_DATA_DIR,
     output_path: Path = FEATURES_DIR,
     target_column: str = TARGET_COLUMN,
     model_dir: Path = MODEL_DIR,
-):
-    logger.info("Starting feature engineering...")
+    data_format: str = config.data_io.format,
+) -> list[str]:
+    """Encodes ``train/`` and ``test/`` partition directories into matching outputs.
+
+    The persisted preprocessor is reused and only partitions that are new or whose
+    content changed since the last run (per ``manifest.json``) are encoded. When
+    new training partitions bring unseen categories the encoder is refit on the
+    merged category sets and every partition is re-encoded. Returns the output
+    partitions written by this run.
+    """
+    manifest_path = output_path / MANIFEST_FILE
+    manifest = {"preprocessor": None, "partitions": {}}
+    if manifest_path.exists():
+        manifest = json.loads(manifest_path.read_text())
 
-    train_df = pd.read_csv(input_path / "train.csv")
-    test_df = pd.read_csv(input_path / "test.csv")
+    train_partitions = partition_files(input_path / "train")
+    digests = {
+        f"{split}/{partition.stem}": file_digest(partition)
+        for split in ("train", "test")
+        for partition in partition_files(input_path / split)
+    }
 
-    X_train = train_df.drop(columns=[target_column])
-    y_train = train_df[target_column]
-    X_test = test_df.drop(columns=[target_column])
-    y_test = test_df[target_column]
+    preprocessor_path = model_dir / "preprocessor.joblib"
+    preprocessor = (
+        joblib.load(preprocessor_path) if preprocessor_path.exists() else None
+    )
+    expected_columns = None
+    if preprocessor is not None:
+        expected_columns = {
+            *preprocessor["categorical_cols"],
+            *preprocessor["numerical_cols"],
+            target_column,
+        }
+    if expected_columns != set(read_columns(train_partitions[0])):
+        logger.info(
+            "No matching preprocessor found, fitting one on all training partitions"
+        )
+        train_df = read_table(input_path / "train")
+        preprocessor = fit_preprocessor(train_df.drop(columns=[target_column]))
+        del train_df
+    else:
+        changed = [
+            partition
+            for partition in train_partitions
+            if manifest["partitions"].get(f"train/{partition.stem}")
+            != digests[f"train/{partition.stem}"]
+        ]
+        preprocessor = merge_categories(preprocessor, changed)
 
-    categorical_cols = X_train.select_dtypes(include=["object", "category"]).columns
-    numerical_cols = X_train.select_dtypes(include=["number"]).columns
+    version = preprocessor_version(preprocessor)
+    if version != manifest["preprocessor"]:
+        manifest = {"preprocessor": version, "partitions": {}}
+        save_preprocessor(preprocessor, model_dir)
 
-    encoder = OneHotEncoder(handle_unknown="ignore", sparse_output=False, drop="first")
-    encoder.fit(X_train[categorical_cols])
+    def pending() -> list[tuple[str, Path]]:
+        return [
+            (split, partition)
+            for split in ("train", "test")
+            for partition in partition_files(input_path / split)
+            if manifest["partitions"].get(f"{split}/{partition.stem}")
+            != digests[f"{split}/{partition.stem}"]
+            or not data_file(output_path / split, partition.stem, data_format).exists()
+        ]
 
-    X_train_encoded = pd.DataFrame(
-        encoder.transform(X_train[categorical_cols]),
-        columns=encoder.get_feature_names_out(categorical_cols),
-        index=X_train.index,
+    # Every partition is written with one schema. Integer widths are widened to
+    # cover the partitions about to be encoded; if that changes the schema, the
+    # partitions written before are re-encoded with it.
+    stored_dtypes = {
+        col: np.dtype(dtype) for col, dtype in manifest.get("dtypes", {}).items()
+    }
+    dtypes = {
+        name: np.dtype(preprocessor["encoder"].dtype)
+        for name in preprocessor["feature_names_out"]
+    }
+    dtypes.update(stored_dtypes)
+    for _, partition in pending():
+        df = read_table(
+            partition, columns=[*preprocessor["numerical_cols"], target_column]
+        )
+        dtypes = widen_dtypes(dtypes, compact_dtype_map(df))
+    if manifest["partitions"] and dtypes != stored_dtypes:
+        logger.info("Feature dtypes changed, re-encoding every partition")
+        manifest["partitions"] = {}
+    manifest["dtypes"] = {col: str(dtype) for col, dtype in dtypes.items()}
+
+    # New training partitions are merged into the reference profile; anything
+    # else that changes the training data rebuilds it from every partition.
+    profile_path = model_dir / REFERENCE_PROFILE_FILE
+    profile = None
+    rewritten = any(
+        manifest["partitions"].get(f"train/{partition.stem}")
+        not in (None, digests[f"train/{partition.stem}"])
+        for partition in train_partitions
     )
-    X_train_final = X_train.drop(columns=categorical_cols).join(X_train_encoded)
+    if manifest["partitions"] and profile_path.exists() and not rewritten:
+        profile = DriftProfile.load(profile_path)
+
+    remove_stale_features(output_path, partitioned=True)
+    written = []
+    for split, partition in pending():
+        key = f"{split}/{partition.stem}"
+        output_file = data_file(output_path / split, partition.stem, data_format)
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+        df = read_table(partition)
+        featured = encode_frame(df, preprocessor, target_column).astype(dtypes)
+        write_table(featured, output_file)
+        if split == "train" and profile is not None:
+            profile.update_frame(df)
+        manifest["partitions"][key] = digests[key]
+        written.append(key)
+
+    for split in ("train", "test"):
+        split_dir = output_path / split
+        split_dir.mkdir(parents=True, exist_ok=True)
+        for output_file in partition_files(split_dir):
+            if f"{split}/{output_file.stem}" not in digests:
+                output_file.unlink()
+                manifest["partitions"].pop(f"{split}/{output_file.stem}", None)
+                logger.info(f"Removed {output_file}, its input partition is gone")
 
-    X_test_encoded = pd.DataFrame(
-        encoder.transform(X_test[categorical_cols]),
-        columns=encoder.get_feature_names_out(categorical_cols),
-        index=X_test.index,
+    if profile is None:
+        train_df = read_table(input_path / "train")
+        profile = reference_profile(train_df.drop(columns=[target_column]))
+        del train_df
+    save_reference_profile(profile, model_dir)
+    manifest_path.write_text(json.dumps(manifest, indent=2))
+    logger.info(
+        f"Encoded {len(written)} of {len(digests)} partitions into {output_path}"
     )
-    X_test_final = X_test.drop(columns=categorical_cols).join(X_test_encoded)
+    return written
+
+
+def feature_engineering(
+    input_path: Path = SPLIT_DATA_DIR,
+    output_path: Path = FEATURES_DIR,
+    target_column: str = TARGET_COLUMN,
+    model_dir: Path = MODEL_DIR,
+    data_format: str = config.data_io.format,
+):
+    logger.info("Starting feature engineering...")
+
+    if (input_path / "train").is_dir():
+        incremental_feature_engineering(
+            input_path, output_path, target_column, model_dir, data_format
+        )
+        return
 
-    train_featured = pd.concat([X_train_final, y_train], axis=1)
-    test_featured = pd.concat([X_test_final, y_test], axis=1)
+    train_df = read_table(find_data_file(input_path, "train"))
+    test_df = read_table(find_data_file(input_path, "test"))
+    remove_stale_features(output_path, partitioned=False)
 
-    train_output_file = output_path / "train.csv"
-    test_output_file = output_path / "test.csv"
-    train_featured.to_csv(train_output_file, index=False)
-    test_featured.to_csv(test_output_file, index=False)
+    train_featured, test_featured, preprocessor = encode_features(
+        train_df, test_df, target_column
+    )
+
+    train_output_file = data_file(output_path, "train", data_format)
+    test_output_file = data_file(output_path, "test", data_format)
+    write_table(train_featured, train_output_file)
+    write_table(test_featured, test_output_file)
 
     logger.info(
         f"Feature engineering complete. Saved to {train_output_file} and {test_output_file}"
     )
 
-    preprocessor = {
-        "encoder": encoder,
-        "categorical_cols": list(categorical_cols),
-        "numerical_cols": list(numerical_cols),
-        "feature_names_out": encoder.get_feature_names_out(categorical_cols).tolist(),
-    }
-    preprocessor_path = model_dir / "preprocessor.joblib"
-    joblib.dump(preprocessor, preprocessor_path)
-    logger.info(f"Preprocessor saved to {preprocessor_path}")
+    save_preprocessor(preprocessor, model_dir)
+    save_reference_profile(
+        reference_profile(train_df.drop(columns=[target_column])), model_dir
+    )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,86 @@
+from pathlib import Path
+
+from src.api.schemas import PredictionInput
+from src.config import (
+    CUSTOMER_ID_COLUMN_RAW,
+    PROJECT_ROOT,
+    RAW_DATA_DIR,
+    RAW_DATA_FILE,
+    config,
+)
+from src.data_io import file_digest, iter_table, partition_files, read_columns
+from src.inference.online_store import ID_COLUMN, OnlineStore
+from src.logs import get_logger
+from src.pipeline.data_cleaning import normalize_column
+
+logger = get_logger("feature_materialization")
+
+FEATURE_COLUMNS = list(PredictionInput.model_fields)
+
+
+def open_store(path: Path | None = None, readonly: bool = False) -> OnlineStore:
+    path = path or PROJECT_ROOT / config.online_store.path
+    return OnlineStore(path, FEATURE_COLUMNS, readonly=readonly)
+
+
+def materialize_partition(store: OnlineStore, partition: Path, chunk_size: int) -> int:
+    wanted = {CUSTOMER_ID_COLUMN_RAW, *FEATURE_COLUMNS}
+    columns = [
+        col for col in read_columns(partition) if normalize_column(col) in wanted
+    ]
+    rows = 0
+    for chunk in iter_table(partition, chunk_size, columns=columns):
+        chunk.columns = [normalize_column(col) for col in chunk.columns]
+        chunk = chunk.rename(columns={CUSTOMER_ID_COLUMN_RAW: ID_COLUMN})
+        rows += store.upsert(chunk.dropna(subset=[ID_COLUMN]))
+    return rows
+
+
+def materialize_features(
+    source_path: Path = RAW_DATA_DIR / RAW_DATA_FILE,
+    store_path: Path | None = None,
+    chunk_size: int = config.online_store.chunk_size,
+) -> int:
+    """Loads the latest feature row per customer into the online store.
+
+    ``source_path`` is a table with the customer ID, or a directory of
+    append-only partitions where later partitions hold newer rows. Partitions
+    whose digest is unchanged since the last run are skipped; when an earlier
+    partition changes, it and every later one are loaded again so newer rows
+    still win. Returns the number of rows written.
+    """
+    store = open_store(store_path)
+    try:
+        partitions = partition_files(source_path)
+        digests = {partition.name: file_digest(partition) for partition in partitions}
+        materialized = store.sources()
+        if not materialized.keys() <= digests.keys():
+            logger.info("Source partitions were removed, rebuilding the online store")
+            store.clear()
+            materialized = {}
+
+        changed = [
+            i
+            for i, partition in enumerate(partitions)
+            if materialized.get(partition.name) != digests[partition.name]
+        ]
+        if not changed:
+            logger.info(f"Online store is up to date ({len(store)} customers)")
+            return 0
+
+        rows = 0
+        for partition in partitions[changed[0] :]:
+            rows += materialize_partition(store, partition, chunk_size)
+            store.mark_source(partition.name, digests[partition.name])
+            logger.info(f"Materialized {partition}")
+        logger.info(
+            f"Wrote {rows} rows from {len(partitions) - changed[0]} partitions; "
+            f"the online store holds {len(store)} customers"
+        )
+        return rows
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    materialize_features()
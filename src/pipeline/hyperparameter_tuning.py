@@ -0,0 +1,221 @@
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import optuna
+import pandas as pd
+import yaml
+from optuna.storages import JournalStorage
+from optuna.storages.journal import JournalFileBackend
+from optuna_integration import XGBoostPruningCallback
+from sklearn.model_selection import train_test_split
+from xgboost import XGBClassifier
+
+from src.config import (
+    FEATURES_DIR,
+    PARAMS_FILE,
+    TARGET_COLUMN,
+    TUNING_DIR,
+    Hyperparameters,
+    config,
+)
+from src.data_io import find_data_file, read_table
+from src.logs import get_logger
+
+logger = get_logger("hyperparameter_tuning")
+
+optuna.logging.set_verbosity(optuna.logging.WARNING)
+
+# Early stopping follows the last metric (logloss); pruning and the objective use AUC.
+EVAL_METRICS = ["auc", "logloss"]
+PRUNING_METRIC = "validation_0-auc"
+
+
+def suggest_params(trial: optuna.Trial) -> dict:
+    return {
+        "learning_rate": trial.suggest_float("learning_rate", 0.01, 0.3, log=True),
+        "max_depth": trial.suggest_int("max_depth", 3, 10),
+        "min_child_weight": trial.suggest_int("min_child_weight", 1, 10),
+        "gamma": trial.suggest_float("gamma", 0.0, 1.0),
+        "colsample_bytree": trial.suggest_float("colsample_bytree", 0.5, 1.0),
+        "subsample": trial.suggest_float("subsample", 0.5, 1.0),
+    }
+
+
+def load_tuning_data(
+    input_path: Path, target_column: str, validation_size: float, random_state: int
+) -> tuple[pd.DataFrame, pd.DataFrame, pd.Series, pd.Series]:
+    """Splits a validation set off the training data, so the test set stays unseen."""
+    train_df = read_table(find_data_file(input_path, "train"))
+    X = train_df.drop(columns=[target_column])
+    y = train_df[target_column]
+    return train_test_split(
+        X, y, test_size=validation_size, random_state=random_state, stratify=y
+    )
+
+
+def make_objective(X_train, X_val, y_train, y_val, prune: bool, nthread: int):
+    tuning = config.tuning
+
+    def objective(trial: optuna.Trial) -> float:
+        params = suggest_params(trial)
+        if prune:
+            n_estimators = tuning.max_estimators
+            early_stopping_rounds = tuning.early_stopping_rounds
+            callbacks = [XGBoostPruningCallback(trial, PRUNING_METRIC)]
+        else:
+            n_estimators = trial.suggest_int("n_estimators", 50, 300)
+            early_stopping_rounds = callbacks = None
+
+        model = XGBClassifier(
+            **params,
+            n_estimators=n_estimators,
+            objective="binary:logistic",
+            eval_metric=EVAL_METRICS,
+            early_stopping_rounds=early_stopping_rounds,
+            callbacks=callbacks,
+            tree_method="hist",
+            n_jobs=nthread,
+            random_state=config.random_state,
+        )
+        model.fit(X_train, y_train, eval_set=[(X_val, y_val)], verbose=False)
+
+        best_iteration = model.best_iteration if prune else n_estimators - 1
+        trial.set_user_attr("n_estimators", best_iteration + 1)
+        return model.evals_result()["validation_0"]["auc"][best_iteration]
+
+    return objective
+
+
+def study_storage(storage_path: Path) -> JournalStorage:
+    storage_path.parent.mkdir(parents=True, exist_ok=True)
+    return JournalStorage(JournalFileBackend(str(storage_path)))
+
+
+def run_worker(
+    worker: int,
+    n_trials: int,
+    study_name: str,
+    storage_path: Path,
+    input_path: Path,
+    target_column: str,
+    prune: bool,
+    nthread: int,
+) -> int:
+    tuning = config.tuning
+    data = load_tuning_data(
+        input_path, target_column, tuning.validation_size, config.random_state
+    )
+    study = optuna.load_study(
+        study_name=study_name,
+        storage=study_storage(storage_path),
+        sampler=optuna.samplers.TPESampler(seed=config.random_state + worker),
+        pruner=optuna.pruners.MedianPruner(n_warmup_steps=tuning.pruning_warmup_rounds),
+    )
+    study.optimize(make_objective(*data, prune=prune, nthread=nthread), n_trials)
+    return n_trials
+
+
+def best_hyperparameters(study: optuna.Study) -> Hyperparameters:
+    trial = study.best_trial
+    return Hyperparameters(
+        **{**trial.params, "n_estimators": trial.user_attrs["n_estimators"]},
+        objective="binary:logistic",
+        eval_metric="logloss",
+    )
+
+
+def write_hyperparameters(hyperparameters: Hyperparameters, params_file: Path):
+    with open(params_file, "r") as f:
+        params = yaml.safe_load(f)
+    params["hyperparameters"].update(hyperparameters.model_dump())
+    with open(params_file, "w") as f:
+        yaml.safe_dump(params, f, sort_keys=False)
+
+
+def tune_hyperparameters(
+    input_path: Path = FEATURES_DIR,
+    target_column: str = TARGET_COLUMN,
+    n_trials: int = config.tuning.n_trials,
+    n_jobs: int = config.tuning.n_jobs,
+    prune: bool = True,
+    storage_path: Path = TUNING_DIR / "study.log",
+    study_name: str | None = None,
+    params_file: Path | None = PARAMS_FILE,
+) -> tuple[Hyperparameters, float]:
+    """Runs an Optuna study across ``n_jobs`` processes sharing a journal file.
+
+    Returns the best hyperparameters and the throughput in trials per hour.
+    Results are written to the ``hyperparameters`` section of ``params_file``.
+    """
+    study_name = study_name or f"churn-xgboost-{time.strftime('%Y%m%d-%H%M%S')}"
+    study = optuna.create_study(
+        study_name=study_name,
+        storage=study_storage(storage_path),
+        direction="maximize",
+    )
+    # Split the cores between workers so parallel trials do not oversubscribe them.
+    nthread = max(1, (os.cpu_count() or 1) // n_jobs)
+    shares = [n_trials // n_jobs + (i < n_trials % n_jobs) for i in range(n_jobs)]
+    logger.info(
+        f"Starting study '{study_name}' with {n_trials} trials on {n_jobs} workers "
+        f"({nthread} threads each, pruning {'on' if prune else 'off'})"
+    )
+
+    start = time.perf_counter()
+    worker_args = (study_name, storage_path, input_path, target_column, prune, nthread)
+    if n_jobs == 1:
+        run_worker(0, n_trials, *worker_args)
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            futures = [
+                executor.submit(run_worker, worker, share, *worker_args)
+                for worker, share in enumerate(shares)
+                if share
+            ]
+            for future in futures:
+                future.result()
+    elapsed = time.perf_counter() - start
+
+    trials = study.get_trials(deepcopy=False)
+    pruned = sum(t.state == optuna.trial.TrialState.PRUNED for t in trials)
+    trials_per_hour = len(trials) / elapsed * 3600
+    hyperparameters = best_hyperparameters(study)
+    logger.info(
+        f"Finished {len(trials)} trials ({pruned} pruned) in {elapsed:.1f}s, "
+        f"{trials_per_hour:.0f} trials/hour. Best validation AUC: {study.best_value:.5f}"
+    )
+    logger.info(f"Best hyperparameters: {hyperparameters.model_dump()}")
+
+    if params_file is not None:
+        write_hyperparameters(hyperparameters, params_file)
+        logger.info(f"Hyperparameters written to {params_file}")
+    return hyperparameters, trials_per_hour
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tune XGBoost hyperparameters.")
+    parser.add_argument("--n-trials", type=int, default=config.tuning.n_trials)
+    parser.add_argument("--n-jobs", type=int, default=config.tuning.n_jobs)
+    parser.add_argument(
+        "--no-pruning",
+        action="store_true",
+        help="train every trial to a sampled n_estimators, like the original study",
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true", help="do not update params.yaml"
+    )
+    args = parser.parse_args()
+
+    tune_hyperparameters(
+        n_trials=args.n_trials,
+        n_jobs=args.n_jobs,
+        prune=not args.no_pruning,
+        params_file=None if args.dry_run else PARAMS_FILE,
+    )
+
+
+if __name__ == "__main__":
+    main()
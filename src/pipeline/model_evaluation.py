@@ -3,37 +3,98 @@ from pathlib import Path
 
 import dvc.api
 import git
+import numpy as np
 import pandas as pd
 from sklearn.metrics import roc_auc_score
 from xgboost import XGBClassifier
 
 import wandb
 from src.config import (
+    EVALUATION_DIR,
     FEATURES_DIR,
     MODEL_DIR,
     TARGET_COLUMN,
     WANDB_MODEL_NAME,
+    config,
 )
+from src.data_io import find_data_file, read_table
+from src.inference.drift import (
+    PROBABILITY,
+    REFERENCE_PROFILE_FILE,
+    DriftProfile,
+    NumericSketch,
+)
+from src.inference.trees import TreeEnsemble
 from src.logs import get_logger
+from src.pipeline.evaluation_metrics import evaluation_report
 
 logger = get_logger("model_evaluation")
 
 
+def load_evaluation_model(
+    model_path: Path, inference_engine: str = config.inference.engine
+) -> tuple[XGBClassifier | TreeEnsemble, list[str]]:
+    if inference_engine == "native":
+        model = TreeEnsemble.load(model_path)
+        return model, model.feature_names
+
+    model = XGBClassifier()
+    model.load_model(model_path)
+    return model, model.get_booster().feature_names
+
+
 def evaluate_model(
     model_path: Path = MODEL_DIR / "model.json",
-    test_data_path: Path = FEATURES_DIR / "test.csv",
+    input_path: Path = FEATURES_DIR,
     target_column: str = TARGET_COLUMN,
+    inference_engine: str = config.inference.engine,
 ):
     logger.info("Starting model evaluation...")
 
-    test_df = pd.read_csv(test_data_path)
-    X_test = test_df.drop(columns=[target_column])
-    y_test = test_df[target_column]
+    new_model, feature_names = load_evaluation_model(model_path, inference_engine)
+    test_df = read_table(
+        find_data_file(input_path, "test"), columns=[*feature_names, target_column]
+    )
+    register_model(
+        new_model, test_df[feature_names], test_df[target_column], model_path
+    )
+
+    logger.info("Model evaluation complete.")
+
 
-    new_model = XGBClassifier()
-    new_model.load_model(model_path)
-    roc_auc = roc_auc_score(y_test, new_model.predict_proba(X_test)[:, 1])
+def add_probability_reference(
+    y_score: np.ndarray,
+    model_dir: Path = MODEL_DIR,
+    output_dir: Path = EVALUATION_DIR,
+) -> Path | None:
+    """Extends the feature engineering reference profile with the test-set scores.
+
+    Returns the profile to ship with the model, written to ``output_dir``.
+    """
+    profile_path = model_dir / REFERENCE_PROFILE_FILE
+    if not profile_path.exists():
+        logger.warning(f"No reference profile at {profile_path}, skipping scores.")
+        return None
+    profile = DriftProfile.load(profile_path)
+    profile.sketches[PROBABILITY] = NumericSketch.fit(
+        pd.Series(y_score), config.drift.reference_bins
+    )
+    output_dir.mkdir(parents=True, exist_ok=True)
+    profile.save(output_dir / REFERENCE_PROFILE_FILE)
+    return output_dir / REFERENCE_PROFILE_FILE
+
+
+def register_model(
+    new_model: XGBClassifier | TreeEnsemble,
+    X_test: pd.DataFrame,
+    y_test: pd.Series,
+    model_path: Path = MODEL_DIR / "model.json",
+):
+    y_score = new_model.predict_proba(X_test)[:, 1]
+    roc_auc = roc_auc_score(y_test, y_score)
     logger.info(f"New model ROC AUC: {roc_auc}")
+    report_metrics, report_files = evaluation_report(y_test.to_numpy(), y_score)
+    profile_path = add_probability_reference(y_score)
 
     run = wandb.init(
         project=os.getenv("WANDB_PROJECT"),
@@ -41,7 +102,17 @@ def evaluate_model(
         job_type="evaluation",
     )
 
-    run.log({"roc_auc": roc_auc})
+    run.log({"roc_auc": roc_auc, **report_metrics})
+
+    report_artifact = wandb.Artifact(
+        f"{WANDB_MODEL_NAME}-evaluation",
+        type="evaluation",
+        description="Bootstrap confidence intervals and threshold sweep",
+        metadata=report_metrics,
+    )
+    for path in report_files:
+        report_artifact.add_file(str(path))
+    run.log_artifact(report_artifact)
 
     repo = git.Repo(search_parent_directories=True)
     git_commit = repo.head.object.hexsha
@@ -55,10 +126,14 @@ def evaluate_model(
             "git_commit": git_commit,
             "data_url": data_url,
             "roc_auc": roc_auc,
+            "roc_auc_lower": report_metrics["roc_auc_lower"],
+            "roc_auc_upper": report_metrics["roc_auc_upper"],
         },
     )
     model_artifact.add_file(str(model_path))
     model_artifact.add_file(str(MODEL_DIR / "preprocessor.joblib"))
+    if profile_path is not None:
+        model_artifact.add_file(str(profile_path), name=REFERENCE_PROFILE_FILE)
 
     branch_name = repo.active_branch.name
     alias = "production" if branch_name == "main" else f"dev-{branch_name}"
@@ -68,8 +143,6 @@ def evaluate_model(
 
     run.finish()
 
-    logger.info("Model evaluation complete.")
-
 
 if __name__ == "__main__":
     evaluate_model()
@@ -1,9 +1,14 @@
 import os
+import tempfile
+import time
+from collections.abc import Callable
 from pathlib import Path
 
 import dvc.api
 import git
+import numpy as np
 import pandas as pd
+import xgboost as xgb
 from sklearn.metrics import (
     accuracy_score,
     f1_score,
@@ -11,34 +16,25 @@ from sklearn.metrics import (
     recall_score,
     roc_auc_score,
 )
+from sklearn.model_selection import train_test_split
 from xgboost import XGBClassifier
 
 import wandb
 from src.config import (
+    ARTIFACTS_DIR,
+    DECISION_THRESHOLD,
     FEATURES_DIR,
     MODEL_DIR,
     TARGET_COLUMN,
     config,
 )
+from src.data_io import find_data_file, iter_table, read_table
 from src.logs import get_logger
 
 logger = get_logger("model_training")
 
 
-def train_model(
-    input_path: Path = FEATURES_DIR,
-    target_column: str = TARGET_COLUMN,
-):
-    logger.info("Starting model training...")
-
-    train_df = pd.read_csv(input_path / "train.csv")
-    test_df = pd.read_csv(input_path / "test.csv")
-
-    X_train = train_df.drop(columns=[target_column])
-    y_train = train_df[target_column]
-    X_test = test_df.drop(columns=[target_column])
-    y_test = test_df[target_column]
-
+def start_run(input_path: Path, target_column: str):
     repo = git.Repo(search_parent_directories=True)
     git_commit = repo.head.object.hexsha
     data_url = dvc.api.get_url(path=str(input_path), repo=repo.working_tree_dir)
@@ -49,25 +45,21 @@ def train_model(
         "target_column": target_column,
         "test_size": config.data_split.test_size,
         "random_state": config.random_state,
+        "training": config.training.model_dump(),
         **config.hyperparameters.model_dump(),
     }
 
-    run = wandb.init(
+    return wandb.init(
         project=os.getenv("WANDB_PROJECT"),
         entity=os.getenv("WANDB_ENTITY"),
         config=wandb_config,
         job_type="training",
     )
 
-    model = XGBClassifier(
-        **config.hyperparameters.model_dump(), random_state=config.random_state
-    )
-    model.fit(X_train, y_train)
 
-    y_pred = model.predict(X_test)
-    y_pred_proba = model.predict_proba(X_test)[:, 1]
-
-    metrics = {
+def classification_metrics(y_test: np.ndarray, y_pred_proba: np.ndarray) -> dict:
+    y_pred = (y_pred_proba > DECISION_THRESHOLD).astype(int)
+    return {
         "accuracy": accuracy_score(y_test, y_pred),
         "precision": precision_score(y_test, y_pred),
         "recall": recall_score(y_test, y_pred),
@@ -75,15 +67,208 @@ def train_model(
         "roc_auc": roc_auc_score(y_test, y_pred_proba),
     }
 
+
+def inference_latency(
+    predict: Callable[[pd.DataFrame], np.ndarray], X: pd.DataFrame
+) -> dict:
+    single_row = X.iloc[:1]
+    timings = []
+    for _ in range(50):
+        start = time.perf_counter()
+        predict(single_row)
+        timings.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    predict(X)
+    batch_seconds = time.perf_counter() - start
+    return {
+        "single_row_latency_ms": float(np.median(timings) * 1000),
+        "batch_latency_ms_per_1k_rows": batch_seconds / len(X) * 1e6,
+    }
+
+
+def keep_best_iteration(model: XGBClassifier) -> XGBClassifier:
+    """Drops the trees grown after the best validation round."""
+    booster = model.get_booster()[: model.best_iteration + 1]
+    kept = XGBClassifier()
+    kept.load_model(bytearray(booster.save_raw("json")))
+    return kept
+
+
+def fit_model(
+    train_df: pd.DataFrame,
+    test_df: pd.DataFrame,
+    target_column: str = TARGET_COLUMN,
+    input_path: Path = FEATURES_DIR,
+    model_path: Path = MODEL_DIR / "model.json",
+) -> XGBClassifier:
+    X_train = train_df.drop(columns=[target_column])
+    y_train = train_df[target_column]
+    X_test = test_df.drop(columns=[target_column])
+    y_test = test_df[target_column]
+
+    run = start_run(input_path, target_column)
+
+    training = config.training
+    fit_kwargs = {}
+    early_stopping_rounds = None
+    if training.validation_size:
+        X_train, X_val, y_train, y_val = train_test_split(
+            X_train,
+            y_train,
+            test_size=training.validation_size,
+            random_state=config.random_state,
+            stratify=y_train,
+        )
+        fit_kwargs = {"eval_set": [(X_val, y_val)], "verbose": False}
+        early_stopping_rounds = training.early_stopping_rounds
+
+    model = XGBClassifier(
+        **config.hyperparameters.model_dump(),
+        random_state=config.random_state,
+        early_stopping_rounds=early_stopping_rounds,
+        tree_method=training.tree_method,
+        max_bin=training.max_bin,
+        n_jobs=training.nthread,
+    )
+    start = time.perf_counter()
+    model.fit(X_train, y_train, **fit_kwargs)
+    training_seconds = time.perf_counter() - start
+
+    if early_stopping_rounds is not None:
+        model = keep_best_iteration(model)
+
+    metrics = classification_metrics(y_test, model.predict_proba(X_test)[:, 1])
+    metrics.update(
+        training_seconds=training_seconds,
+        trees_kept=model.get_booster().num_boosted_rounds(),
+        **inference_latency(model.predict_proba, X_test),
+    )
     logger.info(f"Model metrics: {metrics}")
 
     wandb.log(metrics)
 
-    model_path = MODEL_DIR / "model.json"
     model.save_model(str(model_path))
     logger.info(f"Model saved to {model_path}")
 
     run.finish()
+    return model
+
+
+class FeatureBatches(xgb.DataIter):
+    """Feeds a feature table to XGBoost in row batches read straight from disk."""
+
+    def __init__(
+        self, path: Path, target_column: str, batch_rows: int, cache_prefix: str
+    ):
+        self.path = path
+        self.target_column = target_column
+        self.batch_rows = batch_rows
+        self._batches = None
+        super().__init__(cache_prefix=cache_prefix)
+
+    def next(self, input_data: Callable) -> bool:
+        if self._batches is None:
+            self._batches = iter_table(self.path, self.batch_rows)
+        batch = next(self._batches, None)
+        if batch is None:
+            return False
+        input_data(
+            data=batch.drop(columns=[self.target_column]),
+            label=batch[self.target_column],
+        )
+        return True
+
+    def reset(self):
+        self._batches = None
+
+
+def booster_params() -> tuple[dict, int]:
+    if config.training.tree_method != "hist":
+        raise ValueError(
+            "External-memory training only supports training.tree_method 'hist', "
+            f"got '{config.training.tree_method}'."
+        )
+    params = config.hyperparameters.model_dump()
+    num_boost_round = params.pop("n_estimators")
+    params.update(
+        tree_method=config.training.tree_method,
+        max_bin=config.training.max_bin,
+        nthread=config.training.nthread,
+        seed=config.random_state,
+    )
+    return params, num_boost_round
+
+
+def fit_model_external_memory(
+    input_path: Path = FEATURES_DIR,
+    target_column: str = TARGET_COLUMN,
+    model_path: Path = MODEL_DIR / "model.json",
+    batch_rows: int = config.training.batch_rows,
+) -> xgb.Booster:
+    """Trains without loading the training table into memory.
+
+    Batches are quantized into an external-memory DMatrix whose pages are cached
+    on disk next to the artifacts; the test set is scored batch by batch too.
+    Only the ``hist`` tree method supports external memory.
+    """
+    params, num_boost_round = booster_params()
+    if config.training.validation_size:
+        logger.warning("Early stopping is not applied to external-memory training.")
+    run = start_run(input_path, target_column)
+
+    with tempfile.TemporaryDirectory(dir=ARTIFACTS_DIR, prefix="xgb-cache-") as cache:
+        batches = FeatureBatches(
+            find_data_file(input_path, "train"),
+            target_column,
+            batch_rows,
+            cache_prefix=str(Path(cache) / "train"),
+        )
+        dtrain = xgb.ExtMemQuantileDMatrix(
+            batches, max_bin=params["max_bin"], nthread=params["nthread"]
+        )
+        start = time.perf_counter()
+        booster = xgb.train(params, dtrain, num_boost_round=num_boost_round)
+        training_seconds = time.perf_counter() - start
+        del dtrain
+
+    labels, probabilities = [], []
+    for batch in iter_table(find_data_file(input_path, "test"), batch_rows):
+        X_batch = batch.drop(columns=[target_column])
+        labels.append(batch[target_column].to_numpy())
+        probabilities.append(booster.inplace_predict(X_batch))
+    metrics = classification_metrics(
+        np.concatenate(labels), np.concatenate(probabilities)
+    )
+    metrics.update(
+        training_seconds=training_seconds,
+        trees_kept=booster.num_boosted_rounds(),
+        # The test set is never loaded whole, so latency is timed on its last batch.
+        **inference_latency(booster.inplace_predict, X_batch),
+    )
+    logger.info(f"Model metrics: {metrics}")
+
+    wandb.log(metrics)
+
+    booster.save_model(str(model_path))
+    logger.info(f"Model saved to {model_path}")
+
+    run.finish()
+    return booster
+
+
+def train_model(
+    input_path: Path = FEATURES_DIR,
+    target_column: str = TARGET_COLUMN,
+):
+    logger.info("Starting model training...")
+
+    if config.training.external_memory:
+        fit_model_external_memory(input_path, target_column)
+    else:
+        train_df = read_table(find_data_file(input_path, "train"))
+        test_df = read_table(find_data_file(input_path, "test"))
+        fit_model(train_df, test_df, target_column, input_path)
 
     logger.info("Model training complete.")
 
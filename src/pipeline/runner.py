@@ -0,0 +1,266 @@
+import argparse
+import json
+import resource
+import time
+import tracemalloc
+from collections.abc import Callable
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from types import ModuleType
+from typing import Any
+
+import pandas as pd
+
+from src.config import (
+    CLEANED_DATA_NAME,
+    CUSTOMER_ID_COLUMN_RAW,
+    FEATURES_DIR,
+    MODEL_DIR,
+    PROCESSED_DATA_DIR,
+    RAW_DATA_DIR,
+    RAW_DATA_FILE,
+    SPLIT_DATA_DIR,
+    TARGET_COLUMN,
+    config,
+)
+from src.data_io import data_file, file_digest, write_table
+from src.logs import get_logger
+from src.pipeline import data_cleaning, data_split, feature_engineering
+from src.pipeline.data_cleaning import load_clean_data
+from src.pipeline.data_split import split_frame
+from src.pipeline.feature_engineering import (
+    encode_features,
+    reference_profile,
+    remove_stale_features,
+    save_preprocessor,
+    save_reference_profile,
+)
+from src.pipeline.model_evaluation import load_evaluation_model, register_model
+from src.pipeline.model_training import fit_model
+from src.pipeline.stage_cache import StageCache, stage_key
+
+logger = get_logger("pipeline_runner")
+
+
+@dataclass
+class StageReport:
+    stage: str
+    seconds: float
+    max_rss_mb: float
+    peak_memory_mb: float | None = None
+
+
+class StageProfiler:
+    """Records wall time and memory high-water marks of each pipeline stage.
+
+    ``max_rss_mb`` is the process high-water mark after the stage, which also
+    includes native memory such as XGBoost's. With ``trace_memory``,
+    ``peak_memory_mb`` is the peak of the Python and NumPy allocations made
+    during the stage; tracing slows every allocation down, so it is off by
+    default.
+    """
+
+    def __init__(self, trace_memory: bool = False):
+        self.trace_memory = trace_memory
+        self.reports: list[StageReport] = []
+
+    @contextmanager
+    def stage(self, name: str):
+        logger.info(f"Running stage '{name}'")
+        if self.trace_memory:
+            tracemalloc.start()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            peak_memory_mb = None
+            if self.trace_memory:
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                peak_memory_mb = peak / 2**20
+            max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            self.reports.append(
+                StageReport(
+                    stage=name,
+                    seconds=seconds,
+                    max_rss_mb=max_rss / 2**10,
+                    peak_memory_mb=peak_memory_mb,
+                )
+            )
+
+
+def write_split(
+    train_df: pd.DataFrame, test_df: pd.DataFrame, output_path: Path, data_format: str
+):
+    write_table(train_df, data_file(output_path, "train", data_format))
+    write_table(test_df, data_file(output_path, "test", data_format))
+
+
+def cache_key(
+    cache: StageCache | None, stage: str, module: ModuleType, *inputs: Any
+) -> str | None:
+    """The ``stage_key`` of a stage, with ``Path`` inputs replaced by their
+    content digest, or None when no cache is in use."""
+    if cache is None:
+        return None
+    return stage_key(
+        stage,
+        module,
+        *(file_digest(x) if isinstance(x, Path) else x for x in inputs),
+    )
+
+
+def memoized(
+    cache: StageCache | None, key: str | None, stage: str, compute: Callable[[], dict]
+) -> dict:
+    if cache is None:
+        return compute()
+    return cache.get_or_compute(key, stage, compute)
+
+
+def run_pipeline(
+    raw_data_path: Path = RAW_DATA_DIR / RAW_DATA_FILE,
+    target_column: str = TARGET_COLUMN,
+    write_data: bool = True,
+    data_format: str = config.data_io.format,
+    cache: StageCache | None = None,
+    profile_memory: bool = False,
+) -> list[StageReport]:
+    """Runs every stage after data collection in one process.
+
+    DataFrames are handed from stage to stage in memory. The model and
+    preprocessor are always saved; the intermediate tables are only written
+    (never read back) when ``write_data`` is set, so DVC outputs stay current.
+    With a ``cache``, cleaning, splitting and feature engineering reuse earlier
+    outputs when their inputs, parameters and code are unchanged.
+    ``profile_memory`` traces the peak Python allocations of each stage.
+    """
+    profiler = StageProfiler(trace_memory=profile_memory)
+    model_path = MODEL_DIR / "model.json"
+
+    with profiler.stage("data_cleaning"):
+        clean_key = cache_key(
+            cache,
+            "data_cleaning",
+            data_cleaning,
+            raw_data_path,
+            CUSTOMER_ID_COLUMN_RAW,
+        )
+        df = memoized(
+            cache,
+            clean_key,
+            "data_cleaning",
+            lambda: {"cleaned": load_clean_data(raw_data_path)},
+        )["cleaned"]
+        if write_data:
+            write_table(
+                df, data_file(PROCESSED_DATA_DIR, CLEANED_DATA_NAME, data_format)
+            )
+
+    with profiler.stage("data_split"):
+        split_key = cache_key(
+            cache,
+            "data_split",
+            data_split,
+            clean_key,
+            target_column,
+            config.data_split.test_size,
+            config.random_state,
+        )
+        outputs = memoized(
+            cache,
+            split_key,
+            "data_split",
+            lambda: dict(zip(("train", "test"), split_frame(df, target_column))),
+        )
+        train_df, test_df = outputs["train"], outputs["test"]
+        df = outputs = None
+        if write_data:
+            write_split(train_df, test_df, SPLIT_DATA_DIR, data_format)
+
+    with profiler.stage("feature_engineering"):
+        features_key = cache_key(
+            cache,
+            "feature_engineering",
+            feature_engineering,
+            split_key,
+            target_column,
+            config.drift.reference_bins,
+        )
+        outputs = memoized(
+            cache,
+            features_key,
+            "feature_engineering",
+            lambda: dict(
+                zip(
+                    ("train", "test", "preprocessor"),
+                    encode_features(train_df, test_df, target_column),
+                ),
+                reference_profile=reference_profile(
+                    train_df.drop(columns=[target_column])
+                ),
+            ),
+        )
+        train_df, test_df = outputs["train"], outputs["test"]
+        save_preprocessor(outputs["preprocessor"])
+        save_reference_profile(outputs["reference_profile"])
+        if write_data:
+            remove_stale_features(FEATURES_DIR, partitioned=False)
+            write_split(train_df, test_df, FEATURES_DIR, data_format)
+
+    with profiler.stage("model_training"):
+        model = fit_model(train_df, test_df, target_column, model_path=model_path)
+
+    with profiler.stage("model_evaluation"):
+        if config.inference.engine == "native":
+            model, _ = load_evaluation_model(model_path, "native")
+        X_test = test_df.drop(columns=[target_column])
+        register_model(model, X_test, test_df[target_column], model_path)
+
+    for report in profiler.reports:
+        traced = ""
+        if report.peak_memory_mb is not None:
+            traced = f"peak traced memory {report.peak_memory_mb:.1f} MB, "
+        logger.info(
+            f"{report.stage}: {report.seconds:.2f}s, {traced}"
+            f"max RSS {report.max_rss_mb:.1f} MB"
+        )
+    return profiler.reports
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Run the training pipeline in one process."
+    )
+    parser.add_argument(
+        "--raw-data-path", type=Path, default=RAW_DATA_DIR / RAW_DATA_FILE
+    )
+    parser.add_argument(
+        "--no-data-outputs",
+        action="store_true",
+        help="do not write the processed, split and feature tables",
+    )
+    parser.add_argument("--report", type=Path, default=None, help="JSON stage report")
+    parser.add_argument("--no-cache", action="store_true", help="recompute every stage")
+    parser.add_argument(
+        "--profile-memory",
+        action="store_true",
+        help="trace the peak Python allocations of each stage (slower)",
+    )
+    args = parser.parse_args()
+
+    use_cache = config.stage_cache.enabled and not args.no_cache
+    reports = run_pipeline(
+        args.raw_data_path,
+        write_data=not args.no_data_outputs,
+        cache=StageCache() if use_cache else None,
+        profile_memory=args.profile_memory,
+    )
+    if args.report:
+        args.report.write_text(json.dumps([asdict(r) for r in reports], indent=2))
+
+
+if __name__ == "__main__":
+    main()
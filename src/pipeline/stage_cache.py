@@ -0,0 +1,180 @@
+import argparse
+import ast
+import hashlib
+import importlib.util
+import json
+import time
+from collections.abc import Callable
+from pathlib import Path
+from types import ModuleType
+from typing import Any
+
+import joblib
+import pandas as pd
+
+from src.config import STAGE_CACHE_DIR, config
+from src.data_io import file_digest
+from src.inference.artifacts import COMPLETE_MARKER, ArtifactCache, dir_size
+from src.logs import get_logger
+
+logger = get_logger("stage_cache")
+
+META_FILE = "meta.json"
+
+
+def module_file(name: str) -> Path | None:
+    try:
+        spec = importlib.util.find_spec(name)
+    except (ImportError, ValueError):
+        return None
+    if spec is None or spec.origin is None or not spec.origin.endswith(".py"):
+        return None
+    return Path(spec.origin)
+
+
+def imported_modules(path: Path, name: str) -> set[str]:
+    """Names of the modules imported by the source file of module ``name``."""
+    package = name if path.name == "__init__.py" else name.rpartition(".")[0]
+    names = set()
+    for node in ast.walk(ast.parse(path.read_text())):
+        if isinstance(node, ast.Import):
+            names.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            base = importlib.util.resolve_name(
+                "." * node.level + (node.module or ""), package
+            )
+            names.add(base)
+            # ``from package import module`` imports a submodule.
+            names.update(f"{base}.{alias.name}" for alias in node.names)
+    return names
+
+
+def source_files(module: ModuleType) -> list[Path]:
+    """The module's file and those of every module of its top-level package
+    that it imports, directly or transitively."""
+    root = module.__name__.split(".")[0]
+    seen = {module.__name__: Path(module.__file__)}
+    pending = [module.__name__]
+    while pending:
+        name = pending.pop()
+        for imported in imported_modules(seen[name], name):
+            if imported in seen or imported.split(".")[0] != root:
+                continue
+            if (path := module_file(imported)) is not None:
+                seen[imported] = path
+                pending.append(imported)
+    return sorted(set(seen.values()))
+
+
+def stage_key(stage: str, module: ModuleType, *inputs: Any) -> str:
+    """Identifies a stage run by its inputs, its parameters and its source code.
+
+    ``inputs`` are content digests of the stage inputs (or upstream stage keys)
+    followed by the config values the stage depends on. The source code covers
+    the stage module and every project module it imports.
+    """
+    digest = hashlib.sha256()
+    digest.update(stage.encode())
+    for path in source_files(module):
+        digest.update(file_digest(path).encode())
+    digest.update(json.dumps(inputs, default=str).encode())
+    return digest.hexdigest()[:32]
+
+
+class StageCache:
+    """Memoizes pipeline stage outputs on disk, keyed by ``stage_key``.
+
+    DataFrames are stored as Parquet (index included) and other outputs with
+    joblib. Entries are evicted least-recently-used first once the cache grows
+    beyond ``max_bytes``.
+    """
+
+    def __init__(self, root: Path = STAGE_CACHE_DIR, max_bytes: int | None = None):
+        if max_bytes is None:
+            max_bytes = config.stage_cache.max_size_mb * 2**20
+        self.store = ArtifactCache(root, max_bytes=max_bytes)
+
+    def load(self, key: str) -> dict[str, Any] | None:
+        path = self.store.get(key)
+        if path is None:
+            return None
+
+        outputs = {}
+        for name in json.loads((path / META_FILE).read_text())["outputs"]:
+            if (path / f"{name}.parquet").exists():
+                outputs[name] = pd.read_parquet(path / f"{name}.parquet")
+            else:
+                outputs[name] = joblib.load(path / f"{name}.joblib")
+        return outputs
+
+    def save(self, key: str, stage: str, outputs: dict[str, Any]):
+        def write(root: Path):
+            for name, value in outputs.items():
+                if isinstance(value, pd.DataFrame):
+                    value.to_parquet(root / f"{name}.parquet")
+                else:
+                    joblib.dump(value, root / f"{name}.joblib")
+            meta = {"stage": stage, "outputs": list(outputs), "created": time.time()}
+            (root / META_FILE).write_text(json.dumps(meta))
+
+        self.store.put(key, write)
+
+    def get_or_compute(
+        self, key: str, stage: str, compute: Callable[[], dict[str, Any]]
+    ) -> dict[str, Any]:
+        outputs = self.load(key)
+        if outputs is not None:
+            logger.info(f"Loaded cached outputs of stage '{stage}' ({key})")
+            return outputs
+
+        outputs = compute()
+        self.save(key, stage, outputs)
+        return outputs
+
+    def entries(self) -> list[dict]:
+        entries = []
+        for path in self.store.entries():
+            meta = json.loads((path / META_FILE).read_text())
+            entries.append(
+                {
+                    "key": path.name,
+                    "stage": meta["stage"],
+                    "size_mb": dir_size(path) / 2**20,
+                    "created": meta["created"],
+                    "last_used": (path / COMPLETE_MARKER).stat().st_mtime,
+                }
+            )
+        return entries
+
+    def clear(self):
+        self.store.clear()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect or clear the stage cache.")
+    parser.add_argument("command", choices=["list", "clear"])
+    args = parser.parse_args()
+
+    cache = StageCache()
+    if args.command == "clear":
+        cache.clear()
+        logger.info(f"Cleared stage cache at {cache.store.root}")
+        return
+
+    entries = cache.entries()
+    for entry in entries:
+        last_used = time.strftime(
+            "%Y-%m-%d %H:%M:%S", time.localtime(entry["last_used"])
+        )
+        print(
+            f"{entry['key']}  {entry['stage']:<20} {entry['size_mb']:>9.1f} MB  "
+            f"last used {last_used}"
+        )
+    total = sum(entry["size_mb"] for entry in entries)
+    print(
+        f"{len(entries)} entries, {total:.1f} MB (limit {config.stage_cache.max_size_mb} MB)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+import json
+import os
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+
+from kafka import KafkaConsumer, KafkaProducer
+from kafka.producer.future import FutureRecordMetadata
+
+from src.config import PROJECT_ROOT, config
+
+
+@dataclass(frozen=True)
+class Message:
+    key: bytes | None
+    value: bytes
+    offset: int
+
+
+class MemoryBroker:
+    """Single-partition topics held in process, standing in for Kafka in tests.
+
+    Like the other brokers it consumes one input topic for one consumer group:
+    ``poll`` advances a read position, ``commit`` stores it as the group offset
+    and ``rewind`` goes back to the last commit, as a restarted consumer would.
+    """
+
+    def __init__(self, input_topic: str, group_id: str):
+        self.input_topic = input_topic
+        self.group_id = group_id
+        self.topics: dict[str, list[tuple[bytes | None, bytes]]] = defaultdict(list)
+        self.committed: dict[tuple[str, str], int] = defaultdict(int)
+        self.position = 0
+
+    def produce(self, topic: str, key: bytes | None, value: bytes):
+        self.topics[topic].append((key, value))
+
+    def poll(self, max_records: int, timeout_s: float) -> list[Message]:
+        log = self.topics[self.input_topic]
+        if self.position >= len(log):
+            time.sleep(timeout_s)
+        stop = min(self.position + max_records, len(log))
+        messages = [
+            Message(key, value, offset)
+            for offset, (key, value) in enumerate(
+                log[self.position : stop], self.position
+            )
+        ]
+        self.position = stop
+        return messages
+
+    def flush(self):
+        pass
+
+    def commit(self):
+        self.committed[self.group_id, self.input_topic] = self.position
+
+    def rewind(self):
+        self.position = self.committed[self.group_id, self.input_topic]
+
+    def lag(self) -> int:
+        return len(self.topics[self.input_topic]) - self.position
+
+    def close(self):
+        pass
+
+
+class FileBroker:
+    """Topics as append-only JSON-lines files in a directory.
+
+    Lets several processes exchange events on one machine without Kafka. The
+    committed offset of each group is kept in ``<group>.<topic>.offset``.
+    """
+
+    def __init__(self, directory: Path, input_topic: str, group_id: str):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.input_topic = input_topic
+        self.offset_file = self.directory / f"{group_id}.{input_topic}.offset"
+        self._outputs = {}
+
+        self.topic_file(input_topic).touch()
+        self._input = open(self.topic_file(input_topic), "rb")
+        self.position = 0
+        committed = (
+            int(self.offset_file.read_text()) if self.offset_file.exists() else 0
+        )
+        while self.position < committed and self._input.readline():
+            self.position += 1
+
+    def topic_file(self, topic: str) -> Path:
+        return self.directory / f"{topic}.jsonl"
+
+    def produce(self, topic: str, key: bytes | None, value: bytes):
+        if topic not in self._outputs:
+            self._outputs[topic] = open(self.topic_file(topic), "ab")
+        line = {
+            "key": key.decode() if key is not None else None,
+            "value": value.decode(),
+        }
+        self._outputs[topic].write(json.dumps(line).encode() + b"\n")
+
+    def poll(self, max_records: int, timeout_s: float) -> list[Message]:
+        messages = []
+        while len(messages) < max_records:
+            start = self._input.tell()
+            line = self._input.readline()
+            if not line.endswith(b"\n"):
+                # Nothing new, or a line still being written: read it again later.
+                self._input.seek(start)
+                break
+            record = json.loads(line)
+            key = record["key"].encode() if record["key"] is not None else None
+            messages.append(Message(key, record["value"].encode(), self.position))
+            self.position += 1
+        if not messages:
+            time.sleep(timeout_s)
+        return messages
+
+    def flush(self):
+        for output in self._outputs.values():
+            output.flush()
+            os.fsync(output.fileno())
+
+    def commit(self):
+        tmp_file = self.offset_file.with_suffix(".tmp")
+        tmp_file.write_text(str(self.position))
+        tmp_file.replace(self.offset_file)
+
+    def lag(self) -> int:
+        with open(self.topic_file(self.input_topic), "rb") as f:
+            return sum(1 for _ in f) - self.position
+
+    def close(self):
+        self._input.close()
+        for output in self._outputs.values():
+            output.close()
+
+
+class KafkaBroker:
+    """Consumes one topic with manual commits and produces with ``acks=all``.
+
+    ``flush`` raises if any send since the last flush failed, so the caller
+    never commits offsets for outputs that were not written.
+    """
+
+    def __init__(self, bootstrap_servers: str, input_topic: str, group_id: str):
+        self.consumer = KafkaConsumer(
+            input_topic,
+            bootstrap_servers=bootstrap_servers,
+            group_id=group_id,
+            enable_auto_commit=False,
+            auto_offset_reset="earliest",
+        )
+        self.producer = KafkaProducer(
+            bootstrap_servers=bootstrap_servers, acks="all", linger_ms=5
+        )
+        self._pending: list[FutureRecordMetadata] = []
+
+    def produce(self, topic: str, key: bytes | None, value: bytes):
+        self._pending.append(self.producer.send(topic, key=key, value=value))
+
+    def poll(self, max_records: int, timeout_s: float) -> list[Message]:
+        batches = self.consumer.poll(
+            timeout_ms=int(timeout_s * 1000), max_records=max_records
+        )
+        return [
+            Message(record.key, record.value, record.offset)
+            for records in batches.values()
+            for record in records
+        ]
+
+    def flush(self):
+        self.producer.flush()
+        pending, self._pending = self._pending, []
+        for future in pending:
+            # Re-raises the delivery error of a failed send.
+            future.get()
+
+    def commit(self):
+        self.consumer.commit()
+
+    def lag(self) -> int:
+        partitions = self.consumer.assignment()
+        end_offsets = self.consumer.end_offsets(list(partitions))
+        return sum(end_offsets[p] - self.consumer.position(p) for p in partitions)
+
+    def close(self):
+        self.producer.close()
+        self.consumer.close()
+
+
+def make_broker() -> KafkaBroker | FileBroker:
+    streaming = config.streaming
+    if streaming.broker == "file":
+        return FileBroker(
+            PROJECT_ROOT / streaming.file_broker_dir,
+            streaming.input_topic,
+            streaming.group_id,
+        )
+    return KafkaBroker(
+        streaming.bootstrap_servers, streaming.input_topic, streaming.group_id
+    )
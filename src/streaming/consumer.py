@@ -0,0 +1,158 @@
+import argparse
+import json
+import signal
+import threading
+import time
+from dataclasses import dataclass, field
+
+from pydantic import ValidationError
+
+from src.api.model_store import ModelBundle, load_bundle, model_source
+from src.api.schemas import PredictionInput
+from src.config import DECISION_THRESHOLD, config
+from src.logs import get_logger
+from src.streaming.brokers import FileBroker, KafkaBroker, MemoryBroker, make_broker
+
+logger = get_logger("streaming")
+
+
+@dataclass
+class StreamStats:
+    events: int = 0
+    batches: int = 0
+    dead_letters: int = 0
+    lag: int = 0
+    started: float = field(default_factory=time.perf_counter)
+
+    def events_per_second(self) -> float:
+        return self.events / max(time.perf_counter() - self.started, 1e-9)
+
+
+class ScoringWorker:
+    """Scores ``PredictionInput`` events from a broker in micro-batches.
+
+    A batch closes at ``max_batch_size`` events or ``max_delay_ms`` after its
+    first event. Its predictions are produced and flushed before the input
+    offsets are committed, so a crash replays uncommitted events (at-least-once)
+    rather than losing them. Events that fail validation go to the dead-letter
+    topic unchanged.
+    """
+
+    def __init__(
+        self,
+        broker: MemoryBroker | FileBroker | KafkaBroker,
+        bundle: ModelBundle,
+        output_topic: str = config.streaming.output_topic,
+        dead_letter_topic: str = config.streaming.dead_letter_topic,
+        max_batch_size: int = config.streaming.max_batch_size,
+        max_delay_ms: float = config.streaming.max_delay_ms,
+    ):
+        self.broker = broker
+        self.bundle = bundle
+        self.output_topic = output_topic
+        self.dead_letter_topic = dead_letter_topic
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay_ms / 1000
+        self.stats = StreamStats()
+
+    def next_batch(self) -> list:
+        batch = self.broker.poll(self.max_batch_size, self.max_delay)
+        if not batch:
+            return batch
+        deadline = time.monotonic() + self.max_delay
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            batch += self.broker.poll(self.max_batch_size - len(batch), remaining)
+        return batch
+
+    def process(self, batch: list):
+        records, scored = [], []
+        for message in batch:
+            try:
+                record = PredictionInput.model_validate_json(message.value)
+            except ValidationError as e:
+                logger.warning(f"Invalid event at offset {message.offset}: {e}")
+                self.broker.produce(self.dead_letter_topic, message.key, message.value)
+                self.stats.dead_letters += 1
+                continue
+            records.append(record.model_dump())
+            scored.append(message)
+
+        if records:
+            bundle = self.bundle
+            probabilities = bundle.predict_proba(bundle.encoder.encode_batch(records))
+            for message, probability in zip(scored, probabilities):
+                result = {
+                    "prediction": int(probability > DECISION_THRESHOLD),
+                    "probability": float(probability),
+                    "model_version": bundle.version,
+                    "offset": message.offset,
+                }
+                self.broker.produce(
+                    self.output_topic, message.key, json.dumps(result).encode()
+                )
+
+        self.broker.flush()
+        self.broker.commit()
+        self.stats.events += len(batch)
+        self.stats.batches += 1
+
+    def report(self):
+        self.stats.lag = self.broker.lag()
+        logger.info(
+            f"Scored {self.stats.events} events in {self.stats.batches} batches "
+            f"({self.stats.events_per_second():.0f} events/s, "
+            f"{self.stats.dead_letters} dead-lettered), consumer lag {self.stats.lag}"
+        )
+
+    def run(
+        self,
+        stop: threading.Event | None = None,
+        max_events: int | None = None,
+        report_interval_s: float = config.streaming.report_interval_s,
+    ) -> StreamStats:
+        stop = stop or threading.Event()
+        next_report = time.monotonic() + report_interval_s
+        while not stop.is_set():
+            if max_events is not None and self.stats.events >= max_events:
+                break
+            batch = self.next_batch()
+            if batch:
+                self.process(batch)
+            if time.monotonic() >= next_report:
+                self.report()
+                next_report = time.monotonic() + report_interval_s
+        self.report()
+        return self.stats
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Score customer activity events from a topic."
+    )
+    parser.add_argument(
+        "--max-events", type=int, default=None, help="stop after this many events"
+    )
+    args = parser.parse_args()
+
+    bundle = load_bundle(model_source().fetch())
+    broker = make_broker()
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    signal.signal(signal.SIGINT, lambda *_: stop.set())
+
+    streaming = config.streaming
+    logger.info(
+        f"Scoring '{streaming.input_topic}' into '{streaming.output_topic}' "
+        f"with model {bundle.version} ({streaming.broker} broker)"
+    )
+    try:
+        ScoringWorker(broker, bundle).run(stop, args.max_events)
+    finally:
+        broker.close()
+
+
+if __name__ == "__main__":
+    main()
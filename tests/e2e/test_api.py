@@ -1,5 +1,6 @@
+import json
 import os
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import numpy as np
 import pandas as pd
@@ -11,11 +12,16 @@ from xgboost import XGBClassifier
 os.environ["WANDB_PROJECT"] = "test-project"
 os.environ["WANDB_ENTITY"] = "test-entity"
 
+from src.api import main
+from src.api.feature_lookup import FeatureLookup
 from src.api.main import app
+from src.api.prediction_cache import PredictionCache
+from src.api.schemas import PredictionInput
+from src.pipeline.feature_materialization import open_store
 
 
 @pytest.fixture(scope="module")
-def client():
+def client(tmp_path_factory: pytest.TempPathFactory):
     mock_preprocessor = {
         "categorical_cols": [
             "gender",
@@ -53,7 +59,9 @@ def client():
     mock_preprocessor["encoder"].fit(dummy_cat_data)
 
     mock_model = MagicMock(spec=XGBClassifier)
-    mock_model.predict.return_value = np.array([1])
+    mock_model.predict_proba.side_effect = lambda features: np.column_stack(
+        [1 - features[:, 0] / 100, features[:, 0] / 100]
+    )
     booster = MagicMock()
     booster.feature_names = [
         "age",
@@ -69,17 +77,25 @@ def client():
         "contract_length_Monthly",
         "contract_length_Yearly",
     ]
+    # Each feature contributes its own value, so explanations are predictable.
+    booster.predict.side_effect = lambda dmatrix, pred_contribs: np.column_stack(
+        [dmatrix.get_data().toarray(), np.zeros(dmatrix.num_row())]
+    )
     mock_model.get_booster.return_value = booster
 
     with (
-        patch("src.api.main.wandb") as mock_wandb,
-        patch("src.api.main.joblib.load", return_value=mock_preprocessor),
-        patch("src.api.main.XGBClassifier") as mock_xgb_class,
+        patch("src.inference.artifacts.wandb") as mock_wandb,
+        patch(
+            "src.api.model_store.ARTIFACT_CACHE_DIR",
+            tmp_path_factory.mktemp("artifact_cache"),
+        ),
+        patch("src.api.model_store.joblib.load", return_value=mock_preprocessor),
+        patch("src.api.model_store.XGBClassifier") as mock_xgb_class,
     ):
         mock_xgb_class.return_value = mock_model
         mock_artifact = MagicMock()
-        mock_artifact.download.return_value = "/fake/dir"
-        mock_wandb.init.return_value.use_artifact.return_value = mock_artifact
+        mock_artifact.digest = "test-digest"
+        mock_wandb.Api.return_value.artifact.return_value = mock_artifact
 
         with TestClient(app) as test_client:
             yield test_client
@@ -110,8 +126,8 @@ def test_predict_success(client: TestClient):
     assert response.status_code == 200
     response_data = response.json()
     assert "prediction" in response_data
-    assert response_data["prediction"] in [0, 1]
-    assert response_data["prediction"] == 1
+    # The mocked model scores age / 100.
+    assert response_data["prediction"] == 0
 
 
 def test_predict_default_values(client: TestClient):
@@ -119,7 +135,39 @@ def test_predict_default_values(client: TestClient):
 
     assert response.status_code == 200
     response_data = response.json()
-    assert response_data["prediction"] == 1
+    assert response_data["prediction"] == 0
+
+
+def test_predict_reports_probability_to_drift_monitor(client: TestClient, monkeypatch):
+    drift_monitor = MagicMock()
+    monkeypatch.setattr(main, "drift_monitor", drift_monitor)
+
+    response = client.post("/predict", json={"age": 80})
+
+    assert response.json() == {"prediction": 1}
+    _, records, probabilities = drift_monitor.observe.call_args.args
+    assert records[0]["age"] == 80
+    assert probabilities == pytest.approx([0.8])
+
+
+def test_predict_attributes_batched_score_to_the_scoring_model(
+    client: TestClient, monkeypatch
+):
+    swapped = MagicMock(version="v2")
+    batcher = MagicMock()
+    batcher.submit = AsyncMock(return_value=(swapped, 0.9))
+    cache = PredictionCache(capacity=8, ttl_s=60)
+    drift_monitor = MagicMock()
+    monkeypatch.setattr(main, "batcher", batcher)
+    monkeypatch.setattr(main, "prediction_cache", cache)
+    monkeypatch.setattr(main, "drift_monitor", drift_monitor)
+
+    response = client.post("/predict", json={})
+
+    assert response.json() == {"prediction": 1}
+    record = PredictionInput().model_dump()
+    assert cache.get("v2", record) == pytest.approx(0.9)
+    assert drift_monitor.observe.call_args.args[0] is swapped
 
 
 def test_predict_validation_error(client: TestClient):
@@ -129,3 +177,130 @@ def test_predict_validation_error(client: TestClient):
 
     assert response.status_code == 422
     assert response.json()["detail"][0]["type"] == "int_parsing"
+
+
+def test_predict_batch_success(client: TestClient):
+    records = [{"age": 80}, {"age": 20, "gender": "Female"}, {"age": 60}]
+
+    response = client.post("/predict/batch", json={"records": records})
+
+    assert response.status_code == 200
+    response_data = response.json()
+    assert response_data["predictions"] == [1, 0, 1]
+    assert response_data["probabilities"] == pytest.approx([0.8, 0.2, 0.6])
+
+
+def test_predict_batch_streaming(client: TestClient):
+    records = [{"age": 80}, {"age": 20}]
+
+    response = client.post(
+        "/predict/batch", params={"stream": True}, json={"records": records}
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["prediction"] for line in lines] == [1, 0]
+    assert [line["probability"] for line in lines] == pytest.approx([0.8, 0.2])
+
+
+def test_predict_with_explanation(client: TestClient):
+    response = client.post(
+        "/predict", params={"explain": True, "top_k": 2}, json={"age": 80}
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "prediction": 1,
+        "explanation": [
+            {"feature": "total_spend", "contribution": 500.0},
+            {"feature": "age", "contribution": 80.0},
+        ],
+    }
+
+
+def test_predict_batch_with_explanations(client: TestClient):
+    records = [{"age": 80}, {"total_spend": 5.0, "subscription_type": "Basic"}]
+
+    response = client.post(
+        "/predict/batch", params={"explain": True}, json={"records": records}
+    )
+
+    assert response.status_code == 200
+    explanations = response.json()["explanations"]
+    assert [driver["feature"] for driver in explanations[0]] == [
+        "total_spend",
+        "age",
+        "usage_frequency",
+    ]
+    assert explanations[1][0] == {"feature": "age", "contribution": 30.0}
+    assert "subscription_type" not in [driver["feature"] for driver in explanations[1]]
+
+
+def test_predict_batch_empty(client: TestClient):
+    response = client.post("/predict/batch", json={"records": []})
+
+    assert response.status_code == 422
+
+
+def test_predict_by_id(client: TestClient, tmp_path, monkeypatch):
+    store = open_store(tmp_path / "features.db")
+    store.upsert(
+        pd.DataFrame(
+            [
+                {"customer_id": 7, **PredictionInput(age=80).model_dump()},
+                {"customer_id": 8, **PredictionInput(age=20).model_dump()},
+            ]
+        )
+    )
+    monkeypatch.setattr(main, "feature_lookup", FeatureLookup(store, 10, 60))
+
+    response = client.post("/predict/by-id", json={"customer_ids": [7, "8", 9]})
+
+    assert response.status_code == 200
+    response_data = response.json()
+    assert [p["customer_id"] for p in response_data["predictions"]] == ["7", "8"]
+    assert [p["prediction"] for p in response_data["predictions"]] == [1, 0]
+    assert [p["probability"] for p in response_data["predictions"]] == pytest.approx(
+        [0.8, 0.2]
+    )
+    assert response_data["not_found"] == ["9"]
+
+    response = client.post("/predict/by-id", json={"customer_ids": [9]})
+    assert response.status_code == 404
+    store.close()
+
+
+def test_predict_by_id_without_online_store(client: TestClient):
+    response = client.post("/predict/by-id", json={"customer_ids": [7]})
+
+    assert response.status_code == 503
+
+
+def test_model_version(client: TestClient):
+    response = client.get("/model/version")
+
+    assert response.status_code == 200
+    response_data = response.json()
+    assert response_data["version"] == "test-digest"
+    assert response_data["previous_version"] is None
+
+
+def test_model_rollback_without_previous_version(client: TestClient):
+    response = client.post("/model/rollback")
+
+    assert response.status_code == 409
+
+
+def test_metrics_exposes_stage_timings(client: TestClient):
+    client.post("/predict", json={})
+
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    for stage in ("validate", "assemble", "encode", "infer"):
+        assert (
+            f'churn_predict_stage_seconds_count{{endpoint="predict",stage="{stage}"}}'
+            in response.text
+        )
+    assert "http_request_duration_seconds" in response.text
@@ -0,0 +1,90 @@
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+from fastapi.testclient import TestClient
+from sklearn.preprocessing import OneHotEncoder
+from xgboost import XGBClassifier
+
+from src.api import main, serve
+from src.api.main import app
+from src.api.model_store import SHARED_MODEL_DIR_ENV
+from src.api.schemas import PredictionInput
+from src.config import config
+from src.inference.trees import TreeEnsemble
+
+CATEGORICAL_COLS = ["gender", "subscription_type", "contract_length"]
+
+
+def write_artifacts(model_dir: Path):
+    rng = np.random.default_rng(0)
+    n_rows = 300
+    df = pd.DataFrame([PredictionInput().model_dump()] * n_rows).assign(
+        age=rng.integers(18, 70, n_rows),
+        support_calls=rng.integers(0, 10, n_rows),
+        gender=rng.choice(["Male", "Female"], n_rows),
+        subscription_type=rng.choice(["Basic", "Premium", "Standard"], n_rows),
+        contract_length=rng.choice(["Monthly", "Annual", "Quarterly"], n_rows),
+    )
+    numerical_cols = [col for col in df.columns if col not in CATEGORICAL_COLS]
+    encoder = OneHotEncoder(handle_unknown="ignore", sparse_output=False, drop="first")
+    encoder.fit(df[CATEGORICAL_COLS])
+    feature_names_out = encoder.get_feature_names_out(CATEGORICAL_COLS).tolist()
+    X = df[numerical_cols].join(
+        pd.DataFrame(encoder.transform(df[CATEGORICAL_COLS]), columns=feature_names_out)
+    )
+    y = (df["support_calls"] > 4).astype(int)
+
+    XGBClassifier(n_estimators=10, max_depth=3).fit(X, y).save_model(
+        model_dir / "model.json"
+    )
+    joblib.dump(
+        {
+            "encoder": encoder,
+            "categorical_cols": CATEGORICAL_COLS,
+            "numerical_cols": numerical_cols,
+            "feature_names_out": feature_names_out,
+        },
+        model_dir / "preprocessor.joblib",
+    )
+
+
+def test_workers_serve_the_exported_shared_model(tmp_path: Path, monkeypatch):
+    model_dir = tmp_path / "models"
+    shared_dir = tmp_path / "shared"
+    model_dir.mkdir()
+    shared_dir.mkdir()
+    write_artifacts(model_dir)
+    monkeypatch.setattr(config.api, "model_source", "local")
+    monkeypatch.setattr(config.api, "local_model_dir", model_dir)
+
+    version = serve.export_shared_model(shared_dir)
+    monkeypatch.setenv(SHARED_MODEL_DIR_ENV, str(shared_dir))
+    records = [PredictionInput(support_calls=calls).model_dump() for calls in (1, 9)]
+
+    with TestClient(app) as client:
+        assert client.get("/model/version").json()["version"] == version
+        bundle = main.store.current
+        assert isinstance(bundle.model, TreeEnsemble)
+        assert bundle.explainer._explainer is None
+        batch = client.post(
+            "/predict/batch", params={"explain": True}, json={"records": records}
+        ).json()
+
+    # Native scores of the memory-mapped trees match the exported XGBoost model.
+    model = XGBClassifier()
+    model.load_model(shared_dir / "model.json")
+    encoder = joblib.load(shared_dir / "preprocessor.joblib")["encoder"]
+    df = pd.DataFrame(records)
+    X = df.drop(columns=CATEGORICAL_COLS).join(
+        pd.DataFrame(
+            encoder.transform(df[CATEGORICAL_COLS]),
+            columns=encoder.get_feature_names_out(CATEGORICAL_COLS),
+        )
+    )
+    np.testing.assert_allclose(
+        batch["probabilities"], model.predict_proba(X)[:, 1], atol=1e-6
+    )
+    assert batch["predictions"] == [0, 1]
+    assert batch["explanations"][1][0]["feature"] == "support_calls"
@@ -0,0 +1,64 @@
+import os
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from src.inference.artifacts import ArtifactCache, load_model_artifact
+
+
+def _write_model(size: int):
+    def download(root: Path):
+        (root / "model.json").write_bytes(b"x" * size)
+
+    return download
+
+
+def test_artifact_cache_evicts_least_recently_used(tmp_path: Path):
+    cache = ArtifactCache(tmp_path, max_bytes=250)
+
+    cache.put("v1", _write_model(100))
+    cache.put("v2", _write_model(100))
+    os.utime(cache.root / "v1" / ".complete", (0, 0))
+    os.utime(cache.root / "v2" / ".complete", (1, 1))
+    assert cache.get("v1") is not None  # touching v1 makes v2 the oldest entry
+
+    cache.put("v3", _write_model(100))
+
+    assert cache.get("v2") is None
+    assert (cache.get("v1") / "model.json").exists()
+    assert (cache.get("v3") / "model.json").exists()
+
+
+def test_artifact_cache_keeps_an_entry_published_during_download(tmp_path: Path):
+    cache = ArtifactCache(tmp_path, max_bytes=10_000)
+
+    def download(root: Path):
+        # Another worker publishes the same digest while this one downloads.
+        cache.put("v1", _write_model(10))
+        (root / "model.json").write_bytes(b"y" * 10)
+
+    published = cache.put("v1", download)
+
+    assert published == cache.get("v1")
+    assert (published / "model.json").read_bytes() == b"x" * 10
+    assert [path.name for path in tmp_path.iterdir()] == ["v1"]
+
+
+def test_load_model_artifact_uses_cache_and_falls_back_offline(tmp_path: Path):
+    cache = ArtifactCache(tmp_path, max_bytes=10_000)
+    artifact = MagicMock(digest="abc")
+    artifact.download.side_effect = lambda root: _write_model(10)(Path(root))
+
+    with patch("src.inference.artifacts.wandb") as mock_wandb:
+        mock_wandb.Api.return_value.artifact.return_value = artifact
+
+        first = load_model_artifact(cache, "model")
+        second = load_model_artifact(cache, "model")
+
+        mock_wandb.Api.return_value.artifact.side_effect = TimeoutError
+        fallback = load_model_artifact(cache, "model")
+
+    assert not first.from_cache
+    assert second.from_cache and second.download_seconds == 0.0
+    assert artifact.download.call_count == 1
+    assert fallback.digest == "abc"
+    assert load_model_artifact(cache, "model", offline=True).path == first.path
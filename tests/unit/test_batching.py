@@ -0,0 +1,65 @@
+import asyncio
+import time
+
+import pytest
+
+from src.api.batching import MicroBatcher
+
+
+def test_micro_batcher_coalesces_concurrent_requests():
+    batch_sizes = []
+
+    def score_batch(items: list[int]) -> tuple[str, list[float]]:
+        batch_sizes.append(len(items))
+        return f"v{len(batch_sizes)}", [item / 10 for item in items]
+
+    async def run():
+        batcher = MicroBatcher(score_batch, max_batch_size=4, max_delay_ms=50)
+        await batcher.start()
+        results = await asyncio.gather(*(batcher.submit(i) for i in range(6)))
+        await batcher.stop()
+        return results
+
+    results = asyncio.run(run())
+
+    assert [model for model, _ in results] == ["v1"] * 4 + ["v2"] * 2
+    assert [p for _, p in results] == pytest.approx([0.0, 0.1, 0.2, 0.3, 0.4, 0.5])
+    assert batch_sizes == [4, 2]
+
+
+def test_micro_batcher_propagates_errors():
+    def score_batch(items: list) -> tuple[str, list[float]]:
+        raise RuntimeError("booster failure")
+
+    async def run():
+        batcher = MicroBatcher(score_batch, max_batch_size=8, max_delay_ms=1)
+        await batcher.start()
+        try:
+            await batcher.submit({"age": 30})
+        finally:
+            await batcher.stop()
+
+    with pytest.raises(RuntimeError, match="booster failure"):
+        asyncio.run(run())
+
+
+def test_micro_batcher_stop_fails_queued_requests():
+    def score_batch(items: list) -> tuple[str, list[float]]:
+        time.sleep(0.2)
+        return "v1", [0.5] * len(items)
+
+    async def run():
+        # The first request is being scored and the other two are still queued.
+        batcher = MicroBatcher(score_batch, max_batch_size=1, max_delay_ms=1)
+        await batcher.start()
+        pending = [asyncio.create_task(batcher.submit(i)) for i in range(3)]
+        await asyncio.sleep(0.01)
+        await batcher.stop()
+        return await asyncio.wait_for(
+            asyncio.gather(*pending, return_exceptions=True), timeout=1
+        )
+
+    results = asyncio.run(run())
+
+    assert len(results) == 3
+    assert all(isinstance(result, RuntimeError) for result in results)
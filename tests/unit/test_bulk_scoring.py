@@ -0,0 +1,114 @@
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+from xgboost import XGBClassifier
+
+from src.data_io import read_table
+from src.pipeline.bulk_scoring import MANIFEST_FILE, bulk_score, plan_blocks
+from src.pipeline.feature_engineering import encode_frame, fit_preprocessor
+
+
+@pytest.fixture
+def raw_customers() -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    n_rows = 3_000
+    return pd.DataFrame(
+        {
+            "CustomerID": np.arange(1, n_rows + 1),
+            "Age": rng.integers(18, 65, n_rows),
+            "Gender": rng.choice(["Female", "Male"], n_rows),
+            "Contract Length": rng.choice(["Annual", "Monthly", "Quarterly"], n_rows),
+            "Total Spend": np.round(rng.uniform(100, 1000, n_rows), 2),
+        }
+    )
+
+
+@pytest.fixture
+def model_dir(raw_customers: pd.DataFrame, tmp_path: Path) -> Path:
+    df = raw_customers.drop(columns=["CustomerID"])
+    df.columns = ["age", "gender", "contract_length", "total_spend"]
+    df["churn"] = ((df["contract_length"] == "Monthly") | (df["age"] > 50)).astype(int)
+    preprocessor = fit_preprocessor(df.drop(columns=["churn"]))
+    X = encode_frame(df, preprocessor, "churn").drop(columns=["churn"])
+    model = XGBClassifier(n_estimators=10, max_depth=3).fit(X, df["churn"])
+
+    model_dir = tmp_path / "model"
+    model_dir.mkdir()
+    model.save_model(model_dir / "model.json")
+    joblib.dump(preprocessor, model_dir / "preprocessor.joblib")
+    return model_dir
+
+
+def expected_probabilities(model_dir: Path, raw: pd.DataFrame) -> np.ndarray:
+    preprocessor = joblib.load(model_dir / "preprocessor.joblib")
+    df = raw.drop(columns=["CustomerID"])
+    df.columns = ["age", "gender", "contract_length", "total_spend"]
+    df["churn"] = 0
+    X = encode_frame(df, preprocessor, "churn").drop(columns=["churn"])
+    model = XGBClassifier()
+    model.load_model(model_dir / "model.json")
+    return model.predict_proba(X)[:, 1]
+
+
+def test_bulk_score_csv_blocks_keep_input_order(
+    raw_customers: pd.DataFrame, model_dir: Path, tmp_path: Path
+):
+    input_path = tmp_path / "customers.csv"
+    raw_customers.to_csv(input_path, index=False)
+    output_dir = tmp_path / "scores"
+
+    rows = bulk_score(
+        input_path,
+        output_dir,
+        model_dir=model_dir,
+        n_jobs=2,
+        chunk_size=200,
+        block_bytes=4_096,
+    )
+
+    scores = read_table(output_dir)
+    assert rows == len(scores) == len(raw_customers)
+    assert len(plan_blocks(input_path, 200, 4_096)) > 10
+    assert (
+        scores["customer_id"].tolist()
+        == raw_customers["CustomerID"].astype(str).tolist()
+    )
+    np.testing.assert_allclose(
+        scores["probability"],
+        expected_probabilities(model_dir, raw_customers),
+        rtol=1e-6,
+    )
+    assert scores["prediction"].tolist() == (scores["probability"] > 0.5).tolist()
+    assert not (output_dir / ".tmp").exists()
+    assert (output_dir / MANIFEST_FILE).exists()
+
+
+def test_bulk_score_parquet_partitions(
+    raw_customers: pd.DataFrame, model_dir: Path, tmp_path: Path
+):
+    input_dir = tmp_path / "customers"
+    input_dir.mkdir()
+    raw_customers[:1_000].to_parquet(input_dir / "0.parquet", row_group_size=300)
+    raw_customers[1_000:].to_parquet(input_dir / "1.parquet", row_group_size=300)
+    output_dir = tmp_path / "scores"
+    (output_dir / "part-00099.parquet").parent.mkdir()
+    (output_dir / "part-00099.parquet").write_bytes(b"stale")
+
+    bulk_score(input_dir, output_dir, model_dir=model_dir, n_jobs=1, chunk_size=500)
+
+    scores = read_table(output_dir)
+    assert len(list(output_dir.glob("part-*"))) == 6
+    np.testing.assert_allclose(
+        scores["probability"],
+        expected_probabilities(model_dir, raw_customers),
+        rtol=1e-6,
+    )
+
+    raw_customers.drop(columns=["Total Spend"]).to_csv(
+        tmp_path / "partial.csv", index=False
+    )
+    with pytest.raises(ValueError, match="total_spend"):
+        bulk_score(tmp_path / "partial.csv", output_dir, model_dir=model_dir)
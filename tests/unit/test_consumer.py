@@ -0,0 +1,115 @@
+import json
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+from kafka.errors import KafkaTimeoutError
+
+from src.streaming.brokers import FileBroker, KafkaBroker, MemoryBroker
+from src.streaming.consumer import ScoringWorker
+
+
+class FakeEncoder:
+    def encode_batch(self, records: list[dict]) -> np.ndarray:
+        return np.array([record["support_calls"] for record in records])
+
+
+def fake_bundle():
+    return SimpleNamespace(
+        version="v1",
+        encoder=FakeEncoder(),
+        predict_proba=lambda features: features / 10,
+    )
+
+
+def publish(broker, events: list):
+    for i, event in enumerate(events):
+        value = event if isinstance(event, bytes) else json.dumps(event).encode()
+        broker.produce("events", f"customer-{i}".encode(), value)
+
+
+def outputs(broker: MemoryBroker, topic: str) -> list[tuple[bytes, dict]]:
+    return [(key, json.loads(value)) for key, value in broker.topics[topic]]
+
+
+def test_worker_scores_batches_and_dead_letters_invalid_events():
+    broker = MemoryBroker("events", "scoring")
+    publish(broker, [{"support_calls": 9}, b"not json", {"support_calls": 1}])
+    worker = ScoringWorker(
+        broker, fake_bundle(), "scores", "dead", max_batch_size=2, max_delay_ms=1
+    )
+
+    stats = worker.run(max_events=3, report_interval_s=60)
+
+    assert stats.events == 3 and stats.batches == 2 and stats.lag == 0
+    assert [
+        (key, result["prediction"]) for key, result in outputs(broker, "scores")
+    ] == [
+        (b"customer-0", 1),
+        (b"customer-2", 0),
+    ]
+    assert outputs(broker, "scores")[1][1]["probability"] == pytest.approx(0.1)
+    assert broker.topics["dead"] == [(b"customer-1", b"not json")]
+    assert broker.committed["scoring", "events"] == 3
+
+
+def test_uncommitted_events_are_replayed_after_a_crash():
+    broker = MemoryBroker("events", "scoring")
+    publish(broker, [{"support_calls": calls} for calls in range(4)])
+    worker = ScoringWorker(
+        broker, fake_bundle(), "scores", "dead", max_batch_size=2, max_delay_ms=1
+    )
+    worker.process(worker.next_batch())
+
+    broker.poll(2, 0)  # polled, then the worker dies before committing
+    broker.rewind()
+    worker.run(max_events=4, report_interval_s=60)
+
+    offsets = [result["offset"] for _, result in outputs(broker, "scores")]
+    assert offsets == [0, 1, 2, 3]
+
+
+def test_file_broker_resumes_from_committed_offset(tmp_path: Path):
+    producer = FileBroker(tmp_path, "scores", "unused")
+    publish(producer, [{"support_calls": calls} for calls in range(5)])
+    producer.flush()
+    producer.close()
+
+    broker = FileBroker(tmp_path, "events", "scoring")
+    assert broker.lag() == 5
+    worker = ScoringWorker(
+        broker, fake_bundle(), "scores", "dead", max_batch_size=3, max_delay_ms=1
+    )
+    worker.process(worker.next_batch())
+    broker.close()
+
+    broker = FileBroker(tmp_path, "events", "scoring")
+    assert broker.lag() == 2
+    assert [message.offset for message in broker.poll(10, 0)] == [3, 4]
+    broker.close()
+
+
+def test_kafka_broker_does_not_commit_after_a_failed_send():
+    with (
+        patch("src.streaming.brokers.KafkaConsumer") as consumer_class,
+        patch("src.streaming.brokers.KafkaProducer") as producer_class,
+    ):
+        broker = KafkaBroker("localhost:9092", "events", "scoring")
+    consumer, producer = consumer_class.return_value, producer_class.return_value
+    consumer.poll.return_value = {
+        "events-0": [SimpleNamespace(key=b"c", value=b'{"age": 40}', offset=0)]
+    }
+    failed = MagicMock()
+    failed.get.side_effect = KafkaTimeoutError("delivery timed out")
+    producer.send.return_value = failed
+    worker = ScoringWorker(
+        broker, fake_bundle(), "scores", "dead", max_batch_size=1, max_delay_ms=1
+    )
+
+    with pytest.raises(KafkaTimeoutError):
+        worker.process(worker.next_batch())
+
+    producer.flush.assert_called_once()
+    consumer.commit.assert_not_called()
@@ -1,7 +1,10 @@
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
+import pytest
 
+from src.data_io import read_table
 from src.pipeline.data_cleaning import clean_data
 
 
@@ -40,3 +43,56 @@ def test_clean_data(tmp_path: Path):
 
     assert len(cleaned_df) == 3
     assert cleaned_df["some_column"].tolist() == ["A", "B", "C"]
+
+
+@pytest.mark.parametrize("output_name", ["cleaned.parquet", "cleaned.csv"])
+def test_clean_data_streaming_matches_in_memory(tmp_path: Path, output_name: str):
+    rng = np.random.default_rng(0)
+    n_rows = 1_000
+    raw_data_path = tmp_path / "raw.csv"
+    pd.DataFrame(
+        {
+            "CustomerID": np.arange(n_rows),
+            "Age": rng.integers(18, 70, n_rows),
+            "Subscription Type": rng.choice(["Basic", "Standard", "Premium"], n_rows),
+            "Total Spend": rng.random(n_rows) * 1_000,
+            "Churn": rng.integers(0, 2, n_rows),
+        }
+    ).to_csv(raw_data_path, index=False)
+
+    in_memory_path = tmp_path / "in_memory" / output_name
+    streamed_path = tmp_path / "streamed" / output_name
+    in_memory_path.parent.mkdir()
+    streamed_path.parent.mkdir()
+
+    clean_data(raw_data_path, in_memory_path, "customerid", chunk_size=None)
+    clean_data(raw_data_path, streamed_path, "customerid", chunk_size=64)
+
+    pd.testing.assert_frame_equal(read_table(streamed_path), read_table(in_memory_path))
+
+
+@pytest.mark.parametrize("output_name", ["cleaned.parquet", "cleaned.csv"])
+def test_clean_data_streaming_keeps_first_chunk_schema(
+    tmp_path: Path, output_name: str
+):
+    raw_data_path = tmp_path / "raw.csv"
+    raw_data_path.write_text(
+        "CustomerID,Age,Gender,Total Spend\n1,30,Male,100\n2,40,Female,200.5\n3,,,7\n"
+    )
+    output_path = tmp_path / output_name
+
+    clean_data(raw_data_path, output_path, "customerid", chunk_size=2)
+
+    if output_name.endswith(".csv"):
+        assert output_path.read_text().splitlines() == [
+            "age,gender,total_spend",
+            "30,Male,100.0",
+            "40,Female,200.5",
+            ",,7.0",
+        ]
+    cleaned = read_table(output_path)
+    assert cleaned["age"].iloc[:2].tolist() == [30, 40]
+    assert cleaned["age"].isna().iloc[2]
+    assert cleaned["gender"].iloc[:2].tolist() == ["Male", "Female"]
+    assert cleaned["gender"].isna().iloc[2]
+    assert cleaned["total_spend"].tolist() == [100.0, 200.5, 7.0]
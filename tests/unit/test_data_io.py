@@ -0,0 +1,44 @@
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from src.data_io import data_file, find_data_file, read_columns, read_table, write_table
+
+
+@pytest.mark.parametrize("data_format", ["parquet", "csv"])
+def test_round_trip(tmp_path: Path, data_format: str):
+    df = pd.DataFrame(
+        {
+            "age": [30, 41, 52],
+            "total_spend": [10.5, 20.25, 30.0],
+            "gender": ["Male", "Female", "Male"],
+        }
+    )
+    path = data_file(tmp_path, "train", data_format)
+    write_table(df, path)
+
+    assert find_data_file(tmp_path, "train") == path
+    assert read_columns(path) == ["age", "total_spend", "gender"]
+    pd.testing.assert_frame_equal(read_table(path), df)
+    pd.testing.assert_frame_equal(
+        read_table(path, columns=["age", "gender"]), df[["age", "gender"]]
+    )
+
+
+def test_parquet_keeps_dtypes(tmp_path: Path):
+    df = pd.DataFrame(
+        {
+            "tenure": pd.Series([1, 2], dtype="int32"),
+            "subscription_type": pd.Categorical(["Basic", "Premium"]),
+        }
+    )
+    path = data_file(tmp_path, "cleaned", "parquet")
+    write_table(df, path)
+
+    assert read_table(path).dtypes.to_dict() == df.dtypes.to_dict()
+
+
+def test_find_data_file_missing(tmp_path: Path):
+    with pytest.raises(FileNotFoundError):
+        find_data_file(tmp_path, "train")
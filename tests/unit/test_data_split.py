@@ -21,6 +21,7 @@ def test_split_data(tmp_path: Path):
         target_column="churn",
         test_size=0.2,
         random_state=42,
+        data_format="csv",
     )
 
     train_path = split_data_dir / "train.csv"
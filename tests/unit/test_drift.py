@@ -0,0 +1,100 @@
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.api.drift_monitor import DriftMonitor
+from src.inference.drift import PROBABILITY, DriftProfile, NumericSketch
+
+
+def traffic(n_rows: int, seed: int, age_shift: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame(
+        {
+            "age": rng.integers(18, 65, n_rows) + age_shift,
+            "total_spend": rng.uniform(100, 1000, n_rows),
+            "gender": rng.choice(["Female", "Male"], n_rows),
+        }
+    )
+
+
+@pytest.fixture
+def reference() -> DriftProfile:
+    profile = DriftProfile.fit(traffic(20_000, seed=0), n_bins=10)
+    profile.sketches[PROBABILITY] = NumericSketch.fit(
+        pd.Series(np.random.default_rng(0).random(20_000)), n_bins=10
+    )
+    return profile
+
+
+def test_profile_detects_shift_and_merges_exactly(reference: DriftProfile):
+    same = reference.empty()
+    for record in traffic(5_000, seed=1).to_dict("records"):
+        same.update(record)
+    shifted = reference.empty()
+    shifted.update_frame(traffic(5_000, seed=2, age_shift=15))
+
+    same_report = same.compare(reference)
+    assert max(field["psi"] for field in same_report.values() if field["count"]) < 0.02
+    shifted_report = shifted.compare(reference)
+    assert shifted_report["age"]["psi"] > 0.5 and shifted_report["age"]["ks"] > 0.2
+    assert shifted_report["gender"]["psi"] < 0.02
+
+    merged = DriftProfile.from_dict(same.to_dict())
+    merged.merge(shifted)
+    assert merged.count() == 10_000
+    assert merged.sketches["age"].counts == [
+        a + b
+        for a, b in zip(same.sketches["age"].counts, shifted.sketches["age"].counts)
+    ]
+
+    with pytest.raises(ValueError):
+        same.merge(DriftProfile.fit(traffic(100, seed=3), n_bins=4))
+
+
+def test_monitor_merges_worker_sketches(reference: DriftProfile, tmp_path: Path):
+    bundle = SimpleNamespace(version="v1", reference_profile=reference)
+    workers = []
+    for worker in range(2):
+        monitor = DriftMonitor(
+            tmp_path, flush_interval_s=60, psi_threshold=0.2, stale_after_s=600
+        )
+        monitor.worker_id = str(worker)
+        records = traffic(2_000, seed=worker, age_shift=15).to_dict("records")
+        monitor.observe(bundle, records, np.random.default_rng(worker).random(2_000))
+        workers.append(monitor)
+    workers[0].flush()
+
+    report = workers[1].report()
+
+    assert report["count"] == 4_000
+    assert report["drifted"] == ["age"]
+    assert report["fields"][PROBABILITY]["count"] == 4_000
+
+    workers[1].observe(SimpleNamespace(version="v2", reference_profile=reference), [])
+    assert workers[1].report()["count"] == 0
+    assert not workers[1].path("v1").exists()
+
+
+def test_monitor_drops_sketches_of_stopped_workers(
+    reference: DriftProfile, tmp_path: Path
+):
+    bundle = SimpleNamespace(version="v1", reference_profile=reference)
+    stopped = DriftMonitor(
+        tmp_path, flush_interval_s=60, psi_threshold=0.2, stale_after_s=600
+    )
+    stopped.worker_id = "stopped"
+    stopped.observe(bundle, traffic(1_000, seed=0).to_dict("records"))
+    with patch("src.api.drift_monitor.time.time", return_value=time.time() - 3_600):
+        stopped.flush()
+    live = DriftMonitor(
+        tmp_path, flush_interval_s=60, psi_threshold=0.2, stale_after_s=600
+    )
+    live.observe(bundle, traffic(500, seed=1).to_dict("records"))
+
+    assert live.report()["count"] == 500
+    assert not stopped.path("v1").exists()
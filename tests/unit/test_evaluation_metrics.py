@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+from sklearn.metrics import f1_score, precision_score, recall_score, roc_auc_score
+
+from src.pipeline.evaluation_metrics import (
+    bootstrap_intervals,
+    rank_auc,
+    threshold_sweep,
+)
+
+
+@pytest.fixture
+def scores() -> tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(0)
+    y_true = rng.integers(0, 2, 5_000)
+    y_score = np.clip(rng.normal(0.3 + 0.3 * y_true, 0.25), 0, 1).round(3)
+    return y_true, y_score
+
+
+def test_rank_auc_matches_sklearn_with_ties(scores):
+    y_true, y_score = scores
+    assert rank_auc(y_true, y_score) == pytest.approx(roc_auc_score(y_true, y_score))
+
+
+def test_threshold_sweep_matches_per_threshold_metrics(scores):
+    y_true, y_score = scores
+    sweep = threshold_sweep(y_true, y_score)
+
+    assert len(sweep) == len(np.unique(y_score))
+    assert sweep["threshold"].is_monotonic_decreasing
+    for _, row in sweep.sample(20, random_state=0).iterrows():
+        y_pred = y_score >= row["threshold"]
+        assert row["precision"] == pytest.approx(precision_score(y_true, y_pred))
+        assert row["recall"] == pytest.approx(recall_score(y_true, y_pred))
+        assert row["f1_score"] == pytest.approx(f1_score(y_true, y_pred))
+    assert (sweep[["tp", "fp", "fn", "tn"]].sum(axis=1) == len(y_true)).all()
+
+
+def test_bootstrap_intervals(scores):
+    y_true, y_score = scores
+    intervals = bootstrap_intervals(y_true, y_score, threshold=0.5, n_bootstrap=500)
+
+    y_pred = y_score > 0.5
+    assert intervals["estimate"].to_dict() == pytest.approx(
+        {
+            "roc_auc": roc_auc_score(y_true, y_score),
+            "precision": precision_score(y_true, y_pred),
+            "recall": recall_score(y_true, y_pred),
+            "f1_score": f1_score(y_true, y_pred),
+        }
+    )
+    assert (intervals["lower"] < intervals["estimate"]).all()
+    assert (intervals["estimate"] < intervals["upper"]).all()
+    assert (intervals["upper"] - intervals["lower"] < 0.05).all()
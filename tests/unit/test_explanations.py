@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+from xgboost import XGBClassifier
+
+from src.inference.explanations import Explainer
+from src.inference.preprocessing import FeatureEncoder
+from src.pipeline.feature_engineering import encode_frame, fit_preprocessor
+
+
+def test_explainer_groups_one_hot_contributions_by_input_field():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(
+        {
+            "age": rng.integers(18, 65, 1_000),
+            "total_spend": rng.uniform(100, 1000, 1_000),
+            "contract_length": rng.choice(["Annual", "Monthly", "Quarterly"], 1_000),
+            "gender": rng.choice(["Female", "Male"], 1_000),
+        }
+    )
+    df["churn"] = ((df["contract_length"] == "Monthly") | (df["age"] > 55)).astype(int)
+    preprocessor = fit_preprocessor(df.drop(columns=["churn"]))
+    X = encode_frame(df, preprocessor, "churn").drop(columns=["churn"])
+    model = XGBClassifier(n_estimators=20, max_depth=3).fit(X, df["churn"])
+    booster = model.get_booster()
+    explainer = Explainer(booster, preprocessor, booster.feature_names)
+    features = FeatureEncoder(preprocessor, booster.feature_names).encode_batch(
+        df.drop(columns=["churn"]).head(50).to_dict("records")
+    )
+
+    grouped, bias = explainer.contributions(features)
+    explanations = explainer.explain(features, top_k=2)
+
+    assert explainer.fields == ["age", "total_spend", "contract_length", "gender"]
+    raw = booster.predict(
+        xgb.DMatrix(features, feature_names=booster.feature_names), pred_contribs=True
+    )
+    contract_columns = [
+        i for i, name in enumerate(booster.feature_names) if name.startswith("contr")
+    ]
+    np.testing.assert_allclose(grouped[:, 2], raw[:, contract_columns].sum(axis=1))
+    np.testing.assert_allclose(
+        grouped.sum(axis=1) + bias,
+        model.predict(features, output_margin=True),
+        rtol=1e-5,
+        atol=1e-5,
+    )
+    assert all(len(explanation) == 2 for explanation in explanations)
+    for row, explanation in zip(grouped, explanations):
+        magnitudes = [abs(driver["contribution"]) for driver in explanation]
+        assert magnitudes == sorted(np.abs(row), reverse=True)[:2]
+    assert len(explainer.explain(features[:1], top_k=10)[0]) == 4
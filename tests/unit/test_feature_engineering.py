@@ -1,9 +1,15 @@
+import json
 from pathlib import Path
 
 import joblib
+import numpy as np
 import pandas as pd
 
-from src.pipeline.feature_engineering import feature_engineering
+from src.pipeline.feature_engineering import (
+    encode_features,
+    feature_engineering,
+    incremental_feature_engineering,
+)
 
 
 def test_feature_engineering(tmp_path: Path):
@@ -43,6 +49,7 @@ def test_feature_engineering(tmp_path: Path):
         output_path=features_dir,
         target_column="churn",
         model_dir=model_dir,
+        data_format="csv",
     )
 
     train_featured_path = features_dir / "train.csv"
@@ -67,3 +74,118 @@ def test_feature_engineering(tmp_path: Path):
     assert preprocessor["categorical_cols"] == ["cat_feat"]
 
     src.config.MODEL_DIR = original_model_dir
+
+
+def test_encode_features_uses_compact_dtypes():
+    train_df = pd.DataFrame(
+        {
+            "age": [18, 65, 30],
+            "total_spend": [100.5, 999.99, 250.0],
+            "cat_feat": ["A", "B", "A"],
+            "churn": [0, 1, 0],
+        }
+    )
+    test_df = pd.DataFrame(
+        {
+            "age": [300, 40, 50],
+            "total_spend": [10.0, 20.0, 30.0],
+            "cat_feat": ["B", "C", "A"],
+            "churn": [1, 0, 1],
+        }
+    )
+
+    train_featured, test_featured, _ = encode_features(train_df, test_df, "churn")
+
+    for featured, original in ((train_featured, train_df), (test_featured, test_df)):
+        assert featured.dtypes.to_dict() == {
+            "age": np.uint16,
+            "total_spend": np.float32,
+            "cat_feat_B": np.uint8,
+            "churn": np.uint8,
+        }
+        assert featured["age"].tolist() == original["age"].tolist()
+    assert test_featured["cat_feat_B"].tolist() == [1, 0, 0]
+
+
+def test_incremental_feature_engineering(tmp_path: Path):
+    split_dir = tmp_path / "split"
+    features_dir = tmp_path / "features"
+    model_dir = tmp_path / "models"
+    for directory in (split_dir / "train", split_dir / "test", model_dir):
+        directory.mkdir(parents=True)
+
+    def write_partition(split: str, name: str, cats: list[str]):
+        pd.DataFrame(
+            {"num_feat": range(len(cats)), "cat_feat": cats, "churn": [0, 1] * 2}
+        ).to_parquet(split_dir / split / f"{name}.parquet")
+
+    def run() -> list[str]:
+        return incremental_feature_engineering(
+            split_dir, features_dir, "churn", model_dir, "parquet"
+        )
+
+    write_partition("train", "2024-01", ["A", "B", "A", "B"])
+    write_partition("test", "2024-01", ["B", "A", "C", "A"])
+    assert run() == ["train/2024-01", "test/2024-01"]
+    assert run() == []
+
+    # Known categories only: the new partition is encoded with the same encoder.
+    manifest_path = features_dir / "manifest.json"
+    version = json.loads(manifest_path.read_text())["preprocessor"]
+    write_partition("train", "2024-02", ["B", "B", "A", "A"])
+    assert run() == ["train/2024-02"]
+    assert json.loads(manifest_path.read_text())["preprocessor"] == version
+
+    # A new category refits the encoder and re-encodes every partition.
+    write_partition("train", "2024-03", ["A", "C", "B", "C"])
+    assert sorted(run()) == [
+        "test/2024-01",
+        "train/2024-01",
+        "train/2024-02",
+        "train/2024-03",
+    ]
+    preprocessor = joblib.load(model_dir / "preprocessor.joblib")
+    assert preprocessor["feature_names_out"] == ["cat_feat_B", "cat_feat_C"]
+    test_featured = pd.read_parquet(features_dir / "test" / "2024-01.parquet")
+    assert test_featured["cat_feat_C"].tolist() == [0, 0, 1, 0]
+    assert len(pd.read_parquet(features_dir / "train")) == 12
+
+    (split_dir / "train" / "2024-01.parquet").unlink()
+    assert run() == []
+    assert not (features_dir / "train" / "2024-01.parquet").exists()
+
+
+def test_incremental_feature_engineering_keeps_one_schema(tmp_path: Path):
+    split_dir = tmp_path / "split"
+    features_dir = tmp_path / "features"
+    model_dir = tmp_path / "models"
+    for directory in (split_dir / "train", split_dir / "test", model_dir):
+        directory.mkdir(parents=True)
+
+    def write_partition(split: str, name: str, num_feat: list[int]):
+        pd.DataFrame(
+            {"num_feat": num_feat, "cat_feat": ["A", "B"] * 2, "churn": [0, 1] * 2}
+        ).to_parquet(split_dir / split / f"{name}.parquet")
+
+    def run() -> list[str]:
+        return incremental_feature_engineering(
+            split_dir, features_dir, "churn", model_dir, "parquet"
+        )
+
+    # Single-file features left behind by an earlier non-incremental run.
+    features_dir.mkdir()
+    pd.DataFrame({"num_feat": [1]}).to_parquet(features_dir / "test.parquet")
+
+    write_partition("train", "2024-01", [1, 2, 3, 4])
+    write_partition("test", "2024-01", [5, 6, 7, 8])
+    run()
+    assert not (features_dir / "test.parquet").exists()
+
+    # Values beyond uint8 widen the schema and rewrite the earlier partitions.
+    write_partition("train", "2024-02", [300, 1, 2, 3])
+    assert sorted(run()) == ["test/2024-01", "train/2024-01", "train/2024-02"]
+    schemas = {
+        tuple(pd.read_parquet(path).dtypes.astype(str))
+        for path in sorted(features_dir.glob("*/*.parquet"))
+    }
+    assert schemas == {("uint16", "uint8", "uint8")}
@@ -0,0 +1,68 @@
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from src.api import feature_lookup
+from src.api.feature_lookup import FeatureLookup
+from src.api.schemas import PredictionInput
+from src.pipeline.feature_materialization import materialize_features, open_store
+
+
+def write_partition(path: Path, ids: list[int], age: int):
+    rows = [
+        {"CustomerID": float(i), **PredictionInput(age=age).model_dump(), "Churn": 0}
+        for i in ids
+    ]
+    df = pd.DataFrame(rows).rename(columns={"total_spend": "Total Spend", "age": "Age"})
+    df.to_csv(path, index=False)
+
+
+def ages(store_path: Path, ids: list[int]) -> dict[str, int]:
+    store = open_store(store_path, readonly=True)
+    try:
+        return {key: row["age"] for key, row in store.get_many(ids).items()}
+    finally:
+        store.close()
+
+
+def test_materialization_is_incremental_and_keeps_latest_rows(tmp_path: Path):
+    source_dir = tmp_path / "raw"
+    source_dir.mkdir()
+    store_path = tmp_path / "features.db"
+
+    write_partition(source_dir / "2024-01.csv", [1, 2, 3], age=30)
+    assert materialize_features(source_dir, store_path) == 3
+    assert materialize_features(source_dir, store_path) == 0
+
+    write_partition(source_dir / "2024-02.csv", [3, 4], age=50)
+    assert materialize_features(source_dir, store_path) == 2
+    assert ages(store_path, [1, 3, 4, 5]) == {"1": 30, "3": 50, "4": 50}
+
+    # A rewritten earlier partition is reloaded before the newer one again.
+    write_partition(source_dir / "2024-01.csv", [1, 2, 3, 5], age=40)
+    assert materialize_features(source_dir, store_path) == 6
+    assert ages(store_path, [1, 3, 5]) == {"1": 40, "3": 50, "5": 40}
+
+    (source_dir / "2024-02.csv").unlink()
+    assert materialize_features(source_dir, store_path) == 4
+    assert ages(store_path, [3, 4]) == {"3": 40}
+
+
+def test_feature_lookup_serves_hot_rows_from_cache(tmp_path: Path, monkeypatch):
+    store = open_store(tmp_path / "features.db")
+    store.upsert(
+        pd.DataFrame([{"customer_id": 1, **PredictionInput(age=30).model_dump()}])
+    )
+    lookup = FeatureLookup(store, capacity=1, ttl_s=60)
+
+    assert lookup.get_many([1.0, 2])["1"]["age"] == 30
+    store.upsert(
+        pd.DataFrame([{"customer_id": 1, **PredictionInput(age=99).model_dump()}])
+    )
+    assert lookup.get_many(["1"])["1"]["age"] == 30
+
+    now = time.monotonic()
+    monkeypatch.setattr(feature_lookup.time, "monotonic", lambda: now + 61)
+    assert lookup.get_many([1])["1"]["age"] == 99
+    store.close()
@@ -0,0 +1,32 @@
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import yaml
+
+from src.config import PARAMS_FILE, Hyperparameters
+from src.pipeline.hyperparameter_tuning import tune_hyperparameters
+
+
+def test_tune_hyperparameters_writes_best_params(tmp_path: Path):
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(600, 3)), columns=["a", "b", "c"])
+    y = ((X["a"] + rng.normal(scale=0.5, size=600)) > 0).astype(int)
+    X.assign(churn=y).to_parquet(tmp_path / "train.parquet")
+    params_file = tmp_path / "params.yaml"
+    shutil.copy(PARAMS_FILE, params_file)
+
+    hyperparameters, trials_per_hour = tune_hyperparameters(
+        input_path=tmp_path,
+        target_column="churn",
+        n_trials=4,
+        n_jobs=2,
+        storage_path=tmp_path / "study.log",
+        params_file=params_file,
+    )
+
+    assert trials_per_hour > 0
+    assert 1 <= hyperparameters.n_estimators <= 300
+    written = yaml.safe_load(params_file.read_text())["hyperparameters"]
+    assert Hyperparameters(**written) == hyperparameters
@@ -0,0 +1,31 @@
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+from xgboost import XGBClassifier
+
+from src.pipeline import model_evaluation
+
+
+def test_evaluate_model_reads_partitioned_features(tmp_path: Path):
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(300, 2)), columns=["a", "b"])
+    y = (X["a"] > 0).astype(int)
+    model_path = tmp_path / "model.json"
+    XGBClassifier(n_estimators=5).fit(X, y).save_model(model_path)
+
+    features_dir = tmp_path / "features"
+    (features_dir / "test").mkdir(parents=True)
+    df = X.assign(churn=y)
+    df.iloc[:100].to_parquet(features_dir / "test" / "2024-01.parquet")
+    df.iloc[100:200].to_parquet(features_dir / "test" / "2024-02.parquet")
+    # A single-file output left behind by an earlier non-incremental run.
+    df.iloc[200:].to_parquet(features_dir / "test.parquet")
+
+    with patch.object(model_evaluation, "register_model") as register_model:
+        model_evaluation.evaluate_model(model_path, features_dir, "churn", "xgboost")
+
+    _, X_test, y_test, _ = register_model.call_args.args
+    pd.testing.assert_frame_equal(X_test, X.iloc[:200])
+    assert y_test.tolist() == y.iloc[:200].tolist()
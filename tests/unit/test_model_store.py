@@ -0,0 +1,96 @@
+import asyncio
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.preprocessing import OneHotEncoder
+from xgboost import XGBClassifier
+
+from src.api.model_store import LocalModelSource, ModelStore, load_bundle
+from src.api.reloader import ModelReloader
+
+CATEGORICAL_COLS = ["gender", "subscription_type", "contract_length"]
+NUMERICAL_COLS = [
+    "age",
+    "tenure",
+    "usage_frequency",
+    "support_calls",
+    "payment_delay",
+    "total_spend",
+    "last_interaction",
+]
+
+
+def _write_artifacts(model_dir: Path, seed: int):
+    rng = np.random.default_rng(seed)
+    n_rows = 200
+    df = pd.DataFrame(rng.integers(0, 100, size=(n_rows, 7)), columns=NUMERICAL_COLS)
+    df["gender"] = rng.choice(["Male", "Female"], n_rows)
+    df["subscription_type"] = rng.choice(["Basic", "Premium", "Standard"], n_rows)
+    df["contract_length"] = rng.choice(["Monthly", "Annual", "Quarterly"], n_rows)
+
+    encoder = OneHotEncoder(handle_unknown="ignore", sparse_output=False, drop="first")
+    encoder.fit(df[CATEGORICAL_COLS])
+    feature_names_out = encoder.get_feature_names_out(CATEGORICAL_COLS).tolist()
+    X = df[NUMERICAL_COLS].join(
+        pd.DataFrame(encoder.transform(df[CATEGORICAL_COLS]), columns=feature_names_out)
+    )
+    y = (df["support_calls"] > 50).astype(int)
+
+    XGBClassifier(n_estimators=5, random_state=seed).fit(X, y).save_model(
+        model_dir / "model.json"
+    )
+    joblib.dump(
+        {
+            "encoder": encoder,
+            "categorical_cols": CATEGORICAL_COLS,
+            "numerical_cols": NUMERICAL_COLS,
+            "feature_names_out": feature_names_out,
+        },
+        model_dir / "preprocessor.joblib",
+    )
+
+
+def test_reloader_swaps_validated_versions_and_rolls_back(tmp_path: Path):
+    _write_artifacts(tmp_path, seed=1)
+    source = LocalModelSource(tmp_path)
+    store = ModelStore()
+    store.swap(load_bundle(source.fetch()))
+    first_version = store.current.version
+    reloader = ModelReloader(store, source, poll_interval_s=60)
+
+    assert asyncio.run(reloader.reload()) is False
+
+    _write_artifacts(tmp_path, seed=2)
+    assert asyncio.run(reloader.reload()) is True
+    second_version = store.current.version
+    assert second_version != first_version
+    assert store.previous.version == first_version
+
+    assert store.rollback().version == first_version
+    # The rolled-back version is not picked up again by the next poll.
+    assert asyncio.run(reloader.reload()) is False
+    assert store.current.version == first_version
+
+    (tmp_path / "model.json").write_text("{}")
+    assert asyncio.run(reloader.reload()) is False
+    assert store.current.version == first_version
+    assert store.is_rejected(source.fetch().digest)
+
+
+def test_model_store_rollback_requires_previous_version():
+    with pytest.raises(LookupError):
+        ModelStore().rollback()
+
+
+def test_model_store_swap_clears_rejection():
+    store = ModelStore()
+    store.reject("v1")
+    assert store.is_rejected("v1")
+
+    store.swap(MagicMock(version="v1"))
+
+    assert not store.is_rejected("v1")
@@ -0,0 +1,84 @@
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+from xgboost import XGBClassifier
+
+from src.inference.trees import TreeEnsemble
+from src.pipeline import model_training
+
+
+def test_fit_model_external_memory(tmp_path: Path):
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(3_000, 4)), columns=["a", "b", "c", "d"])
+    y = ((X["a"] - X["b"] + rng.normal(scale=0.5, size=3_000)) > 0).astype(int)
+    df = X.assign(churn=y)
+    df.iloc[:2_500].to_parquet(tmp_path / "train.parquet")
+    df.iloc[2_500:].to_parquet(tmp_path / "test.parquet")
+    model_path = tmp_path / "model.json"
+
+    with (
+        patch.object(model_training, "start_run"),
+        patch.object(model_training, "wandb") as mock_wandb,
+    ):
+        booster = model_training.fit_model_external_memory(
+            tmp_path, "churn", model_path, batch_rows=400
+        )
+
+    metrics = mock_wandb.log.call_args.args[0]
+    assert metrics["roc_auc"] > 0.8
+    assert metrics["single_row_latency_ms"] > 0
+    assert booster.num_boosted_rounds() == model_training.booster_params()[1]
+
+    X_test = X.iloc[2_500:]
+    model = XGBClassifier()
+    model.load_model(model_path)
+    np.testing.assert_allclose(
+        model.predict_proba(X_test)[:, 1],
+        TreeEnsemble.load(model_path).predict_proba(X_test)[:, 1],
+        atol=1e-6,
+    )
+
+
+def test_fit_model_early_stopping_keeps_best_trees(tmp_path: Path, monkeypatch):
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(2_000, 3)), columns=["a", "b", "c"])
+    y = ((X["a"] + rng.normal(scale=1.0, size=2_000)) > 0).astype(int)
+    df = X.assign(churn=y)
+    model_path = tmp_path / "model.json"
+    monkeypatch.setattr(model_training.config.training, "validation_size", 0.2)
+    monkeypatch.setattr(model_training.config.training, "early_stopping_rounds", 5)
+
+    with (
+        patch.object(model_training, "start_run"),
+        patch.object(model_training, "wandb") as mock_wandb,
+    ):
+        model = model_training.fit_model(
+            df.iloc[:1_500], df.iloc[1_500:], "churn", model_path=model_path
+        )
+
+    metrics = mock_wandb.log.call_args.args[0]
+    n_estimators = model_training.config.hyperparameters.n_estimators
+    assert metrics["trees_kept"] < n_estimators
+    assert metrics["single_row_latency_ms"] > 0
+
+    saved = XGBClassifier()
+    saved.load_model(model_path)
+    assert saved.get_booster().num_boosted_rounds() == metrics["trees_kept"]
+    np.testing.assert_allclose(
+        saved.predict_proba(X.iloc[1_500:]), model.predict_proba(X.iloc[1_500:])
+    )
+
+
+def test_external_memory_rejects_other_tree_methods(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(model_training.config.training, "tree_method", "approx")
+
+    with (
+        patch.object(model_training, "start_run") as start_run,
+        pytest.raises(ValueError, match="only supports training.tree_method 'hist'"),
+    ):
+        model_training.fit_model_external_memory(tmp_path, "churn")
+
+    start_run.assert_not_called()
@@ -0,0 +1,28 @@
+from unittest.mock import patch
+
+from src.api.prediction_cache import PredictionCache
+
+
+def test_prediction_cache_lru_ttl_and_versions():
+    cache = PredictionCache(capacity=2, ttl_s=10)
+    records = [{"age": age, "gender": "Male"} for age in (30, 40, 50)]
+
+    with patch("src.api.prediction_cache.time.monotonic", return_value=0.0):
+        cache.put("v1", records[0], 0.9)
+        cache.put("v1", records[1], 0.1)
+        assert cache.get("v1", records[0]) == 0.9  # records[1] is now least recent
+        cache.put("v1", records[2], 0.7)
+
+        assert cache.get("v1", records[1]) is None
+        assert cache.get("v1", records[2]) == 0.7
+
+    with patch("src.api.prediction_cache.time.monotonic", return_value=11.0):
+        assert cache.get("v1", records[0]) is None
+
+    with patch("src.api.prediction_cache.time.monotonic", return_value=0.0):
+        cache.put("v1", records[0], 0.9)
+        assert cache.get("v2", records[0]) is None
+        # Requests on both sides of a swap keep each other's entries.
+        cache.put("v2", records[0], 0.2)
+        assert cache.get("v1", records[0]) == 0.9
+        assert cache.get("v2", records[0]) == 0.2
@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import OneHotEncoder
+from xgboost import XGBClassifier
+
+from src.inference.preprocessing import FeatureEncoder
+
+
+def _pandas_preprocess(preprocessor: dict, input_df: pd.DataFrame, ordered_cols):
+    encoded_df = pd.DataFrame(
+        preprocessor["encoder"].transform(input_df[preprocessor["categorical_cols"]]),
+        columns=preprocessor["feature_names_out"],
+        index=input_df.index,
+    )
+    processed_df = pd.concat(
+        [input_df[preprocessor["numerical_cols"]], encoded_df], axis=1
+    )
+    return processed_df[ordered_cols]
+
+
+def test_feature_encoder_matches_pandas_path():
+    train_df = pd.DataFrame(
+        {
+            "age": [25, 40, 33, 51, 62, 19],
+            "total_spend": [100.5, 250.25, 999.99, 10.0, 500.0, 42.42],
+            "gender": ["Male", "Female", "Male", "Female", "Male", "Female"],
+            "contract_length": [
+                "Monthly",
+                "Annual",
+                "Quarterly",
+                "Monthly",
+                "Annual",
+                "Quarterly",
+            ],
+        }
+    )
+    y = [0, 1, 0, 1, 1, 0]
+    categorical_cols = ["gender", "contract_length"]
+    numerical_cols = ["age", "total_spend"]
+
+    encoder = OneHotEncoder(handle_unknown="ignore", sparse_output=False, drop="first")
+    encoder.fit(train_df[categorical_cols])
+    preprocessor = {
+        "encoder": encoder,
+        "categorical_cols": categorical_cols,
+        "numerical_cols": numerical_cols,
+        "feature_names_out": encoder.get_feature_names_out(categorical_cols).tolist(),
+    }
+    ordered_cols = list(reversed(numerical_cols + preprocessor["feature_names_out"]))
+    X_train = _pandas_preprocess(preprocessor, train_df, ordered_cols)
+    model = XGBClassifier(n_estimators=5, max_depth=2).fit(X_train, y)
+
+    records = [
+        {
+            "age": 42,
+            "total_spend": 1200.5,
+            "gender": "Female",
+            "contract_length": "Quarterly",
+        },
+        # Dropped and unknown categories both encode to all zeros.
+        {"age": 30, "total_spend": 0.1, "gender": "Other", "contract_length": "Annual"},
+    ]
+    expected_df = _pandas_preprocess(preprocessor, pd.DataFrame(records), ordered_cols)
+
+    feature_encoder = FeatureEncoder(preprocessor, ordered_cols)
+
+    for i, record in enumerate(records):
+        row = feature_encoder.encode(record)
+        assert np.array_equal(row, expected_df.iloc[[i]].to_numpy(dtype=np.float64))
+        assert np.array_equal(
+            model.predict_proba(row), model.predict_proba(expected_df.iloc[[i]])
+        )
+
+    matrix = feature_encoder.encode_batch(records)
+    assert np.array_equal(matrix, expected_df.to_numpy(dtype=np.float64))
+    assert np.array_equal(model.predict_proba(matrix), model.predict_proba(expected_df))
+    assert np.array_equal(feature_encoder.encode_frame(pd.DataFrame(records)), matrix)
@@ -0,0 +1,106 @@
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import numpy as np
+import pandas as pd
+
+import src.pipeline.runner as runner
+from src.pipeline.stage_cache import StageCache
+
+
+def test_run_pipeline_in_memory(tmp_path: Path, monkeypatch):
+    rng = np.random.default_rng(0)
+    n_rows = 200
+    raw_data_path = tmp_path / "raw.csv"
+    pd.DataFrame(
+        {
+            "CustomerID": np.arange(n_rows),
+            "Age": rng.integers(18, 70, n_rows),
+            "Gender": rng.choice(["Male", "Female"], n_rows),
+            "Churn": [0, 1] * (n_rows // 2),
+        }
+    ).to_csv(raw_data_path, index=False)
+
+    fit_model = MagicMock()
+    register_model = MagicMock()
+    monkeypatch.setattr(runner, "fit_model", fit_model)
+    monkeypatch.setattr(runner, "register_model", register_model)
+    monkeypatch.setattr(runner, "save_preprocessor", MagicMock())
+    monkeypatch.setattr(runner, "save_reference_profile", MagicMock())
+    file_digest = MagicMock()
+    monkeypatch.setattr(runner, "file_digest", file_digest)
+
+    reports = runner.run_pipeline(
+        raw_data_path, target_column="churn", write_data=False, profile_memory=True
+    )
+
+    assert [report.stage for report in reports] == [
+        "data_cleaning",
+        "data_split",
+        "feature_engineering",
+        "model_training",
+        "model_evaluation",
+    ]
+    assert all(report.seconds >= 0 and report.peak_memory_mb >= 0 for report in reports)
+    assert all(report.max_rss_mb > 0 for report in reports)
+    file_digest.assert_not_called()
+
+    train_df, test_df = fit_model.call_args.args[:2]
+    assert list(train_df.columns) == ["age", "gender_Male", "churn"]
+    assert len(train_df) + len(test_df) == n_rows
+
+    X_test = register_model.call_args.args[1]
+    assert list(X_test.columns) == ["age", "gender_Male"]
+
+
+def test_run_pipeline_reuses_cached_stages(tmp_path: Path, monkeypatch):
+    raw_data_path = tmp_path / "raw.csv"
+    pd.DataFrame(
+        {"Age": np.arange(100), "Gender": ["Male", "Female"] * 50, "Churn": [0, 1] * 50}
+    ).to_csv(raw_data_path, index=False)
+
+    encode_features = MagicMock(side_effect=runner.encode_features)
+    fit_model = MagicMock()
+    monkeypatch.setattr(runner, "encode_features", encode_features)
+    monkeypatch.setattr(runner, "fit_model", fit_model)
+    monkeypatch.setattr(runner, "register_model", MagicMock())
+    monkeypatch.setattr(runner, "save_preprocessor", MagicMock())
+    monkeypatch.setattr(runner, "save_reference_profile", MagicMock())
+
+    cache = StageCache(tmp_path / "cache", max_bytes=10**8)
+    for _ in range(2):
+        reports = runner.run_pipeline(
+            raw_data_path, target_column="churn", write_data=False, cache=cache
+        )
+
+    encode_features.assert_called_once()
+    assert all(report.peak_memory_mb is None for report in reports)
+    first_train, second_train = (call.args[0] for call in fit_model.call_args_list)
+    pd.testing.assert_frame_equal(first_train, second_train)
+    assert {entry["stage"] for entry in cache.entries()} == {
+        "data_cleaning",
+        "data_split",
+        "feature_engineering",
+    }
+
+
+def test_feature_cache_key_follows_reference_bins(tmp_path: Path, monkeypatch):
+    raw_data_path = tmp_path / "raw.csv"
+    pd.DataFrame(
+        {"Age": np.arange(100), "Gender": ["Male", "Female"] * 50, "Churn": [0, 1] * 50}
+    ).to_csv(raw_data_path, index=False)
+    save_reference_profile = MagicMock()
+    monkeypatch.setattr(runner, "fit_model", MagicMock())
+    monkeypatch.setattr(runner, "register_model", MagicMock())
+    monkeypatch.setattr(runner, "save_preprocessor", MagicMock())
+    monkeypatch.setattr(runner, "save_reference_profile", save_reference_profile)
+
+    cache = StageCache(tmp_path / "cache", max_bytes=10**8)
+    for n_bins in (4, 8):
+        monkeypatch.setattr(runner.config.drift, "reference_bins", n_bins)
+        runner.run_pipeline(
+            raw_data_path, target_column="churn", write_data=False, cache=cache
+        )
+
+    first, second = (call.args[0] for call in save_reference_profile.call_args_list)
+    assert len(first.sketches["age"].edges) < len(second.sketches["age"].edges)
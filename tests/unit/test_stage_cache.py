@@ -0,0 +1,63 @@
+import importlib
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pandas as pd
+
+from src.pipeline import data_split
+from src.pipeline.stage_cache import StageCache, stage_key
+
+
+def test_get_or_compute_round_trips_outputs(tmp_path: Path):
+    cache = StageCache(tmp_path, max_bytes=10**7)
+    df = pd.DataFrame({"age": [30, 40], "gender": ["Male", "Female"]}, index=[7, 3])
+    compute = MagicMock(return_value={"train": df, "preprocessor": {"cols": ["age"]}})
+
+    first = cache.get_or_compute("key", "data_split", compute)
+    second = cache.get_or_compute("key", "data_split", compute)
+
+    compute.assert_called_once()
+    pd.testing.assert_frame_equal(second["train"], df)
+    assert second["preprocessor"] == first["preprocessor"]
+    assert [entry["stage"] for entry in cache.entries()] == ["data_split"]
+
+    cache.clear()
+    assert cache.load("key") is None
+
+
+def test_stage_key_depends_on_inputs():
+    key = stage_key("data_split", data_split, "upstream", 0.2, 42)
+
+    assert key == stage_key("data_split", data_split, "upstream", 0.2, 42)
+    assert key != stage_key("data_split", data_split, "upstream", 0.3, 42)
+    assert key != stage_key("data_split", data_split, "changed", 0.2, 42)
+
+
+def test_stage_key_depends_on_imported_helper_code(tmp_path: Path, monkeypatch):
+    package = tmp_path / "keypkg"
+    (package / "helpers").mkdir(parents=True)
+    (package / "__init__.py").write_text("")
+    (package / "helpers" / "__init__.py").write_text("")
+    (package / "helpers" / "io.py").write_text("from keypkg import config\n")
+    (package / "config.py").write_text("N_BINS = 10\n")
+    (package / "stage.py").write_text("import json\nfrom keypkg.helpers import io\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    stage = importlib.import_module("keypkg.stage")
+
+    key = stage_key("stage", stage, "upstream")
+    (package / "config.py").write_text("N_BINS = 20\n")
+
+    assert stage_key("stage", stage, "upstream") != key
+
+
+def test_stage_cache_evicts_least_recently_used(tmp_path: Path):
+    df = pd.DataFrame({"x": range(1_000)})
+    cache = StageCache(tmp_path, max_bytes=10**9)
+    cache.save("a", "data_cleaning", {"cleaned": df})
+    entry_size = int(cache.entries()[0]["size_mb"] * 2**20)
+
+    cache = StageCache(tmp_path, max_bytes=int(entry_size * 1.5))
+    cache.save("b", "data_cleaning", {"cleaned": df})
+
+    assert cache.load("a") is None
+    assert cache.load("b") is not None
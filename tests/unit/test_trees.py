@@ -0,0 +1,50 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from xgboost import XGBClassifier
+
+from src.inference.trees import TreeEnsemble
+
+
+def test_tree_ensemble_matches_xgboost(tmp_path: Path):
+    rng = np.random.default_rng(42)
+    X = pd.DataFrame(rng.normal(size=(500, 6)), columns=[f"f{i}" for i in range(6)])
+    X.loc[rng.random(500) < 0.1, "f2"] = np.nan
+    y = ((X["f0"] + X["f1"].fillna(0) * X["f3"]) > 0).astype(int)
+
+    model = XGBClassifier(n_estimators=25, max_depth=5, random_state=42)
+    model.fit(X, y)
+    model_path = tmp_path / "model.json"
+    model.save_model(model_path)
+
+    ensemble = TreeEnsemble.load(model_path)
+
+    assert ensemble.feature_names == list(X.columns)
+    assert ensemble.n_trees == 25
+    np.testing.assert_allclose(
+        ensemble.predict_proba(X), model.predict_proba(X), rtol=1e-5, atol=1e-6
+    )
+    np.testing.assert_allclose(
+        ensemble.predict_proba(X.to_numpy()[:1]),
+        model.predict_proba(X.to_numpy()[:1]),
+        rtol=1e-5,
+        atol=1e-6,
+    )
+    assert np.array_equal(ensemble.predict(X[X.columns[::-1]]), model.predict(X))
+
+
+def test_tree_ensemble_attach_memory_maps_saved_arrays(tmp_path: Path):
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(200, 4))
+    y = (X[:, 0] > 0).astype(int)
+    model_path = tmp_path / "model.json"
+    XGBClassifier(n_estimators=10, max_depth=3).fit(X, y).save_model(model_path)
+    ensemble = TreeEnsemble.load(model_path)
+
+    ensemble.save(tmp_path / "shared")
+    attached = TreeEnsemble.attach(tmp_path / "shared")
+
+    assert isinstance(attached.left.base, np.memmap)
+    assert not attached.left.flags.writeable
+    np.testing.assert_array_equal(attached.predict_proba(X), ensemble.predict_proba(X))